@@ -2,29 +2,57 @@
 uv-lock-report: Parses uv.lock changes and generates Markdown reports.
 """
 
-from uv_lock_report.cli import main as cli_main
-from uv_lock_report.models import (
-    LockfileChanges,
-    LockfilePackage,
-    LockFileReporter,
-    OutputFormat,
-    UpdatedPackage,
-    UvLockFile,
-)
-from uv_lock_report.report import report
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from uv_lock_report.cli import main as cli_main
+    from uv_lock_report.models import (
+        LockfileChanges,
+        LockfilePackage,
+        LockFileReporter,
+        OutputFormat,
+        UpdatedPackage,
+        UvLockFile,
+    )
+    from uv_lock_report.report import ReportOptions, report
 
 __all__ = [
-    "cli_main",
-    "report",
-    "LockFile",
-    "UvLockFile",
     "LockFileReporter",
     "LockfileChanges",
     "LockfilePackage",
-    "UpdatedPackage",
     "OutputFormat",
+    "ReportOptions",
+    "UpdatedPackage",
+    "UvLockFile",
+    "cli_main",
+    "report",
 ]
 
+# Exports are resolved on first access, so that importing the CLI entry point
+# does not load pydantic and the models until a command needs them.
+_LAZY_EXPORTS = {
+    "cli_main": ("uv_lock_report.cli", "main"),
+    "report": ("uv_lock_report.report", "report"),
+    "ReportOptions": ("uv_lock_report.report", "ReportOptions"),
+    "UvLockFile": ("uv_lock_report.models", "UvLockFile"),
+    "LockFileReporter": ("uv_lock_report.models", "LockFileReporter"),
+    "LockfileChanges": ("uv_lock_report.models", "LockfileChanges"),
+    "LockfilePackage": ("uv_lock_report.models", "LockfilePackage"),
+    "UpdatedPackage": ("uv_lock_report.models", "UpdatedPackage"),
+    "OutputFormat": ("uv_lock_report.models", "OutputFormat"),
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_EXPORTS[name]
+    value = getattr(import_module(module_name), attribute)
+    globals()[name] = value
+    return value
+
+
 try:
     from uv_lock_report._version import __version__  # type: ignore[unresolved-import]
 except ImportError:  # pragma: no cover
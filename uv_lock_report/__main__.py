@@ -5,7 +5,9 @@ This allows the package to be executed with:
     python -m uv_lock_report
 """
 
+import sys
+
 from uv_lock_report.cli import main
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,288 @@
+"""
+Offline advisory matching against a local OSV dump.
+
+An OSV export (a directory of JSON files, a tarball or a zip) is compiled once
+into an SQLite store indexed by normalized package name, so matching a report
+costs one point query per package instead of a scan of the whole dump.
+"""
+
+import hashlib
+import json
+import sqlite3
+import tarfile
+import zipfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from packaging.utils import canonicalize_name, canonicalize_version
+from packaging.version import InvalidVersion, Version
+
+from uv_lock_report.cache import user_cache_dir
+from uv_lock_report.models import LockfileChanges, PackageAdvisory
+
+ECOSYSTEM = "PyPI"
+SQLITE_HEADER = b"SQLite format 3\x00"
+# The record ids and modification times OSV publishes next to each
+# ecosystem's records.
+MANIFEST = "modified_id.csv"
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS advisories (
+    id TEXT PRIMARY KEY,
+    summary TEXT,
+    aliases TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS affected_ranges (
+    name TEXT NOT NULL,
+    advisory_id TEXT NOT NULL,
+    introduced TEXT,
+    fixed TEXT,
+    last_affected TEXT
+);
+CREATE TABLE IF NOT EXISTS affected_versions (
+    name TEXT NOT NULL,
+    version TEXT NOT NULL,
+    advisory_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS affected_ranges_name ON affected_ranges (name);
+CREATE INDEX IF NOT EXISTS affected_versions_name_version
+    ON affected_versions (name, version);
+"""
+
+
+def normalize_version(version: str) -> str | None:
+    try:
+        return canonicalize_version(Version(version))
+    except InvalidVersion:
+        return None
+
+
+def iter_osv_records(source: Path) -> Iterator[dict[str, Any]]:
+    if source.is_dir():
+        for path in sorted(source.rglob("*.json")):
+            yield json.loads(path.read_bytes())
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for name in archive.namelist():
+                if name.endswith(".json"):
+                    yield json.loads(archive.read(name))
+    elif tarfile.is_tarfile(source):
+        with tarfile.open(source) as archive:
+            for member in archive:
+                if not member.isfile() or not member.name.endswith(".json"):
+                    continue
+                extracted = archive.extractfile(member)
+                if extracted is not None:
+                    yield json.loads(extracted.read())
+    else:
+        raise ValueError(f"Unsupported OSV source: {source}")
+
+
+def iter_ranges(
+    affected: dict[str, Any],
+) -> Iterator[tuple[str | None, str | None, str | None]]:
+    """Yield `(introduced, fixed, last_affected)` intervals of an `affected` entry."""
+    for affected_range in affected.get("ranges", ()):
+        if affected_range.get("type") not in ("ECOSYSTEM", "SEMVER"):
+            continue
+        introduced: str | None = None
+        for event in affected_range.get("events", ()):
+            if "introduced" in event:
+                introduced = event["introduced"]
+            elif "fixed" in event and introduced is not None:
+                yield introduced, event["fixed"], None
+                introduced = None
+            elif "last_affected" in event and introduced is not None:
+                yield introduced, None, event["last_affected"]
+                introduced = None
+        if introduced is not None:
+            yield introduced, None, None
+
+
+def source_signature(source: Path) -> str:
+    """
+    Location, size and modification time of a dump, from a single stat.
+
+    A directory dump is described by its `modified_id.csv` manifest, which
+    OSV rewrites whenever a record changes; a directory without one by its
+    own stat, which changes when files are added, removed or replaced (as
+    unzip, rsync and git do) but not when one is edited in place.
+    """
+    stat_path = source
+    if source.is_dir() and (source / MANIFEST).is_file():
+        stat_path = source / MANIFEST
+    stat = stat_path.stat()
+    return f"{stat_path.resolve()}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def default_db_path(source: Path) -> Path:
+    """A compiled store in the user cache directory, one per dump location."""
+    digest = hashlib.sha256(str(source.resolve()).encode()).hexdigest()[:16]
+    return user_cache_dir() / f"advisories-{digest}.sqlite"
+
+
+class AdvisoryDatabase:
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+
+    @classmethod
+    def compile(
+        cls, source: Path, db_path: Path, signature: str | None = None
+    ) -> "AdvisoryDatabase":
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(db_path)
+        with connection:
+            connection.executescript(
+                "DROP TABLE IF EXISTS advisories;"
+                "DROP TABLE IF EXISTS affected_ranges;"
+                "DROP TABLE IF EXISTS affected_versions;"
+            )
+            connection.executescript(SCHEMA)
+            for record in iter_osv_records(source):
+                cls._insert_record(connection, record)
+            connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('source', ?)",
+                (signature or source_signature(source),),
+            )
+        return cls(connection)
+
+    @staticmethod
+    def _insert_record(connection: sqlite3.Connection, record: dict[str, Any]) -> None:
+        if record.get("withdrawn"):
+            return
+        advisory_id = record["id"]
+        ranges = []
+        versions = []
+        for affected in record.get("affected", ()):
+            package = affected.get("package", {})
+            if package.get("ecosystem") != ECOSYSTEM:
+                continue
+            name = canonicalize_name(package["name"])
+            ranges.extend(
+                (name, advisory_id, *interval) for interval in iter_ranges(affected)
+            )
+            versions.extend(
+                (name, normalized, advisory_id)
+                for version in affected.get("versions", ())
+                if (normalized := normalize_version(version)) is not None
+            )
+        if not ranges and not versions:
+            return
+
+        connection.execute(
+            "INSERT OR REPLACE INTO advisories (id, summary, aliases) VALUES (?, ?, ?)",
+            (advisory_id, record.get("summary"), json.dumps(record.get("aliases", []))),
+        )
+        connection.executemany(
+            "INSERT INTO affected_ranges VALUES (?, ?, ?, ?, ?)", ranges
+        )
+        connection.executemany(
+            "INSERT INTO affected_versions VALUES (?, ?, ?)", versions
+        )
+
+    @classmethod
+    def load(cls, source: Path, db_path: Path | None = None) -> "AdvisoryDatabase":
+        """
+        Open a compiled store, or compile an OSV dump into `db_path`.
+
+        `db_path` defaults to a file in the user cache directory, so the dump
+        may be on a read-only mount, and is reused until the dump's path, size
+        or modification time changes.
+        """
+        if source.is_file():
+            with source.open("rb") as file:
+                if file.read(len(SQLITE_HEADER)) == SQLITE_HEADER:
+                    return cls(sqlite3.connect(source))
+
+        db_path = db_path or default_db_path(source)
+        signature = source_signature(source)
+        if db_path.exists():
+            connection = sqlite3.connect(db_path)
+            try:
+                row = connection.execute(
+                    "SELECT value FROM meta WHERE key = 'source'"
+                ).fetchone()
+            except sqlite3.DatabaseError:
+                row = None
+            if row is not None and row[0] == signature:
+                return cls(connection)
+            connection.close()
+        return cls.compile(source, db_path, signature)
+
+    def lookup(self, name: str, version: str) -> list[PackageAdvisory]:
+        normalized_name = canonicalize_name(name)
+        normalized_version = normalize_version(version)
+        if normalized_version is None:
+            return []
+        parsed = Version(version)
+
+        advisory_ids = {
+            advisory_id
+            for (advisory_id,) in self.connection.execute(
+                "SELECT advisory_id FROM affected_versions WHERE name = ? AND version = ?",
+                (normalized_name, normalized_version),
+            )
+        }
+        fixed_versions: dict[str, str | None] = {}
+        for advisory_id, introduced, fixed, last_affected in self.connection.execute(
+            "SELECT advisory_id, introduced, fixed, last_affected "
+            "FROM affected_ranges WHERE name = ?",
+            (normalized_name,),
+        ):
+            if self._in_range(parsed, introduced, fixed, last_affected):
+                advisory_ids.add(advisory_id)
+                fixed_versions[advisory_id] = fixed
+
+        advisories = []
+        for advisory_id in sorted(advisory_ids):
+            summary, aliases = self.connection.execute(
+                "SELECT summary, aliases FROM advisories WHERE id = ?", (advisory_id,)
+            ).fetchone()
+            advisories.append(
+                PackageAdvisory(
+                    name=name,
+                    version=version,
+                    id=advisory_id,
+                    aliases=json.loads(aliases),
+                    summary=summary,
+                    fixed_version=fixed_versions.get(advisory_id),
+                )
+            )
+        return advisories
+
+    @staticmethod
+    def _in_range(
+        version: Version,
+        introduced: str | None,
+        fixed: str | None,
+        last_affected: str | None,
+    ) -> bool:
+        try:
+            if introduced not in (None, "0") and version < Version(introduced):
+                return False
+            if fixed is not None and version >= Version(fixed):
+                return False
+            if last_affected is not None and version > Version(last_affected):
+                return False
+        except InvalidVersion:
+            return False
+        return True
+
+    def match(self, packages: Iterable[tuple[str, str]]) -> list[PackageAdvisory]:
+        return [
+            advisory
+            for name, version in packages
+            for advisory in self.lookup(name, version)
+        ]
+
+
+def find_advisories(
+    lockfile_changes: LockfileChanges, database: AdvisoryDatabase
+) -> list[PackageAdvisory]:
+    """Advisories affecting the versions that were added or upgraded to."""
+    packages = [
+        (pkg.name, pkg.version) for pkg in lockfile_changes.added if pkg.version
+    ]
+    packages.extend((pkg.name, pkg.new_version) for pkg in lockfile_changes.upgraded)
+    return database.match(packages)
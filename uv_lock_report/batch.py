@@ -0,0 +1,132 @@
+"""
+Batch mode: many base/head report jobs from a JSON Lines manifest.
+
+Each distinct `(repo, base)` lockfile is parsed once, in the parent, and handed
+to every worker process when it starts. The heads are then spread across the
+workers, so many heads against one base run in parallel too; jobs sharing a
+repository and base are queued next to each other, so a worker mostly reads
+from one repository and reuses its process-wide caches.
+"""
+
+import json
+import os
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+
+from uv_lock_report.models import LockFileReporter, OutputFormat, UvLockFile
+from uv_lock_report.report import get_uv_lock_file_at, write_changes_file
+
+
+class BatchJob(BaseModel):
+    repo: str
+    base: str
+    head: str
+    output: str
+    output_format: OutputFormat = Field(default=OutputFormat.TABLE, alias="format")
+    show_learn_more_link: bool = True
+
+
+class BatchResult(BaseModel):
+    output: str
+    items: int | None = None
+    error: str | None = None
+
+
+def read_manifest(manifest_path: str) -> list[BatchJob]:
+    jobs = []
+    for line in Path(manifest_path).read_text().splitlines():
+        if line.strip():
+            jobs.append(BatchJob.model_validate(json.loads(line)))
+    return jobs
+
+
+def group_jobs(jobs: list[BatchJob]) -> list[list[tuple[int, BatchJob]]]:
+    """Manifest-indexed jobs sharing a repo and base, largest groups first."""
+    groups: dict[tuple[str, str], list[tuple[int, BatchJob]]] = {}
+    for index, job in enumerate(jobs):
+        groups.setdefault((job.repo, job.base), []).append((index, job))
+    return sorted(groups.values(), key=len, reverse=True)
+
+
+def load_base_lockfiles(
+    jobs: list[BatchJob],
+) -> dict[tuple[str, str], UvLockFile | None]:
+    """
+    The lockfile at each distinct `(repo, base)`, parsed once. Bases that
+    cannot be read are left out, so that their jobs fail with their own error.
+    """
+    lockfiles: dict[tuple[str, str], UvLockFile | None] = {}
+    for job in jobs:
+        key = (job.repo, job.base)
+        if key in lockfiles:
+            continue
+        try:
+            lockfiles[key] = get_uv_lock_file_at(job.base, job.repo)
+        except (OSError, subprocess.SubprocessError, ValueError):
+            pass
+    return lockfiles
+
+
+# The parent's base lockfiles, handed to each worker process by `init_worker`.
+worker_base_lockfiles: dict[tuple[str, str], UvLockFile | None] = {}
+
+
+def init_worker(base_lockfiles: dict[tuple[str, str], UvLockFile | None]) -> None:
+    worker_base_lockfiles.update(base_lockfiles)
+
+
+def run_job(
+    job: BatchJob, base_lockfiles: dict[tuple[str, str], UvLockFile | None]
+) -> BatchResult:
+    try:
+        key = (job.repo, job.base)
+        reporter = LockFileReporter(
+            old_lockfile=base_lockfiles[key]
+            if key in base_lockfiles
+            else get_uv_lock_file_at(job.base, job.repo),
+            new_lockfile=get_uv_lock_file_at(job.head, job.repo),
+            output_format=job.output_format,
+            show_learn_more_link=job.show_learn_more_link,
+        )
+        lockfile_changes = reporter.get_changes()
+        write_changes_file(lockfile_changes=lockfile_changes, output_path=job.output)
+    except (OSError, subprocess.SubprocessError, ValueError) as e:
+        return BatchResult(output=job.output, error=f"{type(e).__name__}: {e}")
+    return BatchResult(output=job.output, items=lockfile_changes.items)
+
+
+def run_worker_job(indexed: tuple[int, BatchJob]) -> tuple[int, BatchResult]:
+    index, job = indexed
+    return index, run_job(job, worker_base_lockfiles)
+
+
+def run_batch(
+    jobs: list[BatchJob], max_workers: int | None = None
+) -> list[BatchResult]:
+    if not jobs:
+        return []
+    base_lockfiles = load_base_lockfiles(jobs)
+    # Jobs of a group stay next to each other, so that a worker's chunk mostly
+    # reads heads from one repository.
+    indexed_jobs = [indexed for group in group_jobs(jobs) for indexed in group]
+    max_workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    if max_workers == 1:
+        results = [(index, run_job(job, base_lockfiles)) for index, job in indexed_jobs]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=init_worker,
+            initargs=(base_lockfiles,),
+        ) as executor:
+            results = list(
+                executor.map(
+                    run_worker_job,
+                    indexed_jobs,
+                    chunksize=max(1, len(jobs) // (max_workers * 4)),
+                )
+            )
+
+    return [result for _, result in sorted(results, key=lambda indexed: indexed[0])]
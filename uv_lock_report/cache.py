@@ -0,0 +1,92 @@
+"""
+Cache of finished reports, keyed by their inputs.
+
+A key digests the blob ids of the lockfiles being compared, every option that
+affects the report and the tool version, so an entry never goes stale: a hit
+is written out as-is without parsing a lockfile or rendering markdown.
+Entries are single files replaced atomically, and the least recently used
+ones are evicted past a size bound, so the directory can be shared between
+concurrent jobs and saved and restored as a CI cache.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+ENTRY_SUFFIX = ".json"
+
+
+def user_cache_dir() -> Path:
+    """This tool's directory under `$XDG_CACHE_HOME`, or `~/.cache` without it."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "uv-lock-report"
+
+
+class CachedReport(BaseModel):
+    changes: str
+    markdown: str
+
+
+def report_cache_key(inputs: dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+
+def file_digest(path: str | None) -> str | None:
+    """Digest of a file's content, or `None` if there is no such file."""
+    if path is None or not Path(path).is_file():
+        return None
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+class ReportCache:
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{ENTRY_SUFFIX}"
+
+    def get(self, key: str) -> CachedReport | None:
+        path = self._path(key)
+        try:
+            entry = CachedReport.model_validate_json(path.read_bytes())
+            # The modification time orders entries for eviction.
+            os.utime(path)
+        except (OSError, ValidationError):
+            return None
+        return entry
+
+    def put(self, key: str, entry: CachedReport) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as temp_file:
+                temp_file.write(entry.model_dump_json())
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the size bound is met."""
+        entries = []
+        for path in self.directory.glob(f"*{ENTRY_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            # Another job may have evicted it already.
+            path.unlink(missing_ok=True)
+            total -= size
@@ -1,14 +1,63 @@
+import os
+import sys
 from argparse import ArgumentParser, Namespace
+from pathlib import Path
 
-from uv_lock_report.models import OutputFormat
-from uv_lock_report.report import report
+# Commands import what they need when they run, so that quick ones (such as the
+# pre-commit `staged` check) do not pay for loading pydantic and every model.
 
+POLICY_VIOLATION_EXIT_CODE = 3
+
+
+def parse_args(argv: list[str] | None = None) -> Namespace:
+    from uv_lock_report.models import OutputFormat
+    from uv_lock_report.releases import DEFAULT_INDEX_URL, DEFAULT_TIME_BUDGET
 
-def parse_args() -> Namespace:
     parser = ArgumentParser()
-    parser.add_argument("--base-sha", required=True)
-    parser.add_argument("--base-path", required=True)
-    parser.add_argument("--output-path", required=True)
+    parser.add_argument(
+        "--base-sha",
+        nargs="+",
+        action="extend",
+        default=[],
+        required=False,
+        help="Base commit to compare against. Further refs add a comparison of "
+        "the head against each of them.",
+    )
+    parser.add_argument("--base-path", default=".", required=False)
+    parser.add_argument(
+        "--old-path",
+        default=None,
+        required=False,
+        help="Base lockfile to read instead of the one at --base-sha ('-' for "
+        "stdin). Any --base-sha refs are then only added as comparisons.",
+    )
+    parser.add_argument(
+        "--head-sha",
+        default=None,
+        required=False,
+        help="Read the head lockfile from this commit instead of the working tree.",
+    )
+    parser.add_argument(
+        "--new-path",
+        default=None,
+        required=False,
+        help="Head lockfile to read instead of <base-path>/uv.lock ('-' for stdin).",
+    )
+    parser.add_argument(
+        "--output-path",
+        default=None,
+        required=False,
+        help="Where to write the report JSON.",
+    )
+    parser.add_argument(
+        "--step-summary",
+        nargs="?",
+        const="",
+        default=None,
+        required=False,
+        metavar="PATH",
+        help="Append the report markdown to PATH (default: $GITHUB_STEP_SUMMARY).",
+    )
     parser.add_argument(
         "--output-format",
         choices=list(OutputFormat),
@@ -22,19 +71,405 @@ def parse_args() -> Namespace:
         required=False,
         help='Whether to show a "Learn More" link in the report comment.',
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--advisory-db",
+        default=None,
+        required=False,
+        help="Local OSV dump (directory, tarball or zip) or compiled advisory "
+        "database used to flag added and upgraded packages with known advisories.",
+    )
+    parser.add_argument(
+        "--release-metadata",
+        choices=["true", "false"],
+        default="false",
+        required=False,
+        help="Whether to add release dates and changelog links for upgraded packages.",
+    )
+    parser.add_argument(
+        "--release-index",
+        default=DEFAULT_INDEX_URL,
+        required=False,
+        help="Base URL of the PyPI-compatible JSON API used for release metadata.",
+    )
+    parser.add_argument(
+        "--release-cache",
+        default=None,
+        required=False,
+        help="Path of the release metadata cache database.",
+    )
+    parser.add_argument(
+        "--release-time-budget",
+        type=float,
+        default=DEFAULT_TIME_BUDGET,
+        required=False,
+        help="Seconds to spend fetching release metadata before reporting without it.",
+    )
+    parser.add_argument(
+        "--download-size",
+        choices=["true", "false"],
+        default="false",
+        required=False,
+        help="Whether to add per-package and total download-size changes.",
+    )
+    parser.add_argument(
+        "--platform-tag",
+        default=None,
+        required=False,
+        metavar="PATTERN",
+        help="Size only wheels whose platform tag matches this glob "
+        "(e.g. 'manylinux*_x86_64').",
+    )
+    parser.add_argument(
+        "--group-sections",
+        choices=["true", "false"],
+        default="false",
+        required=False,
+        help="Whether to split package changes into a section per dependency group "
+        "and extra of the project.",
+    )
+    parser.add_argument(
+        "--commit-attribution",
+        choices=["true", "false"],
+        default="false",
+        required=False,
+        help="Whether to name, for each package, the commits after the base that "
+        "changed it.",
+    )
+    parser.add_argument(
+        "--report-cache",
+        default=None,
+        required=False,
+        metavar="DIR",
+        help="Directory of finished reports keyed by their inputs, reused when the "
+        "same lockfiles and options come up again.",
+    )
+    parser.add_argument(
+        "--history-db",
+        default=None,
+        required=False,
+        help="SQLite history store to record the lockfile snapshots and report in.",
+    )
+    parser.add_argument(
+        "--repo-name",
+        default=None,
+        required=False,
+        help="Repository name used in the history store (default: base path name).",
+    )
+    parser.add_argument(
+        "--ignore-package",
+        action="append",
+        default=[],
+        required=False,
+        metavar="PATTERN",
+        help="Leave packages matching this glob (or re:REGEX) out of the report. "
+        "May be repeated.",
+    )
+    parser.add_argument(
+        "--only-package",
+        action="append",
+        default=[],
+        required=False,
+        metavar="PATTERN",
+        help="Report only packages matching this glob (or re:REGEX). May be repeated.",
+    )
+    parser.add_argument(
+        "--policy",
+        default=None,
+        required=False,
+        help="TOML policy file. Violations are listed in the report and make the "
+        f"command exit with status {POLICY_VIOLATION_EXIT_CODE}.",
+    )
+    parser.add_argument(
+        "--previous-report",
+        default=None,
+        required=False,
+        help="Report JSON, or comment body with an embedded payload, from the "
+        "previous run. Adds the changes since that run to the report.",
+    )
+    parser.add_argument(
+        "--embed-payload",
+        choices=["true", "false"],
+        default="false",
+        required=False,
+        help="Whether to embed a hidden payload in the report markdown that a "
+        "later run can read with --previous-report.",
+    )
+    return parser.parse_args(argv)
+
+
+def parse_history_args(argv: list[str]) -> Namespace:
+    parser = ArgumentParser(prog="uv-lock-report history")
+    parser.add_argument("--history-db", required=True)
+    parser.add_argument("--repo-name", required=True)
+    queries = parser.add_subparsers(dest="query", required=True)
+
+    version_at = queries.add_parser(
+        "version-at", help="Version of a package locked at a commit."
+    )
+    version_at.add_argument("package")
+    version_at.add_argument("commit")
+
+    last_bump = queries.add_parser(
+        "last-bump", help="Most recent recorded commit that changed a package."
+    )
+    last_bump.add_argument("package")
+    last_bump.add_argument(
+        "--at",
+        default=None,
+        metavar="COMMIT",
+        help="Only consider this recorded commit and its recorded ancestors.",
+    )
+
+    drift = queries.add_parser(
+        "drift", help="Packages locked at different versions in two commits."
+    )
+    drift.add_argument("commit_a")
+    drift.add_argument("commit_b")
+    return parser.parse_args(argv)
+
+
+def history_main(argv: list[str]) -> int:
+    from uv_lock_report.history import HistoryStore
+
+    args = parse_history_args(argv)
+    store = HistoryStore(args.history_db)
+    try:
+        match args.query:
+            case "version-at":
+                version = store.version_at(args.repo_name, args.package, args.commit)
+                print(version if version is not None else "not locked")
+            case "last-bump":
+                bump = store.last_bump(args.repo_name, args.package, args.at)
+                if bump is None:
+                    print("no recorded changes")
+                else:
+                    print(
+                        f"{bump.commit_sha}: {bump.old_version} -> {bump.new_version}"
+                    )
+            case "drift":
+                for drift in store.drift(args.repo_name, args.commit_a, args.commit_b):
+                    print(f"{drift.name}: {drift.version_a} -> {drift.version_b}")
+    except KeyError as e:
+        print(e.args[0], file=sys.stderr)
+        return 1
+    finally:
+        store.close()
+    return 0
+
+
+def parse_batch_args(argv: list[str]) -> Namespace:
+    parser = ArgumentParser(prog="uv-lock-report batch")
+    parser.add_argument(
+        "manifest",
+        help="JSON Lines file with one job per line: "
+        '{"repo": ..., "base": ..., "head": ..., "output": ..., "format": ...}',
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        required=False,
+        help="Number of worker processes (default: number of CPUs).",
+    )
+    return parser.parse_args(argv)
+
+
+def batch_main(argv: list[str]) -> int:
+    from uv_lock_report.batch import read_manifest, run_batch
+
+    args = parse_batch_args(argv)
+    results = run_batch(read_manifest(args.manifest), max_workers=args.jobs)
+    for result in results:
+        if result.error is not None:
+            print(f"FAILED {result.output}: {result.error}")
+        else:
+            print(f"Wrote {result.output} ({result.items} changes)")
+    return 1 if any(result.error is not None for result in results) else 0
+
+
+def parse_fleet_args(argv: list[str]) -> Namespace:
+    parser = ArgumentParser(prog="uv-lock-report fleet")
+    parser.add_argument("--index-db", required=True)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    index = commands.add_parser(
+        "index",
+        help="Index the uv.lock files of git clones, re-parsing only changed ones.",
+    )
+    index.add_argument(
+        "roots",
+        nargs="+",
+        help="Git clones, or directories whose immediate children are clones.",
+    )
+
+    lookup = commands.add_parser(
+        "lookup", help="Repositories locking a package, optionally at a version."
+    )
+    lookup.add_argument("package")
+    versions = lookup.add_mutually_exclusive_group()
+    versions.add_argument("--version", default=None)
+    versions.add_argument(
+        "--specifier",
+        default=None,
+        help='Version specifier to match, e.g. ">=2.0,<2.31.0".',
+    )
+    return parser.parse_args(argv)
+
+
+def fleet_main(argv: list[str]) -> int:
+    from uv_lock_report.fleet import FleetIndex
+
+    args = parse_fleet_args(argv)
+    fleet_index = FleetIndex(args.index_db)
+    try:
+        match args.command:
+            case "index":
+                parsed = fleet_index.index(Path(root) for root in args.roots)
+                print(f"Indexed {parsed} changed lockfiles")
+                for failure in fleet_index.failures:
+                    print(f"FAILED {failure}")
+                if fleet_index.failures:
+                    return 1
+            case "lookup":
+                for entry in fleet_index.lookup(
+                    args.package, version=args.version, specifier=args.specifier
+                ):
+                    print(f"{entry.repo}/{entry.path}: {entry.version}")
+    finally:
+        fleet_index.close()
+    return 0
+
+
+def parse_watch_args(argv: list[str]) -> Namespace:
+    from uv_lock_report.models import OutputFormat
+    from uv_lock_report.watch import DEFAULT_POLL_INTERVAL
+
+    parser = ArgumentParser(prog="uv-lock-report watch")
+    parser.add_argument("--base-sha", required=True)
+    parser.add_argument("--base-path", default=".", required=False)
+    parser.add_argument(
+        "--output-format",
+        choices=list(OutputFormat),
+        default=OutputFormat.TABLE.value,
+        required=False,
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        required=False,
+        help="Seconds between checks when inotify is not available.",
+    )
+    return parser.parse_args(argv)
+
+
+def watch_main(argv: list[str]) -> int:
+    from uv_lock_report.models import OutputFormat
+    from uv_lock_report.watch import LockfileWatch
+
+    args = parse_watch_args(argv)
+    watch = LockfileWatch(
+        base_sha=args.base_sha,
+        base_path=args.base_path,
+        output_format=OutputFormat(args.output_format),
+    )
+    try:
+        watch.run(poll_interval=args.poll_interval)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def parse_staged_args(argv: list[str]) -> Namespace:
+    parser = ArgumentParser(
+        prog="uv-lock-report staged",
+        description="Print the changes in the staged uv.lock compared to HEAD.",
+    )
+    parser.add_argument("--base-path", default=".", required=False)
+    return parser.parse_args(argv)
+
+
+def staged_main(argv: list[str]) -> int:
+    from uv_lock_report.staged import staged_report
+
+    args = parse_staged_args(argv)
+    changes = staged_report(args.base_path)
+    if changes:
+        print(changes)
+    return 0
+
+
+SUBCOMMANDS = {
+    "batch": batch_main,
+    "fleet": fleet_main,
+    "history": history_main,
+    "staged": staged_main,
+    "watch": watch_main,
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in SUBCOMMANDS:
+        return SUBCOMMANDS[argv[0]](argv[1:])
 
+    from uv_lock_report.models import OutputFormat
+    from uv_lock_report.report import ReportOptions, report
 
-def main():
-    args = parse_args()
-    base_sha = args.base_sha
+    args = parse_args(argv)
+    base_shas = list(dict.fromkeys(args.base_sha))
+    if args.old_path is None and not base_shas:
+        print("One of --base-sha or --old-path is required", file=sys.stderr)
+        return 2
+    if args.old_path == args.new_path == "-":
+        print("Only one of --old-path and --new-path can be stdin", file=sys.stderr)
+        return 2
+    base_sha = None if args.old_path is not None else base_shas.pop(0)
+    step_summary = args.step_summary
+    if step_summary == "":
+        step_summary = os.environ.get("GITHUB_STEP_SUMMARY")
+        if not step_summary:
+            print("--step-summary needs a PATH outside GitHub Actions", file=sys.stderr)
+            return 2
+    if args.output_path is None and step_summary is None:
+        print("One of --output-path or --step-summary is required", file=sys.stderr)
+        return 2
     base_path = args.base_path
     output_path = args.output_path
     output_format = OutputFormat(args.output_format)
-    report(
+    lockfile_changes = report(
         base_sha=base_sha,
         base_path=base_path,
         output_path=output_path,
         output_format=output_format,
         show_learn_more_link=args.show_learn_more_link == "true",
+        options=ReportOptions(
+            head_sha=args.head_sha,
+            old_source=args.old_path,
+            new_source=args.new_path,
+            additional_base_shas=base_shas,
+            ignore_packages=args.ignore_package,
+            only_packages=args.only_package,
+            group_sections=args.group_sections == "true",
+            commit_attribution=args.commit_attribution == "true",
+            download_size=args.download_size == "true",
+            platform_tag=args.platform_tag,
+            advisory_db=args.advisory_db,
+            release_metadata=args.release_metadata == "true",
+            release_index=args.release_index,
+            release_cache=args.release_cache,
+            release_time_budget=args.release_time_budget,
+            policy=args.policy,
+            previous_report=args.previous_report,
+            embed_payload=args.embed_payload == "true",
+            step_summary=step_summary,
+            history_db=args.history_db,
+            repo_name=args.repo_name,
+            report_cache=args.report_cache,
+        ),
     )
+    if lockfile_changes.violations:
+        for violation in lockfile_changes.violations:
+            print(f"Policy violation: {violation}", file=sys.stderr)
+        return POLICY_VIOLATION_EXIT_CODE
+    return 0
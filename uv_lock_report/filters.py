@@ -0,0 +1,66 @@
+"""
+Package-name filters applied while diffing lockfiles.
+
+Patterns are globs (`internal-*`) or, with a `re:` prefix, regular expressions
+(`re:^acme(-.+)?$`). Names are matched in their PEP 503 canonical form
+(lowercase, runs of `-`, `_` and `.` as one `-`), and globs are spelled the
+same way, so `acme_*` matches `Acme.Core`; regular expressions are written
+against the canonical form. The globs of a list are compiled once into a
+single alternation, so checking a name costs one regex match however many
+globs are configured. Regular expressions are compiled one by one, so that
+their backreferences and inline flags keep their meaning.
+"""
+
+import fnmatch
+import re
+from collections.abc import Iterable
+
+REGEX_PREFIX = "re:"
+
+
+def canonical_name(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", name.lower())
+
+
+def compile_patterns(patterns: Iterable[str]) -> tuple[re.Pattern[str], ...] | None:
+    """
+    Case-insensitive regexes of which one matches any of `patterns`, or `None`
+    if there are none: one for all globs, then one per regular expression.
+    """
+    globs = []
+    regexes = []
+    for pattern in patterns:
+        if pattern.startswith(REGEX_PREFIX):
+            # Anchored at the start by `re.match`, the same as the globs.
+            regexes.append(
+                re.compile(pattern.removeprefix(REGEX_PREFIX), re.IGNORECASE)
+            )
+        else:
+            globs.append(f"(?:{fnmatch.translate(canonical_name(pattern))})")
+    if globs:
+        regexes.insert(0, re.compile("|".join(globs), re.IGNORECASE))
+    return tuple(regexes) or None
+
+
+def matches_any(regexes: tuple[re.Pattern[str], ...], name: str) -> bool:
+    return any(regex.match(name) for regex in regexes)
+
+
+class PackageFilter:
+    """Select package names: drop `ignore` matches, then keep only `only` matches."""
+
+    def __init__(self, ignore: Iterable[str] = (), only: Iterable[str] = ()) -> None:
+        self.ignore = compile_patterns(ignore)
+        self.only = compile_patterns(only)
+
+    def __bool__(self) -> bool:
+        return self.ignore is not None or self.only is not None
+
+    def includes(self, name: str) -> bool:
+        name = canonical_name(name)
+        if self.ignore is not None and matches_any(self.ignore, name):
+            return False
+        return self.only is None or matches_any(self.only, name)
+
+    def filter_names(self, names: Iterable[str]) -> set[str]:
+        return {name for name in names if self.includes(name)}
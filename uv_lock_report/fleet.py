@@ -0,0 +1,193 @@
+"""
+Inverted index of locked package versions across many local clones.
+
+Maps a normalized package name to the versions locked for it and, per version,
+the `(repo, lockfile path)` pairs that lock it. Lockfiles are read from each
+clone's `HEAD` tree and identified by git blob id, so re-indexing a fleet only
+parses the lockfiles whose content changed since the last run.
+"""
+
+import sqlite3
+import subprocess
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path, PurePosixPath
+
+from packaging.specifiers import SpecifierSet
+from packaging.utils import canonicalize_name
+from packaging.version import InvalidVersion
+from pydantic import BaseModel
+
+from uv_lock_report.models import parse_version
+from uv_lock_report.report import CURRENT_UV_LOCK, load_uv_lock_blob
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lockfiles (
+    id INTEGER PRIMARY KEY,
+    repo TEXT NOT NULL,
+    path TEXT NOT NULL,
+    blob_id TEXT NOT NULL,
+    indexed_at REAL NOT NULL,
+    UNIQUE (repo, path)
+);
+CREATE TABLE IF NOT EXISTS locked_versions (
+    name TEXT NOT NULL,
+    version TEXT NOT NULL,
+    lockfile_id INTEGER NOT NULL REFERENCES lockfiles (id),
+    PRIMARY KEY (name, version, lockfile_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS locked_versions_lockfile
+    ON locked_versions (lockfile_id);
+"""
+
+
+class FleetEntry(BaseModel):
+    repo: str
+    path: str
+    version: str
+
+
+def discover_repos(roots: Iterable[Path]) -> Iterator[Path]:
+    """Each root that is a git clone, or else the clones directly inside it."""
+    for root in roots:
+        if (root / ".git").exists():
+            yield root
+            continue
+        for child in sorted(root.iterdir()):
+            if (child / ".git").exists():
+                yield child
+
+
+def list_lockfile_blobs(repo: Path) -> dict[str, str] | None:
+    """
+    Blob ids of every `uv.lock` in the `HEAD` tree of `repo`, keyed by path,
+    or `None` if the tree cannot be listed.
+    """
+    run = subprocess.run(
+        ["git", "ls-tree", "-r", "-z", "HEAD"],
+        capture_output=True,
+        text=True,
+        cwd=repo,
+        check=False,
+    )
+    if run.returncode != 0:
+        return None
+    blobs = {}
+    for entry in run.stdout.split("\0"):
+        if not entry:
+            continue
+        meta, path = entry.split("\t", 1)
+        _, object_type, blob_id = meta.split()
+        if object_type == "blob" and PurePosixPath(path).name == CURRENT_UV_LOCK.name:
+            blobs[path] = blob_id
+    return blobs
+
+
+class FleetIndex:
+    def __init__(self, path: Path | str) -> None:
+        self.connection = sqlite3.connect(path)
+        # `repo/path: error` for each lockfile the last `index` could not read.
+        self.failures: list[str] = []
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def index_repo(self, repo: Path) -> int:
+        """
+        Bring the entries for `repo` up to date; return the lockfiles parsed.
+
+        A lockfile that cannot be read is recorded in `failures` and keeps the
+        entries of its last indexed version; the others are still indexed.
+        """
+        repo_key = str(repo.resolve())
+        blobs = list_lockfile_blobs(repo)
+        if blobs is None:
+            self.failures.append(f"{repo_key}: HEAD tree cannot be listed")
+            return 0
+        indexed = {
+            path: (lockfile_id, blob_id)
+            for lockfile_id, path, blob_id in self.connection.execute(
+                "SELECT id, path, blob_id FROM lockfiles WHERE repo = ?", (repo_key,)
+            )
+        }
+
+        parsed = 0
+        with self.connection:
+            for path, (lockfile_id, _) in indexed.items():
+                if path not in blobs:
+                    self._drop(lockfile_id)
+            for path, blob_id in blobs.items():
+                if path in indexed and indexed[path][1] == blob_id:
+                    continue
+                try:
+                    lockfile = load_uv_lock_blob(blob_id, str(repo))
+                except (subprocess.CalledProcessError, ValueError) as e:
+                    self.failures.append(f"{repo_key}/{path}: {type(e).__name__}: {e}")
+                    continue
+                if path in indexed:
+                    self._drop(indexed[path][0])
+                lockfile_id = self.connection.execute(
+                    "INSERT INTO lockfiles (repo, path, blob_id, indexed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (repo_key, path, blob_id, time.time()),
+                ).lastrowid
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO locked_versions VALUES (?, ?, ?)",
+                    [
+                        (canonicalize_name(pkg.name), pkg.version or "", lockfile_id)
+                        for pkg in lockfile.packages
+                    ],
+                )
+                parsed += 1
+        return parsed
+
+    def index(self, roots: Iterable[Path]) -> int:
+        self.failures = []
+        return sum(self.index_repo(repo) for repo in discover_repos(roots))
+
+    def _drop(self, lockfile_id: int) -> None:
+        self.connection.execute(
+            "DELETE FROM locked_versions WHERE lockfile_id = ?", (lockfile_id,)
+        )
+        self.connection.execute("DELETE FROM lockfiles WHERE id = ?", (lockfile_id,))
+
+    def lookup(
+        self,
+        name: str,
+        version: str | None = None,
+        specifier: str | None = None,
+    ) -> list[FleetEntry]:
+        """
+        Lockfiles locking `name`, optionally at exactly `version` or at any
+        version contained in `specifier` (e.g. an advisory's affected range).
+        """
+        query = (
+            "SELECT repo, path, version FROM locked_versions "
+            "JOIN lockfiles ON lockfiles.id = locked_versions.lockfile_id "
+            "WHERE name = ?"
+        )
+        params = [canonicalize_name(name)]
+        if version is not None:
+            query += " AND version = ?"
+            params.append(version)
+        entries = [
+            FleetEntry(repo=repo, path=path, version=locked_version)
+            for repo, path, locked_version in self.connection.execute(
+                query + " ORDER BY repo, path", params
+            )
+        ]
+        if specifier is None:
+            return entries
+        specifier_set = SpecifierSet(specifier)
+        return [
+            entry for entry in entries if self._contains(specifier_set, entry.version)
+        ]
+
+    @staticmethod
+    def _contains(specifier_set: SpecifierSet, version: str) -> bool:
+        try:
+            return specifier_set.contains(parse_version(version), prereleases=True)
+        except InvalidVersion:
+            return False
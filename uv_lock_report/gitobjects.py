@@ -0,0 +1,415 @@
+"""
+In-process reader for git objects, so resolving `rev:path` needs no `git`.
+
+Revisions are resolved through loose and packed refs, then commit and tree
+objects are walked down to the path. Objects are read from loose object files
+or from packfiles, whose `.idx` indexes are memory-mapped and searched by
+fanout table and binary search; delta chains are inflated with zlib and
+applied in Python. Anything else (revision expressions such as `HEAD~1`,
+abbreviated ids, SHA-256 repositories, alternates, objects missing from a
+partial clone, ...) raises `UnsupportedGitObject`, and callers fall back to
+the `git` executable.
+"""
+
+import hashlib
+import mmap
+import os
+import re
+import struct
+import threading
+import zlib
+from functools import lru_cache
+from pathlib import Path
+
+OBJECT_TYPES = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+OFS_DELTA = 6
+REF_DELTA = 7
+IDX_SIGNATURE = b"\xfftOc"
+INFLATE_CHUNK = 64 * 1024
+OBJECT_ID = re.compile(r"^[0-9a-f]{40}$")
+REF_PREFIXES = ("", "refs/", "refs/tags/", "refs/heads/", "refs/remotes/")
+# Environment variables that point git at objects or refs this reader ignores.
+GIT_ENVIRONMENT = (
+    "GIT_DIR",
+    "GIT_OBJECT_DIRECTORY",
+    "GIT_ALTERNATE_OBJECT_DIRECTORIES",
+)
+# Set to always run the `git` executable instead of this reader.
+DISABLE_READER_VARIABLE = "UV_LOCK_REPORT_DISABLE_GIT_READER"
+
+
+class UnsupportedGitObject(Exception):
+    """The reader cannot answer this; ask `git` instead."""
+
+
+def read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    """A little-endian base-128 integer at `pos`, and the position after it."""
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, pos
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    source_size, pos = read_varint(delta, 0)
+    target_size, pos = read_varint(delta, pos)
+    if source_size != len(base):
+        raise UnsupportedGitObject("Delta does not match its base object")
+
+    target = bytearray()
+    while pos < len(delta):
+        opcode = delta[pos]
+        pos += 1
+        if opcode & 0x80:
+            # Copy from the base: up to four offset and three size bytes, each
+            # present only if its bit is set.
+            offset = size = 0
+            for i in range(4):
+                if opcode & (1 << i):
+                    offset |= delta[pos] << (8 * i)
+                    pos += 1
+            for i in range(3):
+                if opcode & (0x10 << i):
+                    size |= delta[pos] << (8 * i)
+                    pos += 1
+            target += base[offset : offset + (size or 0x10000)]
+        elif opcode:
+            target += delta[pos : pos + opcode]
+            pos += opcode
+        else:
+            raise UnsupportedGitObject("Reserved delta opcode")
+    if len(target) != target_size:
+        raise UnsupportedGitObject("Delta produced an object of the wrong size")
+    return bytes(target)
+
+
+class Pack:
+    """A packfile and its memory-mapped version 2 index."""
+
+    def __init__(self, idx_path: Path) -> None:
+        with idx_path.open("rb") as idx_file:
+            self.idx = mmap.mmap(idx_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.idx[:4] != IDX_SIGNATURE or self.idx[4:8] != b"\0\0\0\x02":
+            raise UnsupportedGitObject(f"Unsupported pack index: {idx_path}")
+        with idx_path.with_suffix(".pack").open("rb") as pack_file:
+            self.pack = mmap.mmap(pack_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.fanout = struct.unpack_from(">256I", self.idx, 8)
+        count = self.fanout[255]
+        self.names_at = 8 + 256 * 4
+        self.offsets_at = self.names_at + count * 20 + count * 4
+        self.large_offsets_at = self.offsets_at + count * 4
+
+    def offset(self, binary_id: bytes) -> int | None:
+        """Offset of an object in the pack, or `None` if it is not in this pack."""
+        low = self.fanout[binary_id[0] - 1] if binary_id[0] else 0
+        high = self.fanout[binary_id[0]]
+        while low < high:
+            middle = (low + high) // 2
+            at = self.names_at + middle * 20
+            name = self.idx[at : at + 20]
+            if name < binary_id:
+                low = middle + 1
+            elif name > binary_id:
+                high = middle
+            else:
+                (offset,) = struct.unpack_from(
+                    ">I", self.idx, self.offsets_at + middle * 4
+                )
+                if offset & 0x80000000:
+                    (offset,) = struct.unpack_from(
+                        ">Q",
+                        self.idx,
+                        self.large_offsets_at + (offset & 0x7FFFFFFF) * 8,
+                    )
+                return offset
+        return None
+
+    def inflate(self, pos: int, size: int) -> bytes:
+        decompressor = zlib.decompressobj()
+        chunks = []
+        while not decompressor.eof:
+            chunk = self.pack[pos : pos + INFLATE_CHUNK]
+            if not chunk:
+                raise UnsupportedGitObject("Truncated packfile")
+            try:
+                chunks.append(decompressor.decompress(chunk))
+            except zlib.error as e:
+                raise UnsupportedGitObject(f"Corrupt packed object: {e}") from e
+            pos += INFLATE_CHUNK
+        data = b"".join(chunks)
+        if len(data) != size:
+            raise UnsupportedGitObject("Packed object has the wrong size")
+        return data
+
+    def entry(self, offset: int) -> tuple[int, bytes, int | bytes | None]:
+        """
+        `(type, data, base)` of the entry at `offset`. `base` is the offset of
+        an offset delta's base, or the binary object id of a ref delta's.
+        """
+        byte = self.pack[offset]
+        kind = (byte >> 4) & 0x7
+        size = byte & 0x0F
+        shift = 4
+        pos = offset + 1
+        while byte & 0x80:
+            byte = self.pack[pos]
+            pos += 1
+            size |= (byte & 0x7F) << shift
+            shift += 7
+
+        base: int | bytes | None = None
+        if kind == OFS_DELTA:
+            byte = self.pack[pos]
+            pos += 1
+            distance = byte & 0x7F
+            while byte & 0x80:
+                byte = self.pack[pos]
+                pos += 1
+                distance = ((distance + 1) << 7) | (byte & 0x7F)
+            base = offset - distance
+        elif kind == REF_DELTA:
+            base = self.pack[pos : pos + 20]
+            pos += 20
+        elif kind not in OBJECT_TYPES:
+            raise UnsupportedGitObject(f"Unknown packed object type {kind}")
+        return kind, self.inflate(pos, size), base
+
+
+def find_git_dirs(base_path: str) -> tuple[Path, Path] | None:
+    """`(git dir, common dir)` of the repository containing `base_path`."""
+    path = Path(base_path).resolve()
+    for candidate in (path, *path.parents):
+        dot_git = candidate / ".git"
+        if dot_git.is_file():
+            # A linked worktree or submodule: `gitdir: <path>`.
+            content = dot_git.read_text().strip()
+            if not content.startswith("gitdir: "):
+                return None
+            git_dir = (candidate / content.removeprefix("gitdir: ")).resolve()
+        elif dot_git.is_dir():
+            git_dir = dot_git
+        elif (candidate / "HEAD").is_file() and (candidate / "objects").is_dir():
+            git_dir = candidate
+        else:
+            continue
+        common_dir = git_dir
+        if (git_dir / "commondir").is_file():
+            common_dir = (
+                git_dir / (git_dir / "commondir").read_text().strip()
+            ).resolve()
+        return git_dir, common_dir
+    return None
+
+
+class GitObjectReader:
+    def __init__(self, git_dir: Path, common_dir: Path) -> None:
+        self.git_dir = git_dir
+        self.common_dir = common_dir
+        self.objects_dir = common_dir / "objects"
+        self._packs: dict[Path, Pack] = {}
+        self._lock = threading.Lock()
+        config = common_dir / "config"
+        if config.is_file() and re.search(
+            r"objectformat|refstorage", config.read_text(), re.IGNORECASE
+        ):
+            raise UnsupportedGitObject(
+                "Only SHA-1 objects and files refs are supported"
+            )
+        if (self.objects_dir / "info" / "alternates").exists():
+            raise UnsupportedGitObject("Alternate object directories are not supported")
+
+    @classmethod
+    def open(cls, base_path: str) -> "GitObjectReader | None":
+        """A reader for the repository at `base_path`, or `None` to use `git`."""
+        if any(
+            os.environ.get(name) for name in (*GIT_ENVIRONMENT, DISABLE_READER_VARIABLE)
+        ):
+            return None
+        git_dirs = find_git_dirs(base_path)
+        if git_dirs is None:
+            return None
+        try:
+            return cls(*git_dirs)
+        except (OSError, UnsupportedGitObject):
+            return None
+
+    def _known_packs(self) -> list[Pack]:
+        with self._lock:
+            return list(self._packs.values())
+
+    def _scan_packs(self) -> list[Pack]:
+        with self._lock:
+            for idx_path in sorted((self.objects_dir / "pack").glob("*.idx")):
+                if idx_path in self._packs:
+                    continue
+                try:
+                    self._packs[idx_path] = Pack(idx_path)
+                except OSError as e:
+                    # E.g. a pack being written or removed by a concurrent gc.
+                    raise UnsupportedGitObject(f"Cannot open {idx_path}: {e}") from e
+            return list(self._packs.values())
+
+    def _read_packed(
+        self, binary_id: bytes, packs: list[Pack]
+    ) -> tuple[str, bytes] | None:
+        for pack in packs:
+            offset = pack.offset(binary_id)
+            if offset is None:
+                continue
+            deltas = []
+            while True:
+                kind, data, base = pack.entry(offset)
+                if kind == OFS_DELTA:
+                    assert isinstance(base, int)
+                    deltas.append(data)
+                    offset = base
+                elif kind == REF_DELTA:
+                    assert isinstance(base, bytes)
+                    deltas.append(data)
+                    object_type, data = self.read_object(base.hex())
+                    break
+                else:
+                    object_type = OBJECT_TYPES[kind]
+                    break
+            for delta in reversed(deltas):
+                data = apply_delta(data, delta)
+            return object_type, data
+        return None
+
+    def read_object(self, object_id: str) -> tuple[str, bytes]:
+        """The type and content of an object."""
+        loose_path = self.objects_dir / object_id[:2] / object_id[2:]
+        try:
+            loose = zlib.decompress(loose_path.read_bytes())
+        except FileNotFoundError:
+            pass
+        except (OSError, zlib.error) as e:
+            raise UnsupportedGitObject(f"Cannot read {loose_path}: {e}") from e
+        else:
+            header, _, content = loose.partition(b"\0")
+            return header.split(b" ")[0].decode(), content
+
+        binary_id = bytes.fromhex(object_id)
+        packed = self._read_packed(binary_id, self._known_packs())
+        if packed is None:
+            # A pack written since the last scan, e.g. after `git gc`.
+            packed = self._read_packed(binary_id, self._scan_packs())
+        if packed is None:
+            raise UnsupportedGitObject(f"Object {object_id} not found")
+        return packed
+
+    def _read_ref(self, name: str, depth: int = 0) -> str | None:
+        if depth > 5:
+            raise UnsupportedGitObject(f"Symbolic ref loop at {name}")
+        ref_dir = self.git_dir if "/" not in name else self.common_dir
+        ref_path = ref_dir / name
+        if ref_path.is_file():
+            content = ref_path.read_text().strip()
+            if content.startswith("ref: "):
+                return self._read_ref(content.removeprefix("ref: "), depth + 1)
+            return content
+        packed_refs = self.common_dir / "packed-refs"
+        if packed_refs.is_file():
+            for line in packed_refs.read_text().splitlines():
+                object_id, _, ref_name = line.partition(" ")
+                if ref_name == name:
+                    return object_id
+        return None
+
+    def resolve(self, rev: str) -> str:
+        """The object id `rev` names: a full object id or a ref, in git's order."""
+        if OBJECT_ID.match(rev):
+            return rev
+        if rev.startswith("/") or re.search(r"[~^:@{}\\\s]|\.\.", rev):
+            raise UnsupportedGitObject(f"Unsupported revision: {rev}")
+        for prefix in REF_PREFIXES:
+            object_id = self._read_ref(prefix + rev)
+            if object_id is not None:
+                if not OBJECT_ID.match(object_id):
+                    raise UnsupportedGitObject(f"Unsupported ref value for {rev}")
+                return object_id
+        object_id = self._read_ref(f"refs/remotes/{rev}/HEAD")
+        if object_id is None:
+            raise UnsupportedGitObject(f"Unknown revision: {rev}")
+        return object_id
+
+    def peel(self, object_id: str, object_type: str) -> tuple[str, bytes]:
+        """Follow tags (and a commit to its tree) until an `object_type` object."""
+        while True:
+            kind, content = self.read_object(object_id)
+            if kind == object_type:
+                return object_id, content
+            if kind == "tag":
+                object_id = header_value(content, b"object")
+            elif kind == "commit" and object_type == "tree":
+                object_id = header_value(content, b"tree")
+            else:
+                raise UnsupportedGitObject(
+                    f"{object_id} is a {kind}, not a {object_type}"
+                )
+
+    def resolve_commit(self, rev: str) -> str:
+        return self.peel(self.resolve(rev), "commit")[0]
+
+    def blob_id(self, rev: str, path: str) -> str | None:
+        """The blob id at `rev:path`, or `None` if `path` is not in that tree."""
+        _, tree = self.peel(self.resolve(rev), "tree")
+        parts = path.strip("/").split("/")
+        for depth, part in enumerate(parts):
+            entry = tree_entry(tree, part.encode())
+            if entry is None:
+                return None
+            mode, object_id = entry
+            if depth == len(parts) - 1:
+                if mode == b"160000":
+                    raise UnsupportedGitObject(f"{path} is a submodule")
+                return object_id
+            if mode != b"40000":
+                return None
+            kind, tree = self.read_object(object_id)
+            if kind != "tree":
+                raise UnsupportedGitObject(f"{object_id} is a {kind}, not a tree")
+        return None
+
+    def read_blob(self, object_id: str) -> bytes:
+        kind, content = self.read_object(object_id)
+        if kind != "blob":
+            raise UnsupportedGitObject(f"{object_id} is a {kind}, not a blob")
+        return content
+
+
+def git_blob_id(content: bytes) -> str:
+    """The id git gives a blob with this content."""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+def header_value(content: bytes, key: bytes) -> str:
+    """A header of a commit or tag object, such as its `tree`."""
+    for line in content.split(b"\n"):
+        if not line:
+            break
+        if line.startswith(key + b" "):
+            return line[len(key) + 1 :].decode()
+    raise UnsupportedGitObject(f"Object has no {key.decode()} header")
+
+
+def tree_entry(tree: bytes, name: bytes) -> tuple[bytes, str] | None:
+    """`(mode, object id)` of the entry called `name` in a tree object."""
+    pos = 0
+    while pos < len(tree):
+        space = tree.index(b" ", pos)
+        nul = tree.index(b"\0", space)
+        if tree[space + 1 : nul] == name:
+            return tree[pos:space], tree[nul + 1 : nul + 21].hex()
+        pos = nul + 21
+    return None
+
+
+@lru_cache(maxsize=32)
+def open_reader(base_path: str) -> GitObjectReader | None:
+    return GitObjectReader.open(base_path)
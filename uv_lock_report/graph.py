@@ -0,0 +1,184 @@
+"""
+Dependency graph over the packages of a single lockfile.
+
+Package names are mapped to dense integer ids once, so reachability from the
+root packages is stored as one Python int bitset per package and every query
+after construction is a lookup instead of a fresh traversal. The dependency
+groups and extras of the root packages get the same treatment: one pass
+propagates a bitset of the groups that pull in each package.
+"""
+
+from collections import deque
+from collections.abc import Iterable
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from uv_lock_report.models import LockfilePackage
+
+ROOT_SOURCES = ("editable", "virtual")
+PRODUCTION = "production"
+
+
+def is_root_package(package: "LockfilePackage") -> bool:
+    return package.source is not None and any(
+        key in package.source for key in ROOT_SOURCES
+    )
+
+
+class DependencyGraph:
+    def __init__(self, packages: Iterable["LockfilePackage"]) -> None:
+        self.packages = list(packages)
+        self.names: list[str] = []
+        self.index: dict[str, int] = {}
+        for package in self.packages:
+            if package.name not in self.index:
+                self.index[package.name] = len(self.names)
+                self.names.append(package.name)
+
+        self.adjacency: list[list[int]] = [[] for _ in self.names]
+        # What installing each package installs: a root's own extras and
+        # groups are only installed when that root is the project.
+        self.install_adjacency: list[list[int]] = [[] for _ in self.names]
+        self.groups: list[str] = [PRODUCTION]
+        self.group_seeds: list[tuple[int, int]] = []
+        requested_extras: dict[str, set[str]] = {}
+        for package in self.packages:
+            for dependency in package.dependencies:
+                if dependency.extra:
+                    requested_extras.setdefault(dependency.name, set()).update(
+                        dependency.extra
+                    )
+
+        root_ids: list[int] = []
+        for package in self.packages:
+            node = self.index[package.name]
+            root = is_root_package(package)
+            if root:
+                root_ids.append(node)
+                self.group_seeds.append((0, node))
+            dependencies = list(package.dependencies)
+            for extra, extra_dependencies in package.optional_dependencies.items():
+                if root:
+                    self._seed_group(f"extra: {extra}", extra_dependencies)
+                if root or extra in requested_extras.get(package.name, ()):
+                    dependencies.extend(extra_dependencies)
+            self.install_adjacency[node].extend(
+                self.index[dependency.name]
+                for dependency in (package.dependencies if root else dependencies)
+                if dependency.name in self.index
+            )
+            for group, group_dependencies in package.dev_dependencies.items():
+                if root:
+                    self._seed_group(f"group: {group}", group_dependencies)
+                dependencies.extend(group_dependencies)
+            self.adjacency[node].extend(
+                self.index[dependency.name]
+                for dependency in dependencies
+                if dependency.name in self.index
+            )
+
+        if not root_ids:
+            has_dependents = {child for edges in self.adjacency for child in edges}
+            root_ids = [
+                node for node in range(len(self.names)) if node not in has_dependents
+            ]
+            self.group_seeds.extend((0, node) for node in root_ids)
+        self.root_ids = list(dict.fromkeys(root_ids))
+
+    def _seed_group(self, group: str, dependencies: Iterable) -> None:
+        if group not in self.groups:
+            self.groups.append(group)
+        bit = self.groups.index(group)
+        self.group_seeds.extend(
+            (bit, self.index[dependency.name])
+            for dependency in dependencies
+            if dependency.name in self.index
+        )
+
+    @property
+    def roots(self) -> list[str]:
+        return [self.names[node] for node in self.root_ids]
+
+    @cached_property
+    def root_masks(self) -> list[int]:
+        """Bitset of the roots (by position in `root_ids`) reaching each package."""
+        masks = [0] * len(self.names)
+        queue: deque[int] = deque()
+        for bit, root in enumerate(self.root_ids):
+            masks[root] |= 1 << bit
+            queue.append(root)
+
+        while queue:
+            node = queue.popleft()
+            mask = masks[node]
+            for child in self.adjacency[node]:
+                if masks[child] | mask != masks[child]:
+                    masks[child] |= mask
+                    queue.append(child)
+        return masks
+
+    @cached_property
+    def parents(self) -> list[int | None]:
+        """Breadth-first tree from all roots at once; each entry is the parent id."""
+        parents: list[int | None] = [None] * len(self.names)
+        seen = [False] * len(self.names)
+        queue: deque[int] = deque()
+        for root in self.root_ids:
+            seen[root] = True
+            queue.append(root)
+
+        while queue:
+            node = queue.popleft()
+            for child in self.adjacency[node]:
+                if not seen[child]:
+                    seen[child] = True
+                    parents[child] = node
+                    queue.append(child)
+        return parents
+
+    @cached_property
+    def group_masks(self) -> list[int]:
+        """Bitset of the groups (by position in `groups`) that install each package."""
+        masks = [0] * len(self.names)
+        queue: deque[int] = deque()
+        for bit, node in self.group_seeds:
+            masks[node] |= 1 << bit
+            queue.append(node)
+
+        while queue:
+            node = queue.popleft()
+            mask = masks[node]
+            for child in self.install_adjacency[node]:
+                if masks[child] | mask != masks[child]:
+                    masks[child] |= mask
+                    queue.append(child)
+        return masks
+
+    def groups_reaching(self, name: str) -> list[str]:
+        """`production`, `extra: <name>` and `group: <name>` labels installing `name`."""
+        if name not in self.index:
+            return []
+        mask = self.group_masks[self.index[name]]
+        return [group for bit, group in enumerate(self.groups) if mask & (1 << bit)]
+
+    def roots_reaching(self, name: str) -> list[str]:
+        if name not in self.index:
+            return []
+        mask = self.root_masks[self.index[name]]
+        return [
+            self.names[root]
+            for bit, root in enumerate(self.root_ids)
+            if mask & (1 << bit)
+        ]
+
+    def chain(self, name: str) -> list[str]:
+        """Shortest dependency chain from a root to `name`, or `[]` if unreachable."""
+        if name not in self.index or not self.root_masks[self.index[name]]:
+            return []
+        node: int | None = self.index[name]
+        chain: list[str] = []
+        while node is not None:
+            chain.append(self.names[node])
+            node = self.parents[node]
+        return chain[::-1]
@@ -0,0 +1,319 @@
+"""
+SQLite history of lockfile snapshots and generated reports.
+
+Each snapshot stores only the packages that changed since the snapshot of its
+parent commit, plus a full keyframe every `KEYFRAME_INTERVAL` snapshots so that
+reconstructing any commit reads at most that many deltas. A snapshot whose
+parent was never recorded is a keyframe that changes nothing: it is a baseline,
+not a bump of every package. Point queries ("which version of X at commit Y")
+walk the delta chain with one indexed lookup per snapshot.
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from uv_lock_report.models import LockfileChanges, UvLockFile
+
+KEYFRAME_INTERVAL = 32
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    repo_id INTEGER NOT NULL REFERENCES repos (id),
+    commit_sha TEXT NOT NULL,
+    parent_id INTEGER REFERENCES snapshots (id),
+    depth INTEGER NOT NULL,
+    requires_python TEXT,
+    recorded_at REAL NOT NULL,
+    UNIQUE (repo_id, commit_sha)
+);
+CREATE TABLE IF NOT EXISTS snapshot_packages (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id),
+    name TEXT NOT NULL,
+    version TEXT,
+    changed INTEGER NOT NULL,
+    PRIMARY KEY (snapshot_id, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS snapshot_packages_changes
+    ON snapshot_packages (name, changed, snapshot_id);
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    repo_id INTEGER NOT NULL REFERENCES repos (id),
+    commit_sha TEXT NOT NULL,
+    base_sha TEXT,
+    changes TEXT NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reports_commit ON reports (repo_id, commit_sha);
+"""
+
+# A `version` of NULL marks a package removed in that snapshot; packages locked
+# without a version (e.g. the editable project itself) are stored as "".
+REMOVED = None
+
+
+class PackageBump(BaseModel):
+    name: str
+    commit_sha: str
+    old_version: str | None
+    new_version: str | None
+
+
+class PackageDrift(BaseModel):
+    name: str
+    version_a: str | None
+    version_b: str | None
+
+
+class HistoryStore:
+    def __init__(self, path: Path | str) -> None:
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def _repo_id(self, repo: str) -> int:
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO repos (name) VALUES (?)", (repo,)
+            )
+        return self.connection.execute(
+            "SELECT id FROM repos WHERE name = ?", (repo,)
+        ).fetchone()[0]
+
+    def _snapshot(self, repo: str, commit: str) -> tuple[int, str]:
+        """Resolve a full or abbreviated commit to `(snapshot id, full sha)`."""
+        rows = self.connection.execute(
+            "SELECT snapshots.id, commit_sha FROM snapshots "
+            "JOIN repos ON repos.id = snapshots.repo_id "
+            "WHERE repos.name = ? AND commit_sha >= ? AND commit_sha < ? "
+            "LIMIT 2",
+            (repo, commit, commit + "\U0010ffff"),
+        ).fetchall()
+        if not rows:
+            raise KeyError(f"No snapshot recorded for {repo}@{commit}")
+        if len(rows) > 1:
+            raise KeyError(f"Ambiguous commit {commit} for {repo}")
+        return rows[0]
+
+    def _chain(self, snapshot_id: int) -> list[int]:
+        """Snapshot ids from `snapshot_id` back to (and including) its keyframe."""
+        chain = []
+        current: int | None = snapshot_id
+        while current is not None:
+            chain.append(current)
+            current, depth = self.connection.execute(
+                "SELECT parent_id, depth FROM snapshots WHERE id = ?", (current,)
+            ).fetchone()
+            if depth == 0:
+                break
+        return chain
+
+    def _packages(self, snapshot_id: int) -> dict[str, str]:
+        packages: dict[str, str | None] = {}
+        for chain_id in reversed(self._chain(snapshot_id)):
+            for name, version in self.connection.execute(
+                "SELECT name, version FROM snapshot_packages WHERE snapshot_id = ?",
+                (chain_id,),
+            ):
+                packages[name] = version
+        return {
+            name: version for name, version in packages.items() if version is not None
+        }
+
+    def record_snapshot(
+        self,
+        repo: str,
+        commit: str,
+        lockfile: UvLockFile,
+        parent: str | None = None,
+    ) -> int:
+        """
+        Record the lockfile at `commit`, as a delta against the `parent` commit.
+
+        `parent` must be an ancestor of `commit` (e.g. its parent, or the base
+        of a pull request), so that deltas follow history rather than the
+        order snapshots from different branches happen to be recorded in.
+        """
+        repo_id = self._repo_id(repo)
+        existing = self.connection.execute(
+            "SELECT id FROM snapshots WHERE repo_id = ? AND commit_sha = ?",
+            (repo_id, commit),
+        ).fetchone()
+        if existing:
+            return existing[0]
+
+        # A package locked in several resolution forks is one row, its versions
+        # comma-separated, so that a change in any fork is a change.
+        packages = lockfile.locked_versions
+        previous = None
+        if parent is not None:
+            previous = self.connection.execute(
+                "SELECT id, depth FROM snapshots WHERE repo_id = ? AND commit_sha = ?",
+                (repo_id, parent),
+            ).fetchone()
+        changed: set[str] = set()
+        if previous:
+            previous_packages = self._packages(previous[0])
+            changed = {
+                name
+                for name in packages.keys() | previous_packages.keys()
+                if packages.get(name) != previous_packages.get(name)
+            }
+
+        keyframe = previous is None or previous[1] + 1 >= KEYFRAME_INTERVAL
+        rows = [(name, packages.get(name, REMOVED), True) for name in sorted(changed)]
+        if keyframe:
+            rows.extend(
+                (name, version, False)
+                for name, version in packages.items()
+                if name not in changed
+            )
+
+        with self.connection:
+            snapshot_id = self.connection.execute(
+                "INSERT INTO snapshots "
+                "(repo_id, commit_sha, parent_id, depth, requires_python, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    repo_id,
+                    commit,
+                    previous[0] if previous else None,
+                    0 if keyframe else previous[1] + 1,
+                    lockfile.requires_python,
+                    time.time(),
+                ),
+            ).lastrowid
+            self.connection.executemany(
+                "INSERT INTO snapshot_packages VALUES (?, ?, ?, ?)",
+                [(snapshot_id, *row) for row in rows],
+            )
+        assert snapshot_id is not None
+        return snapshot_id
+
+    def record_report(
+        self,
+        repo: str,
+        commit: str,
+        lockfile_changes: LockfileChanges,
+        base_sha: str | None = None,
+    ) -> None:
+        repo_id = self._repo_id(repo)
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO reports (repo_id, commit_sha, base_sha, changes, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    repo_id,
+                    commit,
+                    base_sha,
+                    lockfile_changes.model_dump_json(),
+                    time.time(),
+                ),
+            )
+
+    def reports(self, repo: str, commit: str) -> list[LockfileChanges]:
+        return [
+            LockfileChanges.model_validate_json(changes)
+            for (changes,) in self.connection.execute(
+                "SELECT changes FROM reports JOIN repos ON repos.id = reports.repo_id "
+                "WHERE repos.name = ? AND commit_sha = ? ORDER BY reports.id",
+                (repo, commit),
+            )
+        ]
+
+    def packages_at(self, repo: str, commit: str) -> dict[str, str]:
+        snapshot_id, _ = self._snapshot(repo, commit)
+        return self._packages(snapshot_id)
+
+    def version_at(self, repo: str, name: str, commit: str) -> str | None:
+        """Version of `name` locked at `commit`, or `None` if it was not locked."""
+        snapshot_id, _ = self._snapshot(repo, commit)
+        for chain_id in self._chain(snapshot_id):
+            row = self.connection.execute(
+                "SELECT version FROM snapshot_packages "
+                "WHERE snapshot_id = ? AND name = ?",
+                (chain_id, name),
+            ).fetchone()
+            if row:
+                return row[0]
+        return None
+
+    def last_bump(
+        self, repo: str, name: str, commit: str | None = None
+    ) -> PackageBump | None:
+        """
+        Most recently recorded snapshot that changed the version of `name`.
+
+        With a `commit`, only that commit and its recorded ancestors count, so
+        bumps on other branches are ignored.
+        """
+        if commit is not None:
+            current: int | None = self._snapshot(repo, commit)[0]
+            while current is not None:
+                commit_sha, parent_id = self.connection.execute(
+                    "SELECT commit_sha, parent_id FROM snapshots WHERE id = ?",
+                    (current,),
+                ).fetchone()
+                changed = self.connection.execute(
+                    "SELECT version FROM snapshot_packages "
+                    "WHERE snapshot_id = ? AND name = ? AND changed = 1",
+                    (current, name),
+                ).fetchone()
+                if changed:
+                    return self._bump(name, commit_sha, parent_id, changed[0])
+                current = parent_id
+            return None
+
+        row = self.connection.execute(
+            "SELECT snapshots.id, commit_sha, parent_id, version "
+            "FROM snapshot_packages "
+            "JOIN snapshots ON snapshots.id = snapshot_packages.snapshot_id "
+            "JOIN repos ON repos.id = snapshots.repo_id "
+            "WHERE snapshot_packages.name = ? AND changed = 1 AND repos.name = ? "
+            "ORDER BY snapshots.id DESC LIMIT 1",
+            (name, repo),
+        ).fetchone()
+        if row is None:
+            return None
+        _, commit_sha, parent_id, new_version = row
+        return self._bump(name, commit_sha, parent_id, new_version)
+
+    def _bump(
+        self,
+        name: str,
+        commit_sha: str,
+        parent_id: int | None,
+        new_version: str | None,
+    ) -> PackageBump:
+        old_version = None
+        if parent_id is not None:
+            old_version = self._packages(parent_id).get(name)
+        return PackageBump(
+            name=name,
+            commit_sha=commit_sha,
+            old_version=old_version,
+            new_version=new_version,
+        )
+
+    def drift(self, repo: str, commit_a: str, commit_b: str) -> list[PackageDrift]:
+        """Packages whose locked version differs between two recorded commits."""
+        packages_a = self.packages_at(repo, commit_a)
+        packages_b = self.packages_at(repo, commit_b)
+        return [
+            PackageDrift(
+                name=name,
+                version_a=packages_a.get(name),
+                version_b=packages_b.get(name),
+            )
+            for name in sorted(packages_a.keys() | packages_b.keys())
+            if packages_a.get(name) != packages_b.get(name)
+        ]
@@ -1,10 +1,36 @@
+import base64
+import binascii
+import hashlib
+import json
 import re
 import tomllib
+import zlib
+from collections.abc import Iterator
+from datetime import datetime
 from enum import IntEnum, StrEnum, auto
-from functools import cached_property
+from fnmatch import fnmatchcase
+from functools import cached_property, lru_cache
+from typing import Any, NamedTuple
+
+from packaging.version import Version, parse
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    ValidationError,
+    computed_field,
+    model_validator,
+)
 
-from packaging.version import parse
-from pydantic import BaseModel, ConfigDict, Field, computed_field
+from uv_lock_report.filters import PackageFilter
+from uv_lock_report.graph import PRODUCTION, DependencyGraph
+from uv_lock_report.wheels import (
+    WheelTriple,
+    describe_pairs,
+    uncovered,
+    wheel_tag,
+    wheel_triples,
+)
 
 
 class OutputFormat(StrEnum):
@@ -18,20 +44,38 @@ class VersionChangeType(StrEnum):
 
 
 class VersionChangeLevel(IntEnum):
+    EPOCH = -1
     MAJOR = 0
     MINOR = 1
     PATCH = 2
+    CALVER = 3
+    PRERELEASE = 4
+    POST = 5
+    DEV = 6
+    LOCAL = 7
     UNKNOWN = 10
 
     @property
     def gitmoji(self) -> str:
         match self:
+            case VersionChangeLevel.EPOCH:
+                return ":warning:"
             case VersionChangeLevel.MAJOR:
                 return ":collision:"
             case VersionChangeLevel.MINOR:
                 return ":sparkles:"
             case VersionChangeLevel.PATCH:
                 return ":hammer_and_wrench:"
+            case VersionChangeLevel.CALVER:
+                return ":date:"
+            case VersionChangeLevel.PRERELEASE:
+                return ":construction:"
+            case VersionChangeLevel.POST:
+                return ":package:"
+            case VersionChangeLevel.DEV:
+                return ":alembic:"
+            case VersionChangeLevel.LOCAL:
+                return ":label:"
             case VersionChangeLevel.UNKNOWN:
                 return ":question:"
             case _:
@@ -52,6 +96,172 @@ BASEVERSION = re.compile(
 )
 
 
+@lru_cache(maxsize=8192)
+def parse_version(version: str) -> Version:
+    """`packaging.version.parse`, memoized across every lockfile in the process."""
+    return parse(version)
+
+
+# Packages released as `YY.N`, e.g. pip 24.3 or black 25.1.0, which look just
+# like semantic versions that reached a high major version.
+CALENDAR_VERSIONED_PACKAGES = frozenset(
+    {"attrs", "black", "cattrs", "pip", "pyopenssl", "twisted"}
+)
+
+
+def is_calendar_version(version: str, calendar_versioned: bool = False) -> bool:
+    """
+    `YYYY.*` releases, and `YY.*` ones of `calendar_versioned` packages.
+
+    A `YY.MM.*` release is not told apart from semver by its shape: uv.lock
+    stores normalized versions (`24.4`, not `24.04`), which look like `24.4`
+    of a semver project.
+    """
+    release = parse_version(version).release
+    if 2000 <= release[0] < 2100:
+        return True
+    return calendar_versioned and 15 <= release[0] < 100
+
+
+def release_key(version: Version) -> tuple[int, ...]:
+    """Release components without trailing zeros, so `1.0` and `1.0.0` compare equal."""
+    release = list(version.release)
+    while len(release) > 1 and release[-1] == 0:
+        release.pop()
+    return tuple(release)
+
+
+@lru_cache(maxsize=8192)
+def classify_version_change(
+    old: str, new: str, calendar_versioned: bool = False
+) -> "VersionChangeLevel":
+    """
+    The most significant PEP 440 component that differs between two versions.
+
+    `calendar_versioned` treats `YY.*` releases as calendar versions too, see
+    `is_calendar_version`.
+
+    Memoized per version pair: the same upgrades recur across the packages of a
+    workspace and across reports in one process.
+    """
+    old_version = parse_version(old)
+    new_version = parse_version(new)
+
+    if new_version.epoch != old_version.epoch:
+        return VersionChangeLevel.EPOCH
+    if release_key(new_version) != release_key(old_version):
+        if is_calendar_version(old, calendar_versioned) and is_calendar_version(
+            new, calendar_versioned
+        ):
+            return VersionChangeLevel.CALVER
+        if new_version.major != old_version.major:
+            return VersionChangeLevel.MAJOR
+        elif new_version.minor != old_version.minor:
+            return VersionChangeLevel.MINOR
+        # Micro, or a fourth or later release component.
+        return VersionChangeLevel.PATCH
+    if new_version.pre != old_version.pre:
+        return VersionChangeLevel.PRERELEASE
+    if new_version.post != old_version.post:
+        return VersionChangeLevel.POST
+    if new_version.dev != old_version.dev:
+        return VersionChangeLevel.DEV
+    if new_version.local != old_version.local:
+        return VersionChangeLevel.LOCAL
+    return VersionChangeLevel.UNKNOWN
+
+
+def artifact_fingerprint(package: dict[str, Any]) -> str | None:
+    """Short digest of a raw `[[package]]` table's source and sorted artifact hashes."""
+    hashes = []
+    if sdist := package.get("sdist"):
+        hashes.append(sdist.get("hash", ""))
+    hashes.extend(wheel.get("hash", "") for wheel in package.get("wheels", ()))
+    source = package.get("source")
+    if not hashes and source is None:
+        return None
+
+    digest = hashlib.sha256(json.dumps(source, sort_keys=True).encode())
+    for artifact_hash in sorted(hashes):
+        digest.update(b"\0")
+        digest.update(artifact_hash.encode())
+    return digest.hexdigest()[:16]
+
+
+SDIST = "sdist"
+
+
+def wheel_artifacts(package: dict[str, Any]) -> tuple[frozenset[str], dict[str, int]]:
+    """
+    Wheel tags of a raw `[[package]]` table, and the download size of each of
+    its artifacts by wheel tag (or `SDIST`).
+    """
+    tags: set[str] = set()
+    sizes: dict[str, int] = {}
+    if (sdist := package.get("sdist")) and "size" in sdist:
+        sizes[SDIST] = sdist["size"]
+    for wheel in package.get("wheels", ()):
+        filename = wheel.get("url") or wheel.get("filename") or wheel.get("path")
+        if not filename:
+            continue
+        tag = wheel_tag(filename)
+        tags.add(tag)
+        if "size" in wheel:
+            sizes[tag] = max(sizes.get(tag, 0), wheel["size"])
+    return frozenset(tags), sizes
+
+
+def format_size(num_bytes: int, signed: bool = False) -> str:
+    sign = "+" if signed and num_bytes > 0 else "-" if num_bytes < 0 else ""
+    size = float(abs(num_bytes))
+    if size < 1000:
+        return f"{sign}{size:.0f} B"
+    for unit in ("kB", "MB", "GB"):
+        size /= 1000
+        if size < 1000:
+            break
+    return f"{sign}{size:.1f} {unit}"
+
+
+def fork_label(fork: str | None) -> str:
+    return f" (\\`{fork}\\`)" if fork else ""
+
+
+def commit_label(commits: list[str]) -> str:
+    # Abbreviated the way GitHub autolinks commit ids in comments.
+    return ", ".join(commit[:7] for commit in commits)
+
+
+def group_section_title(groups: tuple[str, ...]) -> str:
+    """`Production`, or the extras and dependency groups a section is installed by."""
+    if not groups:
+        return "Not Installed By The Project"
+    titles = []
+    for group in groups:
+        if group == PRODUCTION:
+            titles.append("Production")
+        else:
+            kind, _, name = group.partition(": ")
+            titles.append(f"{kind.title()} \\`{name}\\`")
+    return ", ".join(titles)
+
+
+class LockfileDependency(BaseModel):
+    name: str
+    extra: list[str] | None = None
+    marker: str | None = None
+
+    def edge(self, group: str | None = None) -> str:
+        edge = self.name
+        if self.extra:
+            edge += f"[{','.join(sorted(self.extra))}]"
+        if self.marker:
+            edge += f"; {self.marker}"
+        if group:
+            edge += f" ({group})"
+        return edge
+
+
 class LockfilePackageMetadata(BaseModel):
     requires_dist: list["LockfilePackage"] | None = Field(
         alias="requires-dist", default=None
@@ -73,22 +283,163 @@ class LockfilePackage(BaseModel):
     version: str | None = Field(alias="Version", default=None)
 
     metadata: LockfilePackageMetadata | None = Field(default=None, exclude=True)
+    source: dict[str, str] | None = Field(default=None, exclude=True)
+    artifact_fingerprint: str | None = Field(default=None, exclude=True)
+    artifact_sizes: dict[str, int] = Field(default={}, exclude=True)
+    wheel_tags: frozenset[str] = Field(default=frozenset(), exclude=True)
+    resolution_markers: list[str] = Field(default=[], exclude=True)
+    dependencies: list[LockfileDependency] = Field(default=[], exclude=True)
+    optional_dependencies: dict[str, list[LockfileDependency]] = Field(
+        default={}, exclude=True
+    )
+    dev_dependencies: dict[str, list[LockfileDependency]] = Field(
+        default={}, exclude=True
+    )
+
+    @model_validator(mode="before")
+    @classmethod
+    def parse_package_table(cls, data: Any) -> Any:
+        if not isinstance(data, dict):
+            return data
+        # uv.lock uses kebab-case keys, while fields are validated by name only.
+        data = {key.replace("-", "_"): value for key, value in data.items()}
+        if "artifact_fingerprint" not in data:
+            data["artifact_fingerprint"] = artifact_fingerprint(data)
+        if "wheel_tags" not in data:
+            data["wheel_tags"], data["artifact_sizes"] = wheel_artifacts(data)
+        return data
 
     def __str__(self) -> str:
+        if self.fork:
+            return f"{self.name} ({self.fork}): {self.version}"
         return f"{self.name}: {self.version}"
 
+    @property
+    def fork(self) -> str | None:
+        """The resolution markers of a package locked at several versions."""
+        return " or ".join(self.resolution_markers) or None
+
+    @cached_property
+    def key(self) -> "PackageKey":
+        return PackageKey(
+            name=self.name,
+            version=self.version,
+            source=tuple(sorted(self.source.items())) if self.source else (),
+            markers=tuple(self.resolution_markers),
+        )
+
+    def artifacts_differ(self, other: "LockfilePackage") -> bool:
+        return self.artifact_fingerprint != other.artifact_fingerprint
+
+    def download_size(self, platform: str | None = None) -> int | None:
+        """
+        Bytes a single install downloads: the largest wheel, or the sdist.
+
+        With a `platform` glob, only wheels built for a matching platform tag
+        (or, failing those, pure-Python wheels) are considered.
+        """
+        wheel_sizes = {
+            tag: size for tag, size in self.artifact_sizes.items() if tag != SDIST
+        }
+        if platform is not None:
+            wheel_sizes = {
+                tag: size
+                for tag, size in wheel_sizes.items()
+                if any(
+                    fnmatchcase(platform_tag, platform)
+                    for platform_tag in tag.rsplit("-", 1)[-1].split(".")
+                )
+            } or {
+                tag: size for tag, size in wheel_sizes.items() if tag.endswith("-any")
+            }
+        if wheel_sizes:
+            return max(wheel_sizes.values())
+        return self.artifact_sizes.get(SDIST)
+
+    @cached_property
+    def wheel_triples(self) -> frozenset[WheelTriple]:
+        return wheel_triples(self.wheel_tags)
+
+    @cached_property
+    def dependency_edges(self) -> frozenset[str]:
+        edges = {dependency.edge() for dependency in self.dependencies}
+        for extra, dependencies in self.optional_dependencies.items():
+            edges.update(dep.edge(f"extra: {extra}") for dep in dependencies)
+        for group, dependencies in self.dev_dependencies.items():
+            edges.update(dep.edge(f"group: {group}") for dep in dependencies)
+        return frozenset(edges)
+
     def __eq__(self, other):
         if not isinstance(other, LockfilePackage):
             return NotImplemented
         if self.version is None or other.version is None:
             return self.name == other.name and self.version == other.version
-        return self.name == other.name and parse(self.version) == parse(other.version)
+        return self.name == other.name and parse_version(self.version) == parse_version(
+            other.version
+        )
 
     def markdown_row(self) -> str:
-        return f"| {self.name} | {self.version} |"
+        return f"| {self.name}{fork_label(self.fork)} | {self.version} |"
 
     def markdown_simple(self) -> str:
-        return f"\\`{self.name}\\`: \\`{self.version}\\`"
+        return f"\\`{self.name}\\`{fork_label(self.fork)}: \\`{self.version}\\`"
+
+
+class PackageKey(NamedTuple):
+    """What identifies one `[[package]]` entry among those sharing its name."""
+
+    name: str
+    version: str | None
+    source: tuple[tuple[str, str], ...]
+    markers: tuple[str, ...]
+
+
+def match_forks(
+    old: list[LockfilePackage], new: list[LockfilePackage]
+) -> tuple[
+    list[tuple[LockfilePackage, LockfilePackage]],
+    list[LockfilePackage],
+    list[LockfilePackage],
+]:
+    """
+    Pair up the entries one package name has in two lockfiles.
+
+    Entries are paired by resolution markers first and by version second, so
+    a fork that moved to another version is an update, while a fork that was
+    split off or merged away is an addition or a removal. Returns the pairs,
+    the old entries left unpaired and the new entries left unpaired.
+    """
+    if len(old) == 1 and len(new) == 1:
+        return [(old[0], new[0])], [], []
+    pairs = []
+    old_left = list(old)
+    new_left = list(new)
+    for fork_of in (
+        lambda pkg: pkg.key._replace(version=None),
+        lambda pkg: pkg.version,
+    ):
+        unpaired = []
+        for new_pkg in new_left:
+            match = next(
+                (
+                    old_pkg
+                    for old_pkg in old_left
+                    if fork_of(old_pkg) == fork_of(new_pkg)
+                ),
+                None,
+            )
+            if match is None:
+                unpaired.append(new_pkg)
+                continue
+            pairs.append((match, new_pkg))
+            old_left = [old_pkg for old_pkg in old_left if old_pkg is not match]
+        new_left = unpaired
+    if len(old_left) == 1 and len(new_left) == 1:
+        pairs.append((old_left[0], new_left[0]))
+        old_left = new_left = []
+    order = {id(new_pkg): index for index, new_pkg in enumerate(new)}
+    pairs.sort(key=lambda pair: order[id(pair[1])])
+    return pairs, old_left, new_left
 
 
 class UpdatedPackage(BaseModel):
@@ -101,36 +452,218 @@ class UpdatedPackage(BaseModel):
     name: str = Field(alias="Package")
     old_version: str = Field(alias="Old Version")
     new_version: str = Field(alias="New Version")
+    fork: str | None = Field(alias="Fork", default=None)
 
     def __str__(self) -> str:
-        return f"{self.name}: {self.old_version} -> {self.new_version}"
+        name = f"{self.name} ({self.fork})" if self.fork else self.name
+        return f"{name}: {self.old_version} -> {self.new_version}"
 
     def change_type(self) -> VersionChangeType:
-        old_ver = parse(self.old_version)
-        new_ver = parse(self.new_version)
+        old_ver = parse_version(self.old_version)
+        new_ver = parse_version(self.new_version)
         if new_ver > old_ver:
             return VersionChangeType.UPGRADE
         else:
             return VersionChangeType.DOWNGRADE
 
     def change_level(self) -> VersionChangeLevel:
-        old_version = parse(self.old_version)
-        new_version = parse(self.new_version)
+        return classify_version_change(
+            self.old_version,
+            self.new_version,
+            self.name in CALENDAR_VERSIONED_PACKAGES,
+        )
 
-        if new_version.major != old_version.major:
-            return VersionChangeLevel.MAJOR
-        elif new_version.minor != old_version.minor:
-            return VersionChangeLevel.MINOR
-        elif new_version.micro != old_version.micro:
-            return VersionChangeLevel.PATCH
+    def markdown_row(self) -> str:
+        return f"| {self.name}{fork_label(self.fork)} | {self.old_version} | {self.new_version} |"
+
+    def markdown_simple(self) -> str:
+        return f"{self.change_level().gitmoji} \\`{self.name}\\`{fork_label(self.fork)}: \\`{self.old_version}\\` -> \\`{self.new_version}\\`"
 
-        return VersionChangeLevel.UNKNOWN
+
+class DependencyChanges(BaseModel):
+    name: str
+    added: list[str] = []
+    removed: list[str] = []
+
+    def __str__(self) -> str:
+        edges = [f"+{edge}" for edge in self.added]
+        edges.extend(f"-{edge}" for edge in self.removed)
+        return f"{self.name}: {', '.join(edges)}"
 
     def markdown_row(self) -> str:
-        return f"| {self.name} | {self.old_version} | {self.new_version} |"
+        return f"| {self.name} | {', '.join(self.added)} | {', '.join(self.removed)} |"
 
     def markdown_simple(self) -> str:
-        return f"{self.change_level().gitmoji} \\`{self.name}\\`: \\`{self.old_version}\\` -> \\`{self.new_version}\\`"
+        edges = [f"now depends on \\`{edge}\\`" for edge in self.added]
+        edges.extend(f"no longer depends on \\`{edge}\\`" for edge in self.removed)
+        return f"\\`{self.name}\\` {', '.join(edges)}"
+
+
+class WheelCoverageChange(BaseModel):
+    name: str
+    old_version: str | None
+    new_version: str | None
+    dropped: list[str] = []
+    added: list[str] = []
+
+    @property
+    def version(self) -> str:
+        if self.old_version == self.new_version:
+            return str(self.new_version)
+        return f"{self.old_version} -> {self.new_version}"
+
+    def __str__(self) -> str:
+        tags = [f"-{tag}" for tag in self.dropped]
+        tags.extend(f"+{tag}" for tag in self.added)
+        return f"{self.name}: {', '.join(tags)}"
+
+    def markdown_row(self) -> str:
+        return f"| {self.name} | {self.version} | {', '.join(self.dropped)} | {', '.join(self.added)} |"
+
+    def markdown_simple(self) -> str:
+        changes = []
+        if self.dropped:
+            tags = ", ".join(f"\\`{tag}\\`" for tag in self.dropped)
+            changes.append(f"no more {tags} wheels")
+        if self.added:
+            tags = ", ".join(f"\\`{tag}\\`" for tag in self.added)
+            changes.append(f"new {tags} wheels")
+        return f"\\`{self.name}\\` {self.version}: {'; '.join(changes)}"
+
+
+class PackageAttribution(BaseModel):
+    name: str
+    required_by: list[str]
+    chain: list[str]
+
+    def __str__(self) -> str:
+        return f"{self.name}: {' -> '.join(self.chain)}"
+
+    def markdown_row(self) -> str:
+        return f"| {self.name} | {', '.join(self.required_by)} | {' -> '.join(self.chain)} |"
+
+    def markdown_simple(self) -> str:
+        return f"\\`{self.name}\\`: " + " -> ".join(
+            f"\\`{name}\\`" for name in self.chain
+        )
+
+
+class PackageAdvisory(BaseModel):
+    name: str
+    version: str
+    id: str
+    aliases: list[str] = []
+    summary: str | None = None
+    fixed_version: str | None = None
+
+    def __str__(self) -> str:
+        return f"{self.name} {self.version}: {self.id}"
+
+    @property
+    def identifiers(self) -> str:
+        return ", ".join([self.id, *self.aliases])
+
+    def markdown_row(self) -> str:
+        return f"| {self.name} | {self.version} | {self.identifiers} | {self.summary or ''} | {self.fixed_version or ''} |"
+
+    def markdown_simple(self) -> str:
+        text = f":rotating_light: \\`{self.name}\\`: \\`{self.version}\\` {self.identifiers}"
+        if self.summary:
+            text += f" - {self.summary}"
+        if self.fixed_version:
+            text += f" (fixed in \\`{self.fixed_version}\\`)"
+        return text
+
+
+class ReleaseMetadata(BaseModel):
+    name: str
+    version: str
+    released_at: datetime | None = None
+    age_days: int | None = None
+    changelog_url: str | None = None
+
+    def __str__(self) -> str:
+        return f"{self.name} {self.version}: {self.released_date or 'unknown'}"
+
+    @property
+    def released_date(self) -> str | None:
+        return self.released_at.date().isoformat() if self.released_at else None
+
+    @property
+    def age(self) -> str:
+        return f"{self.age_days} days" if self.age_days is not None else ""
+
+    @property
+    def links(self) -> str:
+        return f"[changelog]({self.changelog_url})" if self.changelog_url else ""
+
+    def markdown_row(self) -> str:
+        return f"| {self.name} | {self.version} | {self.released_date or ''} | {self.age} | {self.links} |"
+
+    def markdown_simple(self) -> str:
+        text = f":calendar: \\`{self.name}\\`: \\`{self.version}\\`"
+        if self.released_date:
+            text += f" released {self.released_date} ({self.age} ago)"
+        if self.links:
+            text += f" {self.links}"
+        return text
+
+
+class PackageDelta(BaseModel):
+    name: str
+    previous_version: str | None
+    current_version: str | None
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.previous_version} -> {self.current_version}"
+
+    def markdown_row(self) -> str:
+        return f"| {self.name} | {self.previous_version or 'not locked'} | {self.current_version or 'not locked'} |"
+
+    def markdown_simple(self) -> str:
+        if self.previous_version is None:
+            return f"\\`{self.name}\\`: now \\`{self.current_version}\\`"
+        if self.current_version is None:
+            return f"\\`{self.name}\\`: no longer locked (was \\`{self.previous_version}\\`)"
+        return f"\\`{self.name}\\`: \\`{self.previous_version}\\` -> \\`{self.current_version}\\`"
+
+
+class SizeChange(BaseModel):
+    name: str
+    old_size: int | None
+    new_size: int | None
+
+    @property
+    def delta(self) -> int:
+        return (self.new_size or 0) - (self.old_size or 0)
+
+    def __str__(self) -> str:
+        return f"{self.name}: {format_size(self.delta, signed=True)}"
+
+    def markdown_row(self) -> str:
+        old_size = format_size(self.old_size) if self.old_size is not None else ""
+        new_size = format_size(self.new_size) if self.new_size is not None else ""
+        return f"| {self.name} | {old_size} | {new_size} | {format_size(self.delta, signed=True)} |"
+
+    def markdown_simple(self) -> str:
+        old_size = format_size(self.old_size) if self.old_size is not None else "none"
+        new_size = format_size(self.new_size) if self.new_size is not None else "none"
+        return f"\\`{self.name}\\`: {old_size} -> {new_size} ({format_size(self.delta, signed=True)})"
+
+
+class PolicyViolation(BaseModel):
+    rule: str
+    name: str | None = None
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.rule}: {self.message}"
+
+    def markdown_row(self) -> str:
+        return f"| {self.rule} | {self.name or ''} | {self.message} |"
+
+    def markdown_simple(self) -> str:
+        return f":no_entry: \\`{self.rule}\\`: {self.message}"
 
 
 class RequiresPythonChanges(BaseModel):
@@ -152,8 +685,23 @@ class LockfileChanges(BaseModel):
     added: list[LockfilePackage] = []
     removed: list[LockfilePackage] = []
     updated: list[UpdatedPackage] = []
+    artifacts_changed: list[LockfilePackage] = []
+    dependencies_changed: list[DependencyChanges] = []
+    wheel_coverage_changed: list[WheelCoverageChange] = []
+    added_attribution: list[PackageAttribution] = []
+    package_groups: dict[str, list[str]] = {}
+    package_commits: dict[str, list[str]] = {}
+    advisories: list[PackageAdvisory] = []
+    releases: list[ReleaseMetadata] = []
+    size_changes: list[SizeChange] = []
+    size_platform: str | None = None
+    violations: list[PolicyViolation] = []
+    since_last_update: list[PackageDelta] = []
+    comparisons: list["BaseComparison"] = []
     output_format: OutputFormat
     show_learn_more_link: bool
+    embed_payload: bool = Field(default=False, exclude=True)
+    head_lockfile_versions: dict[str, str] | None = Field(default=None, exclude=True)
 
     @computed_field
     @property
@@ -169,6 +717,9 @@ class LockfileChanges(BaseModel):
 
     def __str__(self) -> str:
         all = []
+        if self.violations:
+            all.append("Policy Violations:")
+            all.extend([str(e) for e in self.violations])
         if self.requires_python.has_changes():
             all.append("Python Constraint Changed:")
             all.append(
@@ -186,12 +737,46 @@ class LockfileChanges(BaseModel):
         if self.removed:
             all.append("Removed:")
             all.extend([str(e) for e in self.removed])
+        if self.artifacts_changed:
+            all.append("Artifacts Changed:")
+            all.extend([str(e) for e in self.artifacts_changed])
+        if self.dependencies_changed:
+            all.append("Dependencies Changed:")
+            all.extend([str(e) for e in self.dependencies_changed])
+        if self.wheel_coverage_changed:
+            all.append("Wheel Coverage Changed:")
+            all.extend([str(e) for e in self.wheel_coverage_changed])
+        if self.added_attribution:
+            all.append("Why Added:")
+            all.extend([str(e) for e in self.added_attribution])
+        if self.advisories:
+            all.append("Known Advisories:")
+            all.extend([str(e) for e in self.advisories])
+        if self.releases:
+            all.append("Release Details:")
+            all.extend([str(e) for e in self.releases])
+        if self.size_changes:
+            all.append("Download Size:")
+            all.extend([str(e) for e in self.size_changes])
+            all.append(self.size_summary)
+        if self.since_last_update:
+            all.append("Changed Since Last Update:")
+            all.extend([str(e) for e in self.since_last_update])
+        for comparison in self.comparisons:
+            all.append(f"Compared to {comparison.base}:")
+            all.append(str(comparison.changes) or "No changes")
         return "\n".join(all)
 
     @computed_field
     @property
     def items(self) -> int:
-        return len(self.added) + len(self.removed) + len(self.updated)
+        return (
+            len(self.added)
+            + len(self.removed)
+            + len(self.updated)
+            + len(self.artifacts_changed)
+            + sum(comparison.changes.items for comparison in self.comparisons)
+        )
 
     @computed_field
     @property
@@ -204,38 +789,244 @@ class LockfileChanges(BaseModel):
             case _:
                 raise ValueError(f"Unknown format: {format}")
 
+    def iter_markdown(self) -> Iterator[str]:
+        """The lines of `markdown`, rendered one section at a time."""
+        match self.output_format:
+            case OutputFormat.TABLE:
+                return self.iter_markdown_table()
+            case OutputFormat.SIMPLE:
+                return self.iter_markdown_simple()
+            case _:
+                raise ValueError(f"Unknown format: {format}")
+
     @computed_field
     @property
     def markdown_table(self) -> str:
+        return "\n".join(self.iter_markdown_table())
+
+    def iter_markdown_table(self) -> Iterator[str]:
         title = "##"
         sections = "###"
 
-        all = [f"{title} uv Lockfile Report"]
+        yield f"{title} uv Lockfile Report"
+        if self.violations:
+            yield f"{sections} Policy Violations"
+            yield from ("| Rule | Package | Violation |", "|--|--|--|")
+            yield from (violation.markdown_row() for violation in self.violations)
         if self.requires_python.has_changes():
-            all.append(f"{sections} Python Constraint Changed")
-            all.append(
+            yield f"{sections} Python Constraint Changed"
+            yield (
                 f"\\`{self.requires_python.old}\\` -> \\`{self.requires_python.new}\\`"
             )
+        if self.package_groups:
+            for groups, changes in self.__group_changes():
+                yield f"{sections} {group_section_title(groups)}"
+                yield from changes.__package_sections_table(f"{sections}#")
+        else:
+            yield from self.__package_sections_table(sections)
+
+        if self.dependencies_changed:
+            yield f"{sections} Dependencies Changed"
+            yield from [
+                "| Package | Added Dependencies | Removed Dependencies |",
+                "|--|--|--|",
+            ]
+            yield from (changed.markdown_row() for changed in self.dependencies_changed)
+
+        if self.wheel_coverage_changed:
+            yield f"{sections} Wheel Coverage Changed"
+            yield from (
+                "| Package | Version | Wheels Dropped | Wheels Added |",
+                "|--|--|--|--|",
+            )
+            yield from (
+                changed.markdown_row() for changed in self.wheel_coverage_changed
+            )
+
+        if self.added_attribution:
+            yield f"{sections} Why Added"
+            yield from ("| Package | Required By | Dependency Chain |", "|--|--|--|")
+            yield from (reason.markdown_row() for reason in self.added_attribution)
+
+        if self.advisories:
+            yield f"{sections} Known Advisories"
+            yield from [
+                "| Package | Version | Advisory | Summary | Fixed Version |",
+                "|--|--|--|--|--|",
+            ]
+            yield from (advisory.markdown_row() for advisory in self.advisories)
+
+        if self.releases:
+            yield f"{sections} Release Details"
+            yield from (
+                "| Package | Version | Released | Age | Links |",
+                "|--|--|--|--|--|",
+            )
+            yield from (release.markdown_row() for release in self.releases)
+
+        if self.size_changes:
+            yield f"{sections} {self.size_section_title}"
+            yield from ("| Package | Before | After | Change |", "|--|--|--|--|")
+            yield from (change.markdown_row() for change in self.size_changes)
+            yield ""
+            yield self.size_summary
+
+        if self.since_last_update:
+            yield f"{sections} Changed Since Last Update"
+            yield from ("| Package | Previously | Now |", "|--|--|--|")
+            yield from (delta.markdown_row() for delta in self.since_last_update)
+
+        yield from self.__comparison_sections()
+        if self.embed_payload:
+            yield self.payload_comment()
+
+    def __package_sections_table(self, sections: str) -> Iterator[str]:
         if self.added:
-            all.append(f"{sections} Added")
-            all.extend(self.__lockfile_package_table_header())
-            all.extend([added.markdown_row() for added in self.added])
+            yield f"{sections} Added"
+            yield from self.__package_table(
+                self.__lockfile_package_table_header(), self.added
+            )
 
         if self.downgraded:
-            all.append(f"{sections} Downgraded")
-            all.extend(self.__updated_package_table_header())
-            all.extend([updated.markdown_row() for updated in self.downgraded])
+            yield f"{sections} Downgraded"
+            yield from self.__package_table(
+                self.__updated_package_table_header(), self.downgraded
+            )
 
         if self.upgraded:
-            all.append(f"{sections} Upgraded")
-            all.extend(self.__updated_package_table_header())
-            all.extend([updated.markdown_row() for updated in self.upgraded])
+            yield f"{sections} Upgraded"
+            yield from self.__package_table(
+                self.__updated_package_table_header(), self.upgraded
+            )
 
         if self.removed:
-            all.append(f"{sections} Removed")
-            all.extend(self.__lockfile_package_table_header())
-            all.extend([removed.markdown_row() for removed in self.removed])
-        return "\n".join(all)
+            yield f"{sections} Removed"
+            yield from self.__package_table(
+                self.__lockfile_package_table_header(), self.removed
+            )
+
+        if self.artifacts_changed:
+            yield f"{sections} Artifacts Changed"
+            yield from self.__package_table(
+                self.__lockfile_package_table_header(), self.artifacts_changed
+            )
+
+    def __package_table(
+        self,
+        header: list[str],
+        packages: list[LockfilePackage] | list[UpdatedPackage],
+    ) -> Iterator[str]:
+        if not self.package_commits:
+            yield from header
+            yield from (package.markdown_row() for package in packages)
+            return
+        yield f"{header[0]} Commits |"
+        yield f"{header[1]}--|"
+        for package in packages:
+            commits = self.package_commits.get(package.name, [])
+            yield f"{package.markdown_row()} {commit_label(commits)} |"
+
+    def __package_lines(
+        self, packages: list[LockfilePackage] | list[UpdatedPackage]
+    ) -> Iterator[str]:
+        for package in packages:
+            commits = self.package_commits.get(package.name)
+            if commits:
+                yield f"{package.markdown_simple()} ({commit_label(commits)})"
+            else:
+                yield package.markdown_simple()
+
+    def __group_changes(self) -> Iterator[tuple[tuple[str, ...], "LockfileChanges"]]:
+        """
+        The package changes split by the groups that install them.
+
+        A package production installs is a production change, whatever else
+        installs it; the others are grouped by their exact set of extras and
+        dependency groups, so dev-only churn never lands under `Production`.
+        """
+
+        def section(name: str) -> tuple[str, ...]:
+            groups = self.package_groups.get(name, [])
+            return (PRODUCTION,) if PRODUCTION in groups else tuple(groups)
+
+        names = [
+            pkg.name
+            for pkg in (
+                *self.added,
+                *self.updated,
+                *self.removed,
+                *self.artifacts_changed,
+            )
+        ]
+        keys = {section(name) for name in names}
+        for key in sorted(keys, key=lambda key: (key != (PRODUCTION,), not key, key)):
+            yield (
+                key,
+                self.model_copy(
+                    update={
+                        "added": [p for p in self.added if section(p.name) == key],
+                        "removed": [p for p in self.removed if section(p.name) == key],
+                        "updated": [p for p in self.updated if section(p.name) == key],
+                        "artifacts_changed": [
+                            p for p in self.artifacts_changed if section(p.name) == key
+                        ],
+                        "package_groups": {},
+                    }
+                ),
+            )
+
+    def __package_sections_simple(self, sections: str) -> Iterator[str]:
+        if self.added:
+            yield f"{sections} Added"
+            yield from self.__package_lines(self.added)
+
+        if self.downgraded:
+            yield f"{sections} Downgraded"
+            yield from self.__package_lines(self.downgraded)
+
+        if self.upgraded:
+            yield f"{sections} Upgraded"
+            yield from self.__package_lines(self.upgraded)
+
+        if self.removed:
+            yield f"{sections} Removed"
+            yield from self.__package_lines(self.removed)
+
+        if self.artifacts_changed:
+            yield f"{sections} Artifacts Changed"
+            yield from self.__package_lines(self.artifacts_changed)
+
+    @property
+    def size_section_title(self) -> str:
+        if self.size_platform is None:
+            return "Download Size"
+        return f"Download Size (\\`{self.size_platform}\\`)"
+
+    @property
+    def size_summary(self) -> str:
+        """Total download-size change, naming the package behind most of it."""
+        total = sum(change.delta for change in self.size_changes)
+        summary = f"Total: {format_size(total, signed=True)}"
+        if total:
+            # The package that moved the total furthest in its direction, if it
+            # accounts for more than half of it.
+            largest = max(self.size_changes, key=lambda change: change.delta * total)
+            if largest.delta * total * 2 > total * total:
+                summary += f", mostly \\`{largest.name}\\`"
+        return summary
+
+    def __comparison_sections(self) -> Iterator[str]:
+        for comparison in self.comparisons:
+            yield f"## Compared to \\`{comparison.base}\\`"
+            # The comparison's own report, minus its title.
+            lines = comparison.changes.iter_markdown()
+            next(lines)
+            empty = True
+            for line in lines:
+                empty = False
+                yield line
+            if empty:
+                yield "No changes"
 
     def __lockfile_package_table_header(self) -> list[str]:
         header = []
@@ -274,33 +1065,65 @@ class LockfileChanges(BaseModel):
     @computed_field
     @property
     def markdown_simple(self) -> str:
+        return "\n".join(self.iter_markdown_simple())
+
+    def iter_markdown_simple(self) -> Iterator[str]:
         title = "##"
         sections = "###"
-        all = [f"{title} uv Lockfile Report"]
+        yield f"{title} uv Lockfile Report"
+        if self.violations:
+            yield f"{sections} Policy Violations"
+            yield from (violation.markdown_simple() for violation in self.violations)
         if self.requires_python.has_changes():
-            all.append(f"{sections} Python Constraint Changed")
-            all.append(
+            yield f"{sections} Python Constraint Changed"
+            yield (
                 f"\\`{self.requires_python.old}\\` -> \\`{self.requires_python.new}\\`"
             )
-        if self.added:
-            all.append(f"{sections} Added")
-            all.extend([added.markdown_simple() for added in self.added])
+        if self.package_groups:
+            for groups, changes in self.__group_changes():
+                yield f"{sections} {group_section_title(groups)}"
+                yield from changes.__package_sections_simple(f"{sections}#")
+        else:
+            yield from self.__package_sections_simple(sections)
 
-        if self.downgraded:
-            all.append(f"{sections} Downgraded")
-            all.extend([updated.markdown_simple() for updated in self.downgraded])
+        if self.dependencies_changed:
+            yield f"{sections} Dependencies Changed"
+            yield from (
+                changed.markdown_simple() for changed in self.dependencies_changed
+            )
 
-        if self.upgraded:
-            all.append(f"{sections} Upgraded")
-            all.extend([updated.markdown_simple() for updated in self.upgraded])
+        if self.wheel_coverage_changed:
+            yield f"{sections} Wheel Coverage Changed"
+            yield from (
+                changed.markdown_simple() for changed in self.wheel_coverage_changed
+            )
 
-        if self.removed:
-            all.append(f"{sections} Removed")
-            all.extend([removed.markdown_simple() for removed in self.removed])
+        if self.added_attribution:
+            yield f"{sections} Why Added"
+            yield from (reason.markdown_simple() for reason in self.added_attribution)
+
+        if self.advisories:
+            yield f"{sections} Known Advisories"
+            yield from (advisory.markdown_simple() for advisory in self.advisories)
+
+        if self.releases:
+            yield f"{sections} Release Details"
+            yield from (release.markdown_simple() for release in self.releases)
 
+        if self.size_changes:
+            yield f"{sections} {self.size_section_title}"
+            yield from (change.markdown_simple() for change in self.size_changes)
+            yield self.size_summary
+
+        if self.since_last_update:
+            yield f"{sections} Changed Since Last Update"
+            yield from (delta.markdown_simple() for delta in self.since_last_update)
+
+        yield from self.__comparison_sections()
         if self.show_learn_more_link:
-            all.append(self.learn_more_link_text)
-        return "\n".join(all)
+            yield self.learn_more_link_text
+        if self.embed_payload:
+            yield self.payload_comment()
 
     @computed_field
     @property
@@ -313,6 +1136,113 @@ class LockfileChanges(BaseModel):
             ]
         )
 
+    def payload_comment(self) -> str:
+        """Hidden HTML comment carrying the package changes for the next run."""
+        payload = json.dumps(
+            {
+                **self.model_dump(mode="json", include=PAYLOAD_FIELDS),
+                "head_lockfile_versions": self.head_lockfile_versions,
+            }
+        ).encode()
+        encoded = base64.b64encode(zlib.compress(payload)).decode()
+        return f"<!-- {PAYLOAD_MARKER}{encoded} -->"
+
+    @classmethod
+    def from_previous_report(cls, text: str) -> "LockfileChanges | None":
+        """
+        Changes from a report JSON file or a comment body with a payload, or
+        `None` if there are none or they cannot be read.
+        """
+        try:
+            if text.lstrip().startswith("{"):
+                return cls.model_validate_json(text)
+            match = PAYLOAD_PATTERN.search(text)
+            if match is None:
+                return None
+            payload = zlib.decompress(base64.b64decode(match.group(1)))
+            return cls.model_validate_json(payload)
+        except (binascii.Error, zlib.error, ValidationError) as e:
+            print(f"WARNING: Ignoring unreadable previous report: {e}")
+            return None
+
+    def changes_since(self, previous: "LockfileChanges") -> list[PackageDelta]:
+        """
+        Packages whose head version differs from the one `previous` reported.
+
+        Listed packages are looked up in both head lockfiles, so a base that
+        moved in between (e.g. the pull request was rebased) reports nothing
+        for packages the head left alone. Reports without the head lockfile
+        versions, e.g. report JSON files, assume an unchanged base: a package
+        only one of them lists is at its base version in the other one.
+        """
+        previous_versions = previous.head_versions()
+        current_versions = self.head_versions()
+        names = sorted(previous_versions.keys() | current_versions.keys())
+        if (
+            previous.head_lockfile_versions is not None
+            and self.head_lockfile_versions is not None
+        ):
+            return [
+                PackageDelta(
+                    name=name,
+                    previous_version=previous.head_lockfile_versions.get(name),
+                    current_version=self.head_lockfile_versions.get(name),
+                )
+                for name in names
+                if previous.head_lockfile_versions.get(name)
+                != self.head_lockfile_versions.get(name)
+            ]
+        deltas = []
+        for name in names:
+            if name in previous_versions and name in current_versions:
+                previous_version = previous_versions[name][1]
+                current_version = current_versions[name][1]
+            elif name in previous_versions:
+                previous_version, current_version = reversed(previous_versions[name])
+            else:
+                previous_version, current_version = current_versions[name]
+            if previous_version != current_version:
+                deltas.append(
+                    PackageDelta(
+                        name=name,
+                        previous_version=previous_version,
+                        current_version=current_version,
+                    )
+                )
+        return deltas
+
+    def head_versions(self) -> dict[str, tuple[str | None, str | None]]:
+        """`(base version, head version)` of every changed package."""
+        versions: dict[str, tuple[str | None, str | None]] = {}
+        for pkg in self.added:
+            versions[pkg.name] = (None, pkg.version)
+        for pkg in self.removed:
+            versions[pkg.name] = (pkg.version, None)
+        for updated in self.updated:
+            versions[updated.name] = (updated.old_version, updated.new_version)
+        return versions
+
+
+class BaseComparison(BaseModel):
+    """The head lockfile compared to an additional base."""
+
+    base: str
+    changes: LockfileChanges
+
+
+LockfileChanges.model_rebuild()
+
+PAYLOAD_MARKER = "uv-lock-report-payload:"
+PAYLOAD_PATTERN = re.compile(rf"<!-- {PAYLOAD_MARKER}([A-Za-z0-9+/=]+) -->")
+PAYLOAD_FIELDS = {
+    "requires_python",
+    "added",
+    "removed",
+    "updated",
+    "output_format",
+    "show_learn_more_link",
+}
+
 
 class UvLockFile(BaseModel):
     version: int
@@ -324,13 +1254,40 @@ class UvLockFile(BaseModel):
     def from_toml_str(cls, toml_str: str) -> "UvLockFile":
         return cls.model_validate(tomllib.loads(toml_str))
 
+    @cached_property
+    def package_index(self) -> dict[str, list[LockfilePackage]]:
+        """
+        Every entry of each package name, in lockfile order.
+
+        A package locked at different versions for different resolution forks
+        (e.g. one numpy for `python_full_version < '3.11'` and another for the
+        rest) has one entry per fork, told apart by `LockfilePackage.key`.
+        """
+        index: dict[str, list[LockfilePackage]] = {}
+        for package in self.packages:
+            index.setdefault(package.name, []).append(package)
+        return index
+
+    @cached_property
+    def locked_versions(self) -> dict[str, str]:
+        """The version of each package name, those of several forks comma-separated."""
+        return {
+            name: ", ".join(pkg.version for pkg in packages if pkg.version)
+            for name, packages in self.package_index.items()
+        }
+
     @cached_property
     def packages_by_name(self) -> dict[str, LockfilePackage]:
-        return {p.name: p for p in self.packages}
+        """The last entry of each name; see `package_index` for every fork."""
+        return {name: entries[-1] for name, entries in self.package_index.items()}
 
     @cached_property
     def package_names(self) -> set[str]:
-        return set(self.packages_by_name.keys())
+        return set(self.package_index)
+
+    @cached_property
+    def dependency_graph(self) -> DependencyGraph:
+        return DependencyGraph(self.packages)
 
 
 class LockFileReporter:
@@ -340,11 +1297,20 @@ class LockFileReporter:
         new_lockfile: UvLockFile | None,
         output_format: OutputFormat,
         show_learn_more_link: bool,
+        package_filter: PackageFilter | None = None,
     ) -> None:
         self.old_lockfile = old_lockfile
         self.new_lockfile = new_lockfile
         self.output_format = output_format
         self.show_learn_more_link = show_learn_more_link
+        self.package_filter = package_filter
+
+    def _filtered(self, names: set[str]) -> set[str]:
+        # Applied to every name set the diff is built from, so filtered packages
+        # never get an `UpdatedPackage` or have their versions parsed.
+        if not self.package_filter:
+            return names
+        return self.package_filter.filter_names(names)
 
     @cached_property
     def both_lockfile_package_names(self) -> set[str]:
@@ -355,7 +1321,7 @@ class LockFileReporter:
             self.new_lockfile.package_names if self.new_lockfile else set()
         )
 
-        return old_package_names & new_package_names
+        return self._filtered(old_package_names & new_package_names)
 
     def get_changes(self) -> LockfileChanges:
         return LockfileChanges(
@@ -363,10 +1329,21 @@ class LockFileReporter:
             added=self.get_added_packages(),
             removed=self.get_removed_packages(),
             updated=self.get_updated_packages(),
+            artifacts_changed=self.get_artifact_changed_packages(),
+            dependencies_changed=self.get_dependency_changes(),
+            wheel_coverage_changed=self.get_wheel_coverage_changes(),
+            added_attribution=self.get_added_attribution(),
             show_learn_more_link=self.show_learn_more_link,
             output_format=self.output_format,
+            head_lockfile_versions=self.get_head_lockfile_versions(),
         )
 
+    def get_head_lockfile_versions(self) -> dict[str, str]:
+        """Version of every package in the new lockfile, forks comma-separated."""
+        if self.new_lockfile is None:
+            return {}
+        return dict(self.new_lockfile.locked_versions)
+
     def get_requires_python_changes(self) -> RequiresPythonChanges:
         old_requires_python = (
             self.old_lockfile.requires_python if self.old_lockfile else None
@@ -385,13 +1362,13 @@ class LockFileReporter:
             if self.new_lockfile is None:
                 return set()
 
-            return self.new_lockfile.package_names
+            return self._filtered(self.new_lockfile.package_names)
 
         if self.new_lockfile is None:
             return set()
 
-        return self.new_lockfile.package_names.difference(
-            self.old_lockfile.package_names
+        return self._filtered(
+            self.new_lockfile.package_names.difference(self.old_lockfile.package_names)
         )
 
     @cached_property
@@ -400,14 +1377,49 @@ class LockFileReporter:
             if self.old_lockfile is None:
                 return set()
 
-            return self.old_lockfile.package_names
+            return self._filtered(self.old_lockfile.package_names)
         if self.old_lockfile is None:
             return set()
 
-        return self.old_lockfile.package_names.difference(
-            self.new_lockfile.package_names
+        return self._filtered(
+            self.old_lockfile.package_names.difference(self.new_lockfile.package_names)
         )
 
+    @cached_property
+    def matched_forks(
+        self,
+    ) -> tuple[
+        list[tuple[LockfilePackage, LockfilePackage]],
+        list[LockfilePackage],
+        list[LockfilePackage],
+    ]:
+        """
+        The entries of packages in both lockfiles, paired per resolution fork.
+
+        Also returns the forks only the old or only the new lockfile has, see
+        `match_forks`.
+        """
+        pairs: list[tuple[LockfilePackage, LockfilePackage]] = []
+        removed: list[LockfilePackage] = []
+        added: list[LockfilePackage] = []
+        if self.old_lockfile is None or self.new_lockfile is None:
+            return pairs, removed, added
+        old_index = self.old_lockfile.package_index
+        for name, new_entries in self.new_lockfile.package_index.items():
+            if name not in self.both_lockfile_package_names:
+                continue
+            name_pairs, name_removed, name_added = match_forks(
+                old_index[name], new_entries
+            )
+            pairs.extend(name_pairs)
+            removed.extend(name_removed)
+            added.extend(name_added)
+        return pairs, removed, added
+
+    @property
+    def package_pairs(self) -> list[tuple[LockfilePackage, LockfilePackage]]:
+        return self.matched_forks[0]
+
     def get_removed_packages(self) -> list[LockfilePackage]:
         if self.old_lockfile is None:
             return []
@@ -415,7 +1427,7 @@ class LockFileReporter:
             pkg
             for pkg in self.old_lockfile.packages
             if pkg.name in self.removed_package_names
-        ]
+        ] + self.matched_forks[1]
 
     def get_added_packages(self) -> list[LockfilePackage]:
         if self.new_lockfile is None:
@@ -424,7 +1436,7 @@ class LockFileReporter:
             pkg
             for pkg in self.new_lockfile.packages
             if pkg.name in self.added_package_names
-        ]
+        ] + self.matched_forks[2]
 
     def sort_packages_by_change_level(
         self, packages: list[UpdatedPackage]
@@ -436,10 +1448,9 @@ class LockFileReporter:
             return []
         updated_packages: list[UpdatedPackage] = []
 
-        for pkg_name in self.both_lockfile_package_names:
-            old_pkg = self.old_lockfile.packages_by_name[pkg_name]
-            new_pkg = self.new_lockfile.packages_by_name[pkg_name]
+        for old_pkg, new_pkg in self.package_pairs:
             if old_pkg != new_pkg:
+                pkg_name = new_pkg.name
                 if new_pkg.version is None or old_pkg.version is None:
                     print(
                         f"WARNING: Skipping package with None version: {pkg_name=}, {old_pkg=}, {new_pkg=}"
@@ -450,6 +1461,128 @@ class LockFileReporter:
                         name=pkg_name,
                         old_version=old_pkg.version,
                         new_version=new_pkg.version,
+                        fork=new_pkg.fork or old_pkg.fork,
                     )
                 )
         return self.sort_packages_by_change_level(updated_packages)
+
+    def get_artifact_changed_packages(self) -> list[LockfilePackage]:
+        """Packages locked at the same version whose source or artifacts changed."""
+        if self.old_lockfile is None or self.new_lockfile is None:
+            return []
+        return [
+            new_pkg
+            for old_pkg, new_pkg in self.package_pairs
+            if old_pkg == new_pkg and old_pkg.artifacts_differ(new_pkg)
+        ]
+
+    def get_dependency_changes(self) -> list[DependencyChanges]:
+        """Dependency edges added or removed for packages present in both lockfiles."""
+        if self.old_lockfile is None or self.new_lockfile is None:
+            return []
+        dependency_changes: list[DependencyChanges] = []
+
+        for old_pkg, new_pkg in self.package_pairs:
+            added = new_pkg.dependency_edges - old_pkg.dependency_edges
+            removed = old_pkg.dependency_edges - new_pkg.dependency_edges
+            if added or removed:
+                dependency_changes.append(
+                    DependencyChanges(
+                        name=new_pkg.name, added=sorted(added), removed=sorted(removed)
+                    )
+                )
+        return dependency_changes
+
+    def get_wheel_coverage_changes(self) -> list[WheelCoverageChange]:
+        """Platforms and interpreters that gained or lost wheels, per package."""
+        if self.old_lockfile is None or self.new_lockfile is None:
+            return []
+        coverage_changes: list[WheelCoverageChange] = []
+
+        for old_pkg, new_pkg in self.package_pairs:
+            if not old_pkg.artifacts_differ(new_pkg):
+                continue
+            old_triples = old_pkg.wheel_triples
+            new_triples = new_pkg.wheel_triples
+            if old_triples == new_triples:
+                continue
+            dropped = uncovered(old_triples, new_triples)
+            added = uncovered(new_triples, old_triples)
+            if dropped or added:
+                coverage_changes.append(
+                    WheelCoverageChange(
+                        name=new_pkg.name,
+                        old_version=old_pkg.version,
+                        new_version=new_pkg.version,
+                        dropped=describe_pairs(dropped, old_triples),
+                        added=describe_pairs(added, new_triples),
+                    )
+                )
+        return coverage_changes
+
+    def get_size_changes(self, platform: str | None = None) -> list[SizeChange]:
+        """Download-size changes of added, removed and re-locked packages."""
+        size_changes: list[SizeChange] = []
+
+        for old_pkg, new_pkg in [
+            *((None, pkg) for pkg in self.get_added_packages()),
+            *((pkg, None) for pkg in self.get_removed_packages()),
+            *self.package_pairs,
+        ]:
+            if old_pkg and new_pkg and not old_pkg.artifacts_differ(new_pkg):
+                continue
+            size_change = SizeChange(
+                name=(new_pkg or old_pkg).name,
+                old_size=old_pkg.download_size(platform) if old_pkg else None,
+                new_size=new_pkg.download_size(platform) if new_pkg else None,
+            )
+            if size_change.delta:
+                size_changes.append(size_change)
+        return sorted(size_changes, key=lambda x: (-abs(x.delta), x.name))
+
+    def get_changed_package_names(self) -> set[str]:
+        """Packages added, removed, re-versioned or re-locked, without a full report."""
+        changed = {
+            pkg.name
+            for pkg in (*self.get_added_packages(), *self.get_removed_packages())
+        }
+        changed.update(
+            new_pkg.name
+            for old_pkg, new_pkg in self.package_pairs
+            if old_pkg != new_pkg or old_pkg.artifacts_differ(new_pkg)
+        )
+        return changed
+
+    def get_package_groups(self, changes: LockfileChanges) -> dict[str, list[str]]:
+        """Extras and dependency groups installing each package `changes` lists."""
+        package_groups: dict[str, list[str]] = {}
+        if self.old_lockfile is not None:
+            graph = self.old_lockfile.dependency_graph
+            for pkg in changes.removed:
+                package_groups[pkg.name] = graph.groups_reaching(pkg.name)
+        if self.new_lockfile is not None:
+            graph = self.new_lockfile.dependency_graph
+            for pkg in (*changes.added, *changes.updated, *changes.artifacts_changed):
+                package_groups[pkg.name] = graph.groups_reaching(pkg.name)
+        return package_groups
+
+    def get_added_attribution(self) -> list[PackageAttribution]:
+        """Root packages and the dependency chain that pulled in each added package."""
+        if self.new_lockfile is None:
+            return []
+        graph = self.new_lockfile.dependency_graph
+        attribution: list[PackageAttribution] = []
+
+        for pkg in self.get_added_packages():
+            chain = graph.chain(pkg.name)
+            if len(chain) < 2:
+                # Unreachable, or a root package that was added itself.
+                continue
+            attribution.append(
+                PackageAttribution(
+                    name=pkg.name,
+                    required_by=graph.roots_reaching(pkg.name),
+                    chain=chain,
+                )
+            )
+        return attribution
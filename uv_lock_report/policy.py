@@ -0,0 +1,232 @@
+"""
+Dependency policy rules evaluated against the changes in a report.
+
+A policy is a TOML file of rules, each denying one or more kinds of change for
+the packages it names:
+
+    default-indexes = ["https://pypi.org/simple"]
+
+    [[rules]]
+    id = "django-major"
+    packages = ["django"]
+    deny = ["major"]
+    message = "Major Django upgrades need a migration plan."
+
+Rules are indexed by package pattern when the policy is loaded: exact names in
+a dict, globs in a trie keyed by their literal prefix. Looking up the rules for
+a changed package walks its name once, so evaluation grows with the number of
+changes and matching rules rather than with the size of the policy. Only
+`re:` patterns, which have no literal prefix to index, are checked one by one.
+"""
+
+import fnmatch
+import re
+import tomllib
+from pathlib import Path
+from typing import Any
+
+from packaging.specifiers import InvalidSpecifier, SpecifierSet
+from packaging.utils import canonicalize_name
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from uv_lock_report.filters import REGEX_PREFIX
+from uv_lock_report.models import (
+    LockfileChanges,
+    LockfilePackage,
+    PolicyViolation,
+    VersionChangeLevel,
+)
+
+DEFAULT_INDEXES = ["https://pypi.org/simple"]
+GLOB_CHARACTERS = frozenset("*?[")
+# Sources of workspace members, which are never "non-default".
+LOCAL_SOURCES = frozenset({"editable", "virtual"})
+
+PACKAGE_KINDS = frozenset(
+    {"added", "removed", "upgrade", "downgrade", "non-default-source"}
+    | {level.name.lower() for level in VersionChangeLevel}
+)
+REQUIRES_PYTHON_NARROWED = "requires-python-narrowed"
+RULE_KINDS = PACKAGE_KINDS | {REQUIRES_PYTHON_NARROWED}
+
+
+class PolicyRule(BaseModel):
+    id: str
+    packages: list[str] = ["*"]
+    deny: list[str]
+    message: str | None = None
+
+    @model_validator(mode="after")
+    def check_kinds(self) -> "PolicyRule":
+        unknown = set(self.deny) - RULE_KINDS
+        if unknown:
+            raise ValueError(
+                f"Rule {self.id!r} denies unknown change kinds: {sorted(unknown)}. "
+                f"Known kinds: {sorted(RULE_KINDS)}"
+            )
+        return self
+
+
+class PolicyFile(BaseModel):
+    model_config = ConfigDict(validate_by_name=True, validate_by_alias=True)
+
+    default_indexes: list[str] = Field(
+        alias="default-indexes", default_factory=lambda: list(DEFAULT_INDEXES)
+    )
+    rules: list[PolicyRule] = []
+
+
+class RuleIndex:
+    """Rules by package-name pattern: exact names, a glob prefix trie and regexes."""
+
+    def __init__(self) -> None:
+        self.exact: dict[str, list[int]] = {}
+        self.trie: dict[str | None, Any] = {}
+        self.regexes: list[tuple[re.Pattern[str], int]] = []
+
+    def add(self, pattern: str, rule: int) -> None:
+        if pattern.startswith(REGEX_PREFIX):
+            self.regexes.append(
+                (re.compile(pattern.removeprefix(REGEX_PREFIX), re.IGNORECASE), rule)
+            )
+            return
+        # Spelled like a PEP 503 canonical name, the form the names are matched in.
+        pattern = re.sub(r"[-_.]+", "-", pattern.lower())
+        wildcard = next(
+            (i for i, char in enumerate(pattern) if char in GLOB_CHARACTERS), None
+        )
+        if wildcard is None:
+            self.exact.setdefault(canonicalize_name(pattern), []).append(rule)
+            return
+        node = self.trie
+        for char in pattern[:wildcard]:
+            node = node.setdefault(char, {})
+        node.setdefault(None, []).append((re.compile(fnmatch.translate(pattern)), rule))
+
+    def match(self, name: str) -> set[int]:
+        name = canonicalize_name(name)
+        rules = set(self.exact.get(name, ()))
+        node = self.trie
+        for char in [*name, None]:
+            for regex, rule in node.get(None, ()):
+                if regex.match(name):
+                    rules.add(rule)
+            if char is None or char not in node:
+                break
+            node = node[char]
+        rules.update(rule for regex, rule in self.regexes if regex.match(name))
+        return rules
+
+
+def requires_python_narrowed(old: str | None, new: str | None) -> bool:
+    """
+    Whether `new` excludes some Python version that `old` allowed.
+
+    Checked on the Python versions that either specifier mentions plus every
+    2.x and 3.x minor release, which covers the boundaries real
+    `requires-python` values use; an upper bound such as `<4` does not count.
+    """
+    if old is None or new is None:
+        return False
+    try:
+        old_specifiers = SpecifierSet(old)
+        new_specifiers = SpecifierSet(new)
+    except InvalidSpecifier:
+        return old != new
+    candidates = {f"{major}.{minor}" for major in (2, 3) for minor in range(50)}
+    for specifier in (*old_specifiers, *new_specifiers):
+        version = specifier.version.removesuffix(".*")
+        if version.split(".")[0] in ("2", "3"):
+            candidates.add(version)
+    return any(
+        old_specifiers.contains(version, prereleases=True)
+        and not new_specifiers.contains(version, prereleases=True)
+        for version in candidates
+    )
+
+
+class Policy:
+    def __init__(self, policy_file: PolicyFile) -> None:
+        self.rules = policy_file.rules
+        self.default_indexes = {
+            index.rstrip("/") for index in policy_file.default_indexes
+        }
+        self.index = RuleIndex()
+        self.requires_python_rules: list[PolicyRule] = []
+        for position, rule in enumerate(self.rules):
+            if REQUIRES_PYTHON_NARROWED in rule.deny:
+                self.requires_python_rules.append(rule)
+            for pattern in rule.packages:
+                self.index.add(pattern, position)
+
+    @classmethod
+    def load(cls, path: Path) -> "Policy":
+        with path.open("rb") as file:
+            return cls(PolicyFile.model_validate(tomllib.load(file)))
+
+    def has_default_source(self, package: LockfilePackage) -> bool:
+        if not package.source:
+            return True
+        if LOCAL_SOURCES.intersection(package.source):
+            return True
+        registry = package.source.get("registry")
+        return registry is not None and registry.rstrip("/") in self.default_indexes
+
+    def _violations(
+        self, name: str, kinds: set[str], description: str
+    ) -> list[PolicyViolation]:
+        violations = []
+        for position in sorted(self.index.match(name)):
+            rule = self.rules[position]
+            denied = kinds.intersection(rule.deny)
+            if not denied:
+                continue
+            message = f"{description} ({', '.join(sorted(denied))})"
+            if rule.message:
+                message += f": {rule.message}"
+            violations.append(PolicyViolation(rule=rule.id, name=name, message=message))
+        return violations
+
+    def evaluate(self, lockfile_changes: LockfileChanges) -> list[PolicyViolation]:
+        violations = []
+        requires_python = lockfile_changes.requires_python
+        if requires_python_narrowed(requires_python.old, requires_python.new):
+            for rule in self.requires_python_rules:
+                message = (
+                    f"requires-python narrowed from {requires_python.old} "
+                    f"to {requires_python.new}"
+                )
+                if rule.message:
+                    message += f": {rule.message}"
+                violations.append(PolicyViolation(rule=rule.id, message=message))
+
+        for package in lockfile_changes.added:
+            kinds = {"added"}
+            if not self.has_default_source(package):
+                kinds.add("non-default-source")
+            violations.extend(
+                self._violations(
+                    package.name, kinds, f"{package.name} {package.version} added"
+                )
+            )
+        for package in lockfile_changes.removed:
+            violations.extend(
+                self._violations(
+                    package.name,
+                    {"removed"},
+                    f"{package.name} {package.version} removed",
+                )
+            )
+        for updated in lockfile_changes.updated:
+            kinds = {
+                updated.change_type().value,
+                updated.change_level().name.lower(),
+            }
+            violations.extend(
+                self._violations(
+                    updated.name,
+                    kinds,
+                    f"{updated.name} {updated.old_version} -> {updated.new_version}",
+                )
+            )
+        return violations
@@ -0,0 +1,267 @@
+"""
+Release metadata for upgraded packages from a PyPI-compatible JSON API.
+
+Lookups share one pooled HTTP client, run concurrently and are cached on disk
+per `(index, name, version)`, so repeated runs across PRs rarely touch the
+network. The whole enrichment is bounded by a time budget: anything that has
+not arrived in time is left out of the report instead of delaying it.
+"""
+
+import http.client
+import json
+import queue
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+from urllib.parse import urljoin, urlsplit
+
+from uv_lock_report.cache import user_cache_dir
+from uv_lock_report.models import ReleaseMetadata, UpdatedPackage
+
+DEFAULT_INDEX_URL = "https://pypi.org"
+DEFAULT_CACHE_TTL = 7 * 24 * 60 * 60
+DEFAULT_TIME_BUDGET = 5.0
+MAX_CONCURRENCY = 8
+READ_CHUNK_SIZE = 64 * 1024
+USER_AGENT = "uv-lock-report"
+
+CHANGELOG_URL_KEYS = ("changelog", "changes", "release notes", "releases", "history")
+
+
+def default_cache_path() -> Path:
+    return user_cache_dir() / "releases.sqlite"
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections shared between worker threads, per host."""
+
+    def __init__(self, timeout: float = DEFAULT_TIME_BUDGET) -> None:
+        self.timeout = timeout
+        self._idle: dict[tuple[str, str], queue.SimpleQueue] = {}
+        self._lock = threading.Lock()
+
+    def _idle_connections(self, scheme: str, netloc: str) -> queue.SimpleQueue:
+        with self._lock:
+            return self._idle.setdefault((scheme, netloc), queue.SimpleQueue())
+
+    def _connect(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def _bound(
+        self, connection: http.client.HTTPConnection, deadline: float | None
+    ) -> None:
+        """Limit the connection's next blocking call to the time left."""
+        if deadline is None:
+            return
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("Time budget exhausted")
+        connection.timeout = min(self.timeout, remaining)
+        if connection.sock is not None:
+            connection.sock.settimeout(connection.timeout)
+
+    def get_json(
+        self, url: str, deadline: float | None = None, redirects: int = 3
+    ) -> Any | None:
+        """
+        GET `url` and decode its JSON body, or return `None` on a non-200 reply.
+
+        With a `deadline` (a `time.monotonic()` value), connecting, sending and
+        every read are bounded by the time left, so a slow server cannot keep
+        the calling thread, and with it the process, alive past the deadline.
+        """
+        parts = urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        idle = self._idle_connections(parts.scheme, parts.netloc)
+        try:
+            connection = idle.get_nowait()
+        except queue.Empty:
+            connection = self._connect(parts.scheme, parts.netloc)
+
+        try:
+            self._bound(connection, deadline)
+            connection.request(
+                "GET",
+                path,
+                headers={"Accept": "application/json", "User-Agent": USER_AGENT},
+            )
+            self._bound(connection, deadline)
+            response = connection.getresponse()
+            chunks = []
+            while True:
+                self._bound(connection, deadline)
+                # One receive at a time, so a trickling body is cut off too.
+                chunk = response.read1(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            body = b"".join(chunks)
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            raise
+        idle.put(connection)
+
+        location = response.getheader("Location")
+        if response.status in (301, 302, 307, 308) and location and redirects:
+            return self.get_json(urljoin(url, location), deadline, redirects - 1)
+        if response.status != 200:
+            return None
+        return json.loads(body)
+
+    def close(self) -> None:
+        with self._lock:
+            for idle in self._idle.values():
+                while not idle.empty():
+                    idle.get_nowait().close()
+            self._idle.clear()
+
+
+class ReleaseCache:
+    def __init__(self, path: Path, ttl: float = DEFAULT_CACHE_TTL) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS releases (
+                    index_url TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    payload TEXT NOT NULL,
+                    PRIMARY KEY (index_url, name, version)
+                )
+                """
+            )
+
+    def get(self, index_url: str, name: str, version: str) -> dict[str, Any] | None:
+        row = self.connection.execute(
+            "SELECT payload FROM releases "
+            "WHERE index_url = ? AND name = ? AND version = ? AND fetched_at > ?",
+            (index_url, name, version, time.time() - self.ttl),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(
+        self, index_url: str, name: str, version: str, payload: dict[str, Any]
+    ) -> None:
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO releases VALUES (?, ?, ?, ?, ?)",
+                (index_url, name, version, time.time(), json.dumps(payload)),
+            )
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def summarize_release(release_json: dict[str, Any]) -> dict[str, Any]:
+    """Keep only what the report needs from a `/pypi/<name>/<version>/json` reply."""
+    upload_times = [
+        file["upload_time_iso_8601"]
+        for file in release_json.get("urls", ())
+        if file.get("upload_time_iso_8601")
+    ]
+    info = release_json.get("info") or {}
+    return {
+        "released_at": min(upload_times) if upload_times else None,
+        "project_urls": info.get("project_urls") or {},
+    }
+
+
+def find_project_url(project_urls: dict[str, str], keys: Iterable[str]) -> str | None:
+    by_label = {label.strip().lower(): url for label, url in project_urls.items()}
+    for key in keys:
+        if key in by_label:
+            return by_label[key]
+    return None
+
+
+def build_release_metadata(
+    package: UpdatedPackage, payload: dict[str, Any], now: datetime
+) -> ReleaseMetadata:
+    released_at = (
+        datetime.fromisoformat(payload["released_at"])
+        if payload.get("released_at")
+        else None
+    )
+    project_urls = payload.get("project_urls") or {}
+    changelog_url = find_project_url(project_urls, CHANGELOG_URL_KEYS)
+
+    return ReleaseMetadata(
+        name=package.name,
+        version=package.new_version,
+        released_at=released_at,
+        age_days=(now - released_at).days if released_at else None,
+        changelog_url=changelog_url,
+    )
+
+
+class ReleaseMetadataFetcher:
+    def __init__(
+        self,
+        index_url: str = DEFAULT_INDEX_URL,
+        cache: ReleaseCache | None = None,
+        time_budget: float = DEFAULT_TIME_BUDGET,
+    ) -> None:
+        self.index_url = index_url.rstrip("/")
+        self.cache = cache
+        self.time_budget = time_budget
+        self.pool = ConnectionPool(timeout=time_budget)
+
+    def fetch_payload(
+        self, name: str, version: str, deadline: float | None = None
+    ) -> dict[str, Any] | None:
+        release_json = self.pool.get_json(
+            f"{self.index_url}/pypi/{name}/{version}/json", deadline
+        )
+        return summarize_release(release_json) if release_json else None
+
+    def fetch(self, packages: list[UpdatedPackage]) -> list[ReleaseMetadata]:
+        """Metadata for every package that is cached or arrives within the budget."""
+        deadline = time.monotonic() + self.time_budget
+        payloads: dict[tuple[str, str], dict[str, Any]] = {}
+        missing: list[tuple[str, str]] = []
+        for package in packages:
+            key = (package.name, package.new_version)
+            cached = self.cache.get(self.index_url, *key) if self.cache else None
+            if cached is not None:
+                payloads[key] = cached
+            elif key not in missing:
+                missing.append(key)
+
+        if missing:
+            executor = ThreadPoolExecutor(
+                max_workers=min(MAX_CONCURRENCY, len(missing)),
+                thread_name_prefix="release-metadata",
+            )
+            # Workers give up at the deadline as well, so the threads that are
+            # not waited for here do not delay the interpreter's exit.
+            futures = {
+                executor.submit(self.fetch_payload, *key, deadline): key
+                for key in missing
+            }
+            done, _ = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+            executor.shutdown(wait=False, cancel_futures=True)
+            for future in done:
+                if future.exception() is not None or future.result() is None:
+                    continue
+                payloads[futures[future]] = future.result()
+                if self.cache:
+                    self.cache.put(self.index_url, *futures[future], future.result())
+        self.pool.close()
+
+        now = datetime.now(UTC)
+        return [
+            build_release_metadata(package, payloads[key], now)
+            for package in packages
+            if (key := (package.name, package.new_version)) in payloads
+        ]
@@ -1,68 +1,678 @@
+import json
 import subprocess
+import sys
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import NamedTuple
 
+from pydantic import BaseModel
+
+from uv_lock_report import __version__
+from uv_lock_report.advisories import (
+    AdvisoryDatabase,
+    find_advisories,
+    source_signature,
+)
+from uv_lock_report.cache import (
+    CachedReport,
+    ReportCache,
+    file_digest,
+    report_cache_key,
+)
+from uv_lock_report.filters import PackageFilter
+from uv_lock_report.gitobjects import UnsupportedGitObject, git_blob_id, open_reader
+from uv_lock_report.history import HistoryStore
 from uv_lock_report.models import (
+    BaseComparison,
     LockfileChanges,
     LockFileReporter,
     OutputFormat,
     UvLockFile,
 )
+from uv_lock_report.policy import Policy
+from uv_lock_report.releases import (
+    DEFAULT_INDEX_URL,
+    DEFAULT_TIME_BUDGET,
+    ReleaseCache,
+    ReleaseMetadataFetcher,
+    default_cache_path,
+)
 
 CURRENT_UV_LOCK = Path("uv.lock")
+PARSED_LOCKFILE_CACHE_SIZE = 32
+STDIN = "-"
+
+# A lockfile path, `-` for stdin, or the lockfile's contents.
+LockfileSource = str | Path | bytes
+
+
+class ReportOptions(BaseModel):
+    """
+    What `report` does beyond diffing two lockfiles; everything is off by default.
+
+    `head_sha` reads the head lockfile from that commit instead of the working
+    tree, so a bare or sparse clone is enough. `old_source` and `new_source`
+    replace either side with a lockfile path, `-` for stdin, or already-loaded
+    lockfile bytes, so that no git is needed.
+
+    `commit_attribution` names, for each package row, the commits between
+    the base and the head commit that changed the package. Changes in the
+    working tree that are not committed yet are not attributed.
+
+    With a `report_cache` directory, a report whose inputs were seen before is
+    written from the cache without parsing either lockfile. Reports with
+    release metadata (which depends on the network and the date) or a history
+    store (which must be written) are not cached.
+    """
+
+    # Where the lockfiles are read from.
+    head_sha: str | None = None
+    old_source: LockfileSource | None = None
+    new_source: LockfileSource | None = None
+    additional_base_shas: list[str] = []
+    # Which packages are reported.
+    ignore_packages: list[str] = []
+    only_packages: list[str] = []
+    # Report sections.
+    group_sections: bool = False
+    commit_attribution: bool = False
+    download_size: bool = False
+    platform_tag: str | None = None
+    advisory_db: str | None = None
+    release_metadata: bool = False
+    release_index: str = DEFAULT_INDEX_URL
+    release_cache: str | None = None
+    release_time_budget: float = DEFAULT_TIME_BUDGET
+    policy: str | None = None
+    previous_report: str | None = None
+    embed_payload: bool = False
+    # Outputs and stores besides the report JSON.
+    step_summary: str | None = None
+    history_db: str | None = None
+    repo_name: str | None = None
+    report_cache: str | None = None
+
+
+# Parsed lockfiles keyed by git blob id. Blob ids are content addresses, so an
+# entry is valid for any repository and any ref that resolves to it.
+parsed_lockfiles: OrderedDict[str, UvLockFile] = OrderedDict()
 
 
-def get_new_uv_lock_file(base_path: str) -> UvLockFile | None:
+def read_new_uv_lock_bytes(base_path: str) -> bytes | None:
     path = Path(base_path)
     uv_lock_path = path / CURRENT_UV_LOCK
     if not uv_lock_path.exists():
         print("uv.lock not found in current working directory")
         return None
-    return UvLockFile.from_toml_str(uv_lock_path.read_text())
+    return uv_lock_path.read_bytes()
 
 
-def get_old_uv_lock_file(base_sha: str, base_path: str) -> UvLockFile | None:
-    cmd = ["git", "show", f"{base_sha}:uv.lock"]
+def read_uv_lock_bytes(source: LockfileSource) -> bytes:
+    if isinstance(source, bytes):
+        return source
+    if str(source) == STDIN:
+        return sys.stdin.buffer.read()
+    return Path(source).read_bytes()
+
+
+def get_uv_lock_blob_id(rev: str, base_path: str) -> str | None:
+    reader = open_reader(base_path)
+    if reader is not None:
+        try:
+            return reader.blob_id(rev, str(CURRENT_UV_LOCK))
+        except UnsupportedGitObject:
+            pass
 
     run = subprocess.run(
-        cmd,
+        ["git", "rev-parse", "--verify", "--quiet", f"{rev}:{CURRENT_UV_LOCK}"],
         capture_output=True,
         text=True,
         cwd=base_path,
+        check=False,
     )
+    if run.returncode != 0:
+        return None
+    return run.stdout.strip()
+
+
+def read_uv_lock_blob(blob_id: str, base_path: str) -> str:
+    reader = open_reader(base_path)
+    if reader is not None:
+        try:
+            return reader.read_blob(blob_id).decode()
+        except UnsupportedGitObject:
+            pass
+    return subprocess.run(
+        ["git", "cat-file", "blob", blob_id],
+        capture_output=True,
+        text=True,
+        cwd=base_path,
+        check=True,
+    ).stdout
+
+
+def load_uv_lock_blob(
+    blob_id: str, base_path: str, content: str | None = None
+) -> UvLockFile:
+    """
+    The lockfile in `blob_id`, parsed at most once per blob per process.
+
+    `content` is the blob's text when the caller already read it. The parsed
+    lockfile cache is not locked, so only call this from one thread.
+    """
+    if blob_id in parsed_lockfiles:
+        parsed_lockfiles.move_to_end(blob_id)
+        return parsed_lockfiles[blob_id]
+
+    if content is None:
+        content = read_uv_lock_blob(blob_id, base_path)
+    lockfile = UvLockFile.from_toml_str(content)
+    parsed_lockfiles[blob_id] = lockfile
+    if len(parsed_lockfiles) > PARSED_LOCKFILE_CACHE_SIZE:
+        parsed_lockfiles.popitem(last=False)
+    return lockfile
 
+
+def get_uv_lock_file_at(rev: str, base_path: str) -> UvLockFile | None:
+    """The uv.lock committed at `rev`, parsed at most once per blob per process."""
+    blob_id = get_uv_lock_blob_id(rev, base_path)
+    if blob_id is None:
+        return None
+    return load_uv_lock_blob(blob_id, base_path)
+
+
+def get_uv_lock_blob_ids(revs: list[str], base_path: str) -> dict[str, str | None]:
+    """The blob id of the uv.lock committed at each of `revs`, resolved concurrently."""
+    with ThreadPoolExecutor(max_workers=min(len(revs), 8) or 1) as executor:
+        blob_ids = dict(
+            zip(
+                revs,
+                executor.map(lambda rev: get_uv_lock_blob_id(rev, base_path), revs),
+            )
+        )
+    for rev, blob_id in blob_ids.items():
+        if blob_id is None:
+            print(f"uv.lock not found in {rev}")
+    return blob_ids
+
+
+def load_uv_lock_blobs(
+    blob_ids: dict[str, str | None], base_path: str
+) -> dict[str, UvLockFile | None]:
+    """
+    Parse the blobs of `get_uv_lock_blob_ids`, once per blob.
+
+    Uncached blobs are read concurrently, but parsed one after the other on
+    the calling thread: parsing is CPU-bound and gains nothing from threads.
+    """
+    unique_blob_ids = {blob_id for blob_id in blob_ids.values() if blob_id}
+    unread_blob_ids = [
+        blob_id for blob_id in unique_blob_ids if blob_id not in parsed_lockfiles
+    ]
+    with ThreadPoolExecutor(max_workers=min(len(unread_blob_ids), 8) or 1) as executor:
+        contents = dict(
+            zip(
+                unread_blob_ids,
+                executor.map(
+                    lambda blob_id: read_uv_lock_blob(blob_id, base_path),
+                    unread_blob_ids,
+                ),
+            )
+        )
+    lockfiles = {
+        blob_id: load_uv_lock_blob(blob_id, base_path, contents.get(blob_id))
+        for blob_id in unique_blob_ids
+    }
+    return {
+        rev: lockfiles[blob_id] if blob_id else None
+        for rev, blob_id in blob_ids.items()
+    }
+
+
+def resolve_commit(rev: str, base_path: str) -> str | None:
+    reader = open_reader(base_path)
+    if reader is not None:
+        try:
+            return reader.resolve_commit(rev)
+        except UnsupportedGitObject:
+            pass
+
+    run = subprocess.run(
+        ["git", "rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}"],
+        capture_output=True,
+        text=True,
+        cwd=base_path,
+        check=False,
+    )
     if run.returncode != 0:
-        print("uv.lock not found in base commit")
-        print(run.stderr)
-        print(run.stdout)
-        print(run.args)
         return None
+    return run.stdout.strip()
 
-    print("Found uv.lock in base commit.")
-    return UvLockFile.from_toml_str(run.stdout)
 
+def list_commits(
+    base_sha: str, head_sha: str, base_path: str
+) -> list[tuple[str, list[str]]]:
+    """
+    The commits after `base_sha` up to `head_sha` with their parents,
+    parents before children.
 
-def write_changes_file(lockfile_changes: LockfileChanges, output_path: str) -> None:
-    Path(output_path).write_text(lockfile_changes.model_dump_json())
+    Every parent is walked, so commits on merged branches are listed too.
+    """
+    run = subprocess.run(
+        ["git", "rev-list", "--reverse", "--topo-order", "--parents"]
+        + [f"{base_sha}..{head_sha}"],
+        capture_output=True,
+        text=True,
+        cwd=base_path,
+        check=False,
+    )
+    if run.returncode != 0:
+        print(f"Commits between {base_sha} and {head_sha} not found")
+        print(run.stderr)
+        return []
+    return [
+        (commit, parents)
+        for commit, *parents in map(str.split, run.stdout.splitlines())
+    ]
 
 
-def report(
+def get_package_commits(
     base_sha: str,
+    head_sha: str,
     base_path: str,
-    output_path: str,
-    output_format: OutputFormat = OutputFormat.TABLE,
-    show_learn_more_link: bool = True,
+    package_filter: PackageFilter | None = None,
+) -> dict[str, list[str]]:
+    """
+    The commits after `base_sha` up to `head_sha` that changed each package.
+
+    Each commit is diffed against its parents, so commits that left the
+    uv.lock blob unchanged are skipped before anything is parsed, and each
+    blob is parsed once however many commits share it. A merge commit is only
+    credited with changes it made against every parent, e.g. a conflict
+    resolution, so a pull request's synthetic merge commit credits nothing
+    and the changes stay with the commits on the merged branches.
+    """
+    commits = list_commits(base_sha, head_sha, base_path)
+    revs = dict.fromkeys(
+        rev for commit, parents in commits for rev in (*parents, commit)
+    )
+    blob_ids = get_uv_lock_blob_ids(list(revs), base_path)
+    changing_commits = [
+        (commit, parents)
+        for commit, parents in commits
+        if parents and all(blob_ids[commit] != blob_ids[parent] for parent in parents)
+    ]
+    lockfiles = load_uv_lock_blobs(
+        {
+            rev: blob_ids[rev]
+            for commit, parents in changing_commits
+            for rev in (*parents, commit)
+        },
+        base_path,
+    )
+
+    package_commits: dict[str, list[str]] = {}
+    for commit, parents in changing_commits:
+        changed_names = set.intersection(
+            *(
+                LockFileReporter(
+                    old_lockfile=lockfiles[parent],
+                    new_lockfile=lockfiles[commit],
+                    output_format=OutputFormat.TABLE,
+                    show_learn_more_link=False,
+                    package_filter=package_filter,
+                ).get_changed_package_names()
+                for parent in parents
+            )
+        )
+        for name in sorted(changed_names):
+            package_commits.setdefault(name, []).append(commit)
+    return package_commits
+
+
+def is_ancestor(ancestor: str, commit: str, base_path: str) -> bool:
+    run = subprocess.run(
+        ["git", "merge-base", "--is-ancestor", ancestor, commit],
+        capture_output=True,
+        cwd=base_path,
+        check=False,
+    )
+    return run.returncode == 0
+
+
+def record_history(
+    history_db: str,
+    repo_name: str,
+    base_sha: str | None,
+    base_path: str,
+    old_lockfile: UvLockFile | None,
+    new_lockfile: UvLockFile | None,
+    lockfile_changes: LockfileChanges,
+    head_sha: str = "HEAD",
 ) -> None:
-    old_lockfile = get_old_uv_lock_file(base_sha, base_path)
-    new_lockfile = get_new_uv_lock_file(base_path)
+    base_commit = resolve_commit(base_sha, base_path) if base_sha else None
+    head_commit = resolve_commit(head_sha, base_path)
+    store = HistoryStore(history_db)
+    try:
+        if base_commit and old_lockfile:
+            store.record_snapshot(repo_name, base_commit, old_lockfile)
+        if head_commit:
+            if new_lockfile:
+                # Deltas follow ancestry; a base that was since rebased away is
+                # no parent, and the head is then recorded as a baseline.
+                parent = (
+                    base_commit
+                    if base_commit and is_ancestor(base_commit, head_commit, base_path)
+                    else None
+                )
+                store.record_snapshot(repo_name, head_commit, new_lockfile, parent)
+            store.record_report(
+                repo_name, head_commit, lockfile_changes, base_sha=base_commit
+            )
+    finally:
+        store.close()
+
+
+def write_changes_file(lockfile_changes: LockfileChanges, output_path: str) -> None:
+    Path(output_path).write_text(lockfile_changes.model_dump_json())
+
+
+def write_step_summary(lockfile_changes: LockfileChanges, summary_path: str) -> None:
+    """Append the report markdown to `summary_path`, writing each line as rendered."""
+    append_markdown(lockfile_changes.iter_markdown(), summary_path)
+
+
+def append_markdown(lines: Iterable[str], summary_path: str) -> None:
+    with Path(summary_path).open("a", buffering=1) as summary:
+        # Backticks are escaped for the comment script; the summary is plain
+        # markdown.
+        summary.writelines(line.replace("\\`", "`") + "\n" for line in lines)
+
+
+class LockfileInputs(NamedTuple):
+    """The lockfiles a report compares, identified but not parsed yet."""
+
+    # The blob id of the lockfile at each commit read from git.
+    blob_ids: dict[str, str | None]
+    old_blob_id: str | None
+    new_blob_id: str | None
+    # The lockfiles not read from git.
+    old_content: bytes | None
+    new_content: bytes | None
 
+
+class ReportLockfiles(NamedTuple):
+    """The lockfiles a report compares, parsed."""
+
+    old: UvLockFile | None
+    new: UvLockFile | None
+    # The lockfile at each additional base.
+    comparisons: dict[str, UvLockFile | None]
+
+
+def resolve_lockfiles(
+    base_sha: str | None, base_path: str, options: ReportOptions
+) -> LockfileInputs:
+    """
+    Identify the lockfiles at `base_sha`, at the head and at each additional
+    base by blob id, so that a cached report can be used without parsing them.
+    """
+    revs = list(options.additional_base_shas)
+    if options.old_source is None:
+        assert base_sha is not None
+        revs.insert(0, base_sha)
+    if options.new_source is None and options.head_sha is not None:
+        revs.append(options.head_sha)
+    blob_ids = get_uv_lock_blob_ids(revs, base_path) if revs else {}
+    old_content = new_content = None
+    if options.old_source is not None:
+        old_content = read_uv_lock_bytes(options.old_source)
+        old_blob_id = git_blob_id(old_content)
+    else:
+        assert base_sha is not None
+        old_blob_id = blob_ids[base_sha]
+    if options.new_source is not None or options.head_sha is None:
+        if options.new_source is not None:
+            new_content = read_uv_lock_bytes(options.new_source)
+        else:
+            new_content = read_new_uv_lock_bytes(base_path)
+        new_blob_id = git_blob_id(new_content) if new_content is not None else None
+    else:
+        new_blob_id = blob_ids[options.head_sha]
+    return LockfileInputs(
+        blob_ids=blob_ids,
+        old_blob_id=old_blob_id,
+        new_blob_id=new_blob_id,
+        old_content=old_content,
+        new_content=new_content,
+    )
+
+
+def get_report_cache_key(
+    inputs: LockfileInputs,
+    base_sha: str | None,
+    base_path: str,
+    output_format: OutputFormat,
+    show_learn_more_link: bool,
+    options: ReportOptions,
+) -> str:
+    """The key of the report for `inputs` and `options` in the report cache."""
+    return report_cache_key(
+        {
+            "version": __version__,
+            "old": inputs.old_blob_id,
+            "new": inputs.new_blob_id,
+            "comparisons": [
+                [sha, inputs.blob_ids[sha]] for sha in options.additional_base_shas
+            ],
+            "output_format": output_format,
+            "show_learn_more_link": show_learn_more_link,
+            "ignore_packages": options.ignore_packages,
+            "only_packages": options.only_packages,
+            "advisory_db": source_signature(Path(options.advisory_db))
+            if options.advisory_db
+            else None,
+            "policy": file_digest(options.policy),
+            "previous_report": file_digest(options.previous_report),
+            "embed_payload": options.embed_payload,
+            "download_size": options.download_size,
+            "platform_tag": options.platform_tag,
+            "group_sections": options.group_sections,
+            "commit_attribution": [
+                resolve_commit(base_sha, base_path),
+                resolve_commit(options.head_sha or "HEAD", base_path),
+            ]
+            if options.commit_attribution and base_sha
+            else None,
+        }
+    )
+
+
+def load_lockfiles(
+    inputs: LockfileInputs, base_sha: str | None, base_path: str, options: ReportOptions
+) -> ReportLockfiles:
+    """
+    Parse the lockfiles of `inputs`. Committed ones are read concurrently and
+    parsed once per blob.
+    """
+    lockfiles_at = load_uv_lock_blobs(inputs.blob_ids, base_path)
+    if inputs.old_content is not None:
+        old_lockfile = UvLockFile.from_toml_str(inputs.old_content.decode())
+    else:
+        old_lockfile = lockfiles_at[base_sha] if base_sha else None
+    if inputs.new_content is not None:
+        new_lockfile = UvLockFile.from_toml_str(inputs.new_content.decode())
+    elif options.head_sha is not None and options.new_source is None:
+        new_lockfile = lockfiles_at[options.head_sha]
+    else:
+        new_lockfile = None
+    return ReportLockfiles(
+        old=old_lockfile,
+        new=new_lockfile,
+        comparisons={sha: lockfiles_at[sha] for sha in options.additional_base_shas},
+    )
+
+
+def build_changes(
+    lockfiles: ReportLockfiles,
+    base_sha: str | None,
+    base_path: str,
+    output_format: OutputFormat,
+    show_learn_more_link: bool,
+    options: ReportOptions,
+) -> LockfileChanges:
+    """Diff the lockfiles and add every report section `options` asks for."""
+    package_filter = PackageFilter(
+        ignore=options.ignore_packages, only=options.only_packages
+    )
     reporter = LockFileReporter(
-        old_lockfile=old_lockfile,
-        new_lockfile=new_lockfile,
+        old_lockfile=lockfiles.old,
+        new_lockfile=lockfiles.new,
         output_format=output_format,
         show_learn_more_link=show_learn_more_link,
+        package_filter=package_filter,
     )
 
-    write_changes_file(
-        lockfile_changes=reporter.get_changes(),
-        output_path=output_path,
+    lockfile_changes = reporter.get_changes()
+    lockfile_changes.embed_payload = options.embed_payload
+    if options.group_sections:
+        lockfile_changes.package_groups = reporter.get_package_groups(lockfile_changes)
+    if options.commit_attribution:
+        assert base_sha is not None
+        listed = lockfile_changes.head_versions().keys() | {
+            pkg.name for pkg in lockfile_changes.artifacts_changed
+        }
+        lockfile_changes.package_commits = {
+            name: commits
+            for name, commits in get_package_commits(
+                base_sha, options.head_sha or "HEAD", base_path, package_filter
+            ).items()
+            if name in listed
+        }
+    for base, old_lockfile in lockfiles.comparisons.items():
+        comparison = LockFileReporter(
+            old_lockfile=old_lockfile,
+            new_lockfile=lockfiles.new,
+            output_format=output_format,
+            show_learn_more_link=False,
+            package_filter=package_filter,
+        )
+        lockfile_changes.comparisons.append(
+            BaseComparison(base=base, changes=comparison.get_changes())
+        )
+    if options.previous_report is not None and Path(options.previous_report).exists():
+        previous = LockfileChanges.from_previous_report(
+            Path(options.previous_report).read_text()
+        )
+        if previous is not None:
+            lockfile_changes.since_last_update = lockfile_changes.changes_since(
+                previous
+            )
+    if options.download_size:
+        lockfile_changes.size_changes = reporter.get_size_changes(options.platform_tag)
+        lockfile_changes.size_platform = options.platform_tag
+    if options.advisory_db is not None:
+        lockfile_changes.advisories = find_advisories(
+            lockfile_changes, AdvisoryDatabase.load(Path(options.advisory_db))
+        )
+    if options.release_metadata and lockfile_changes.upgraded:
+        release_cache = ReleaseCache(
+            Path(options.release_cache)
+            if options.release_cache
+            else default_cache_path()
+        )
+        try:
+            fetcher = ReleaseMetadataFetcher(
+                index_url=options.release_index,
+                cache=release_cache,
+                time_budget=options.release_time_budget,
+            )
+            lockfile_changes.releases = fetcher.fetch(lockfile_changes.upgraded)
+        finally:
+            release_cache.close()
+    if options.policy is not None:
+        lockfile_changes.violations = Policy.load(Path(options.policy)).evaluate(
+            lockfile_changes
+        )
+    return lockfile_changes
+
+
+def report(
+    base_sha: str | None = None,
+    base_path: str = ".",
+    output_path: str | None = None,
+    output_format: OutputFormat = OutputFormat.TABLE,
+    show_learn_more_link: bool = True,
+    options: ReportOptions | None = None,
+) -> LockfileChanges:
+    """
+    Compare the lockfile at `base_sha` with `base_path/uv.lock`, write the
+    report to `output_path` and return it.
+
+    `options` reads the lockfiles from elsewhere, filters the packages, adds
+    report sections and writes further outputs; see `ReportOptions`. With
+    `options.old_source`, `base_sha` may be `None` and then only labels the
+    base in the history store.
+    """
+    options = options or ReportOptions()
+    if options.old_source is None and base_sha is None:
+        raise ValueError("One of base_sha or old_source is required")
+    if options.old_source is not None:
+        # Without a base commit there are no commits to attribute changes to.
+        options = options.model_copy(update={"commit_attribution": False})
+
+    inputs = resolve_lockfiles(base_sha, base_path, options)
+    cache = None
+    if (
+        options.report_cache is not None
+        and not options.release_metadata
+        and options.history_db is None
+    ):
+        cache = ReportCache(Path(options.report_cache))
+        cache_key = get_report_cache_key(
+            inputs, base_sha, base_path, output_format, show_learn_more_link, options
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            if options.step_summary is not None:
+                append_markdown(cached.markdown.split("\n"), options.step_summary)
+            if output_path is not None:
+                Path(output_path).write_text(cached.changes)
+            return LockfileChanges.model_validate_json(cached.changes)
+
+    lockfiles = load_lockfiles(inputs, base_sha, base_path, options)
+    lockfile_changes = build_changes(
+        lockfiles, base_sha, base_path, output_format, show_learn_more_link, options
     )
+    if options.history_db is not None:
+        record_history(
+            history_db=options.history_db,
+            repo_name=options.repo_name or Path(base_path).resolve().name,
+            base_sha=base_sha,
+            base_path=base_path,
+            old_lockfile=lockfiles.old,
+            new_lockfile=lockfiles.new,
+            lockfile_changes=lockfile_changes,
+            head_sha=options.head_sha or "HEAD",
+        )
+
+    if options.step_summary is not None:
+        write_step_summary(
+            lockfile_changes=lockfile_changes, summary_path=options.step_summary
+        )
+    if output_path is not None:
+        write_changes_file(
+            lockfile_changes=lockfile_changes,
+            output_path=output_path,
+        )
+    if cache is not None:
+        changes_json = lockfile_changes.model_dump_json()
+        cache.put(
+            cache_key,
+            CachedReport(
+                changes=changes_json, markdown=json.loads(changes_json)["markdown"]
+            ),
+        )
+    return lockfile_changes
@@ -0,0 +1,98 @@
+"""
+Pre-commit mode: report the staged uv.lock against the one at HEAD.
+
+Runs on every commit, so the common paths avoid heavy imports: when the staged
+blob is the one at HEAD nothing is parsed at all, and when the two lockfiles
+parse to the same package tables the comparison is done on plain dicts.
+Pydantic models are only loaded once there is something to report.
+"""
+
+import subprocess
+import tomllib
+from typing import Any
+
+STAGED_UV_LOCK = ":uv.lock"
+HEAD_UV_LOCK = "HEAD:uv.lock"
+
+
+def read_blobs(revs: list[str], base_path: str) -> list[tuple[str, bytes] | None]:
+    """`(blob id, content)` for each `rev:path`, read with a single git process."""
+    run = subprocess.run(
+        ["git", "cat-file", "--batch"],
+        input="".join(f"{rev}\n" for rev in revs).encode(),
+        capture_output=True,
+        cwd=base_path,
+        check=True,
+    )
+    output = run.stdout
+    blobs: list[tuple[str, bytes] | None] = []
+    offset = 0
+    for _ in revs:
+        end = output.index(b"\n", offset)
+        header = output[offset:end].split()
+        offset = end + 1
+        if header[-1] == b"missing" or header[1] != b"blob":
+            blobs.append(None)
+            continue
+        size = int(header[2])
+        blobs.append((header[0].decode(), output[offset : offset + size]))
+        offset += size + 1
+    return blobs
+
+
+def package_key(package: dict[str, Any]) -> tuple[str, ...]:
+    return (
+        package["name"],
+        package.get("version", ""),
+        repr(sorted(package.get("source", {}).items())),
+        *package.get("resolution-markers", ()),
+    )
+
+
+def package_tables(lockfile: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Every `[[package]]` table in a stable order. A package locked in several
+    resolution forks has a table per fork, so tables are not keyed by name.
+    """
+    return sorted(lockfile.get("package", ()), key=package_key)
+
+
+def staged_report(base_path: str = ".") -> str:
+    """
+    Simple-format report of the staged uv.lock changes, or "" if none.
+
+    A staged deletion reports every package at HEAD as removed.
+    """
+    head, staged = read_blobs([HEAD_UV_LOCK, STAGED_UV_LOCK], base_path)
+    if head is None and staged is None:
+        return ""
+    if head is not None and staged is not None and head[0] == staged[0]:
+        return ""
+
+    new_toml = tomllib.loads(staged[1].decode()) if staged is not None else None
+    old_toml = tomllib.loads(head[1].decode()) if head is not None else None
+    if (
+        old_toml is not None
+        and new_toml is not None
+        and old_toml.get("requires-python") == new_toml.get("requires-python")
+        and package_tables(old_toml) == package_tables(new_toml)
+    ):
+        return ""
+
+    from uv_lock_report.models import LockFileReporter, OutputFormat, UvLockFile
+
+    reporter = LockFileReporter(
+        old_lockfile=UvLockFile.model_validate(old_toml) if old_toml else None,
+        new_lockfile=UvLockFile.model_validate(new_toml) if new_toml else None,
+        output_format=OutputFormat.SIMPLE,
+        show_learn_more_link=False,
+    )
+    lockfile_changes = reporter.get_changes()
+    if not (
+        lockfile_changes.items
+        or lockfile_changes.dependencies_changed
+        or lockfile_changes.requires_python.has_changes()
+    ):
+        return ""
+    # The markdown escapes backticks for embedding in a script; undo that here.
+    return lockfile_changes.markdown_simple.replace("\\`", "`")
@@ -1,5 +1,107 @@
 # type: ignore[missing-argument]
-from uv_lock_report.models import LockfilePackage, OutputFormat, UpdatedPackage
+import subprocess
+
+import pytest
+
+from uv_lock_report.models import (
+    LockfilePackage,
+    OutputFormat,
+    UpdatedPackage,
+    UvLockFile,
+)
+
+
+class GitRepo:
+    """A throwaway git repository for tests that need real history."""
+
+    def __init__(self, path) -> None:
+        self.path = path
+        self.git("init", "--quiet", "--initial-branch=main")
+        self.git("config", "user.email", "test@example.com")
+        self.git("config", "user.name", "Test")
+        self.git("config", "commit.gpgsign", "false")
+
+    def git(self, *args: str) -> str:
+        return subprocess.run(
+            ["git", *args],
+            cwd=self.path,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+
+    def commit_lockfile(self, content: str, message: str = "Update uv.lock") -> str:
+        (self.path / "uv.lock").write_text(content)
+        self.git("add", "uv.lock")
+        self.git("commit", "--quiet", "--allow-empty", "-m", message)
+        return self.git("rev-parse", "HEAD")
+
+
+@pytest.fixture
+def git_repo(tmp_path) -> GitRepo:
+    path = tmp_path / "repo"
+    path.mkdir()
+    return GitRepo(path)
+
+
+def lockfile_toml(**versions: str) -> str:
+    """Minimal uv.lock content with one registry package per keyword."""
+    lines = ["version = 1", "revision = 3", 'requires-python = ">=3.13"', ""]
+    for name, version in versions.items():
+        lines.extend(
+            [
+                "[[package]]",
+                f'name = "{name}"',
+                f'version = "{version}"',
+                'source = { registry = "https://pypi.org/simple" }',
+                "",
+            ]
+        )
+    return "\n".join(lines)
+
+
+def make_lockfile(
+    *packages: dict, requires_python: str = ">=3.13", **versions: str
+) -> UvLockFile:
+    """
+    A parsed uv.lock of raw `[[package]]` tables, plus one registry package per
+    keyword like `lockfile_toml`.
+    """
+    return UvLockFile.model_validate(
+        {
+            "version": 1,
+            "revision": 3,
+            "requires-python": requires_python,
+            "package": [
+                *packages,
+                *(
+                    {
+                        "name": name,
+                        "version": version,
+                        "source": {"registry": "https://pypi.org/simple"},
+                    }
+                    for name, version in versions.items()
+                ),
+            ],
+        }
+    )
+
+
+@pytest.fixture
+def history_lockfiles() -> list[str]:
+    """The uv.lock contents `history` commits, oldest first."""
+    return [
+        lockfile_toml(django="4.2.0", httpx="0.27.0"),
+        lockfile_toml(django="5.0.0", httpx="0.27.0"),
+        lockfile_toml(django="5.0.0", httpx="0.28.0"),
+    ]
+
+
+@pytest.fixture
+def history(git_repo, history_lockfiles) -> list[str]:
+    """One commit per `history_lockfiles` entry in `git_repo`, oldest first."""
+    return [git_repo.commit_lockfile(content) for content in history_lockfiles]
+
 
 ADDED_PACKAGES: list[LockfilePackage] = [
     LockfilePackage(name="added_1", version="1.0.0"),
@@ -70,6 +172,19 @@ EXPECTED_LOCKFILE_CHANGES_FULL_MODEL_DUMP_TABLE = {
         {"name": "added_1", "version": "1.0.0"},
         {"name": "added_2", "version": "4.2.0"},
     ],
+    "artifacts_changed": [],
+    "dependencies_changed": [],
+    "wheel_coverage_changed": [],
+    "added_attribution": [],
+    "package_groups": {},
+    "package_commits": {},
+    "advisories": [],
+    "releases": [],
+    "size_changes": [],
+    "size_platform": None,
+    "violations": [],
+    "since_last_update": [],
+    "comparisons": [],
     "items": 8,
     "learn_more_link_text": "\n---\nLearn more about this report at https://github.com/mw-root/uv-lock-report",
     "markdown": EXPECTED_LOCKFILE_CHANGES_FULL_TABLE,
@@ -83,18 +198,58 @@ EXPECTED_LOCKFILE_CHANGES_FULL_MODEL_DUMP_TABLE = {
     "requires_python": {"new": None, "old": None},
     "show_learn_more_link": False,
     "updated": [
-        {"name": "upgraded_1", "new_version": "2.0.0", "old_version": "1.0.0"},
-        {"name": "upgraded_2", "new_version": "2.0.0", "old_version": "1.0.0"},
-        {"name": "downgraded_1", "new_version": "1.3.0", "old_version": "2.1.0"},
-        {"name": "downgraded_2", "new_version": "4.9.7", "old_version": "5.3.2"},
+        {
+            "name": "upgraded_1",
+            "new_version": "2.0.0",
+            "old_version": "1.0.0",
+            "fork": None,
+        },
+        {
+            "name": "upgraded_2",
+            "new_version": "2.0.0",
+            "old_version": "1.0.0",
+            "fork": None,
+        },
+        {
+            "name": "downgraded_1",
+            "new_version": "1.3.0",
+            "old_version": "2.1.0",
+            "fork": None,
+        },
+        {
+            "name": "downgraded_2",
+            "new_version": "4.9.7",
+            "old_version": "5.3.2",
+            "fork": None,
+        },
     ],
     "upgraded": [
-        {"name": "upgraded_1", "new_version": "2.0.0", "old_version": "1.0.0"},
-        {"name": "upgraded_2", "new_version": "2.0.0", "old_version": "1.0.0"},
+        {
+            "name": "upgraded_1",
+            "new_version": "2.0.0",
+            "old_version": "1.0.0",
+            "fork": None,
+        },
+        {
+            "name": "upgraded_2",
+            "new_version": "2.0.0",
+            "old_version": "1.0.0",
+            "fork": None,
+        },
     ],
     "downgraded": [
-        {"name": "downgraded_1", "new_version": "1.3.0", "old_version": "2.1.0"},
-        {"name": "downgraded_2", "new_version": "4.9.7", "old_version": "5.3.2"},
+        {
+            "name": "downgraded_1",
+            "new_version": "1.3.0",
+            "old_version": "2.1.0",
+            "fork": None,
+        },
+        {
+            "name": "downgraded_2",
+            "new_version": "4.9.7",
+            "old_version": "5.3.2",
+            "fork": None,
+        },
     ],
 }
 
@@ -104,6 +259,19 @@ EXPECTED_LOCKFILE_CHANGES_FULL_MODEL_DUMP_SIMPLE = {
         {"name": "added_1", "version": "1.0.0"},
         {"name": "added_2", "version": "4.2.0"},
     ],
+    "artifacts_changed": [],
+    "dependencies_changed": [],
+    "wheel_coverage_changed": [],
+    "added_attribution": [],
+    "package_groups": {},
+    "package_commits": {},
+    "advisories": [],
+    "releases": [],
+    "size_changes": [],
+    "size_platform": None,
+    "violations": [],
+    "since_last_update": [],
+    "comparisons": [],
     "items": 8,
     "learn_more_link_text": "\n---\nLearn more about this report at https://github.com/mw-root/uv-lock-report",
     "markdown": EXPECTED_LOCKFILE_CHANGES_FULL_SIMPLE,
@@ -117,18 +285,58 @@ EXPECTED_LOCKFILE_CHANGES_FULL_MODEL_DUMP_SIMPLE = {
     "requires_python": {"new": None, "old": None},
     "show_learn_more_link": False,
     "updated": [
-        {"name": "upgraded_1", "new_version": "2.0.0", "old_version": "1.0.0"},
-        {"name": "upgraded_2", "new_version": "2.0.0", "old_version": "1.0.0"},
-        {"name": "downgraded_1", "new_version": "1.3.0", "old_version": "2.1.0"},
-        {"name": "downgraded_2", "new_version": "4.9.7", "old_version": "5.3.2"},
+        {
+            "name": "upgraded_1",
+            "new_version": "2.0.0",
+            "old_version": "1.0.0",
+            "fork": None,
+        },
+        {
+            "name": "upgraded_2",
+            "new_version": "2.0.0",
+            "old_version": "1.0.0",
+            "fork": None,
+        },
+        {
+            "name": "downgraded_1",
+            "new_version": "1.3.0",
+            "old_version": "2.1.0",
+            "fork": None,
+        },
+        {
+            "name": "downgraded_2",
+            "new_version": "4.9.7",
+            "old_version": "5.3.2",
+            "fork": None,
+        },
     ],
     "upgraded": [
-        {"name": "upgraded_1", "new_version": "2.0.0", "old_version": "1.0.0"},
-        {"name": "upgraded_2", "new_version": "2.0.0", "old_version": "1.0.0"},
+        {
+            "name": "upgraded_1",
+            "new_version": "2.0.0",
+            "old_version": "1.0.0",
+            "fork": None,
+        },
+        {
+            "name": "upgraded_2",
+            "new_version": "2.0.0",
+            "old_version": "1.0.0",
+            "fork": None,
+        },
     ],
     "downgraded": [
-        {"name": "downgraded_1", "new_version": "1.3.0", "old_version": "2.1.0"},
-        {"name": "downgraded_2", "new_version": "4.9.7", "old_version": "5.3.2"},
+        {
+            "name": "downgraded_1",
+            "new_version": "1.3.0",
+            "old_version": "2.1.0",
+            "fork": None,
+        },
+        {
+            "name": "downgraded_2",
+            "new_version": "4.9.7",
+            "old_version": "5.3.2",
+            "fork": None,
+        },
     ],
 }
 
@@ -137,6 +345,19 @@ EXPECTED_LOCKFILE_CHANGES_FULL_MODEL_DUMP_SIMPLE_WITH_LINK = {
         {"name": "added_1", "version": "1.0.0"},
         {"name": "added_2", "version": "4.2.0"},
     ],
+    "artifacts_changed": [],
+    "dependencies_changed": [],
+    "wheel_coverage_changed": [],
+    "added_attribution": [],
+    "package_groups": {},
+    "package_commits": {},
+    "advisories": [],
+    "releases": [],
+    "size_changes": [],
+    "size_platform": None,
+    "violations": [],
+    "since_last_update": [],
+    "comparisons": [],
     "items": 8,
     "learn_more_link_text": "\n---\nLearn more about this report at https://github.com/mw-root/uv-lock-report",
     "markdown": EXPECTED_LOCKFILE_CHANGES_FULL_SIMPLE_WITH_LINK,
@@ -150,17 +371,57 @@ EXPECTED_LOCKFILE_CHANGES_FULL_MODEL_DUMP_SIMPLE_WITH_LINK = {
     "requires_python": {"new": None, "old": None},
     "show_learn_more_link": True,
     "updated": [
-        {"name": "upgraded_1", "new_version": "2.0.0", "old_version": "1.0.0"},
-        {"name": "upgraded_2", "new_version": "2.0.0", "old_version": "1.0.0"},
-        {"name": "downgraded_1", "new_version": "1.3.0", "old_version": "2.1.0"},
-        {"name": "downgraded_2", "new_version": "4.9.7", "old_version": "5.3.2"},
+        {
+            "name": "upgraded_1",
+            "new_version": "2.0.0",
+            "old_version": "1.0.0",
+            "fork": None,
+        },
+        {
+            "name": "upgraded_2",
+            "new_version": "2.0.0",
+            "old_version": "1.0.0",
+            "fork": None,
+        },
+        {
+            "name": "downgraded_1",
+            "new_version": "1.3.0",
+            "old_version": "2.1.0",
+            "fork": None,
+        },
+        {
+            "name": "downgraded_2",
+            "new_version": "4.9.7",
+            "old_version": "5.3.2",
+            "fork": None,
+        },
     ],
     "upgraded": [
-        {"name": "upgraded_1", "new_version": "2.0.0", "old_version": "1.0.0"},
-        {"name": "upgraded_2", "new_version": "2.0.0", "old_version": "1.0.0"},
+        {
+            "name": "upgraded_1",
+            "new_version": "2.0.0",
+            "old_version": "1.0.0",
+            "fork": None,
+        },
+        {
+            "name": "upgraded_2",
+            "new_version": "2.0.0",
+            "old_version": "1.0.0",
+            "fork": None,
+        },
     ],
     "downgraded": [
-        {"name": "downgraded_1", "new_version": "1.3.0", "old_version": "2.1.0"},
-        {"name": "downgraded_2", "new_version": "4.9.7", "old_version": "5.3.2"},
+        {
+            "name": "downgraded_1",
+            "new_version": "1.3.0",
+            "old_version": "2.1.0",
+            "fork": None,
+        },
+        {
+            "name": "downgraded_2",
+            "new_version": "4.9.7",
+            "old_version": "5.3.2",
+            "fork": None,
+        },
     ],
 }
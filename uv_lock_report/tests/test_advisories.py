@@ -0,0 +1,265 @@
+import json
+import os
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from uv_lock_report.advisories import (
+    AdvisoryDatabase,
+    default_db_path,
+    find_advisories,
+    iter_ranges,
+)
+from uv_lock_report.models import (
+    LockfileChanges,
+    LockfilePackage,
+    OutputFormat,
+    RequiresPythonChanges,
+    UpdatedPackage,
+)
+
+OSV_RECORDS = [
+    {
+        "id": "GHSA-aaaa-bbbb-cccc",
+        "summary": "SQL injection in QuerySet.filter",
+        "aliases": ["CVE-2024-0001"],
+        "affected": [
+            {
+                "package": {"ecosystem": "PyPI", "name": "Django"},
+                "ranges": [
+                    {
+                        "type": "ECOSYSTEM",
+                        "events": [
+                            {"introduced": "4.0"},
+                            {"fixed": "4.2.1"},
+                            {"introduced": "5.0"},
+                            {"fixed": "5.0.3"},
+                        ],
+                    }
+                ],
+            }
+        ],
+    },
+    {
+        "id": "PYSEC-2024-2",
+        "affected": [
+            {
+                "package": {"ecosystem": "PyPI", "name": "requests"},
+                "versions": ["2.31.0"],
+            }
+        ],
+    },
+    {
+        "id": "GHSA-withdrawn",
+        "withdrawn": "2024-01-01T00:00:00Z",
+        "affected": [
+            {
+                "package": {"ecosystem": "PyPI", "name": "django"},
+                "ranges": [{"type": "ECOSYSTEM", "events": [{"introduced": "0"}]}],
+            }
+        ],
+    },
+    {
+        "id": "RUSTSEC-2024-1",
+        "affected": [
+            {
+                "package": {"ecosystem": "crates.io", "name": "requests"},
+                "ranges": [{"type": "SEMVER", "events": [{"introduced": "0"}]}],
+            }
+        ],
+    },
+]
+
+
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path, monkeypatch):
+    cache_home = tmp_path / "cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    return cache_home
+
+
+@pytest.fixture
+def osv_dir(tmp_path):
+    directory = tmp_path / "osv"
+    directory.mkdir()
+    for record in OSV_RECORDS:
+        (directory / f"{record['id']}.json").write_text(json.dumps(record))
+    return directory
+
+
+class TestIterRanges:
+    def test_introduced_fixed_pairs(self):
+        affected = OSV_RECORDS[0]["affected"][0]
+        assert list(iter_ranges(affected)) == [
+            ("4.0", "4.2.1", None),
+            ("5.0", "5.0.3", None),
+        ]
+
+    def test_open_and_last_affected_ranges(self):
+        affected = {
+            "ranges": [
+                {
+                    "type": "ECOSYSTEM",
+                    "events": [{"introduced": "1.0"}, {"last_affected": "1.4"}],
+                },
+                {"type": "GIT", "events": [{"introduced": "abc"}]},
+                {"type": "ECOSYSTEM", "events": [{"introduced": "2.0"}]},
+            ]
+        }
+        assert list(iter_ranges(affected)) == [
+            ("1.0", None, "1.4"),
+            ("2.0", None, None),
+        ]
+
+
+class TestAdvisoryDatabase:
+    def test_lookup_by_range(self, osv_dir):
+        database = AdvisoryDatabase.load(osv_dir)
+
+        advisories = database.lookup("django", "4.2.0")
+
+        assert [advisory.id for advisory in advisories] == ["GHSA-aaaa-bbbb-cccc"]
+        assert advisories[0].aliases == ["CVE-2024-0001"]
+        assert advisories[0].fixed_version == "4.2.1"
+
+    @pytest.mark.parametrize("version", ["3.2.0", "4.2.1", "4.2.5", "5.0.3"])
+    def test_lookup_outside_ranges(self, osv_dir, version):
+        database = AdvisoryDatabase.load(osv_dir)
+
+        assert database.lookup("django", version) == []
+
+    def test_lookup_exact_versions_and_normalized_names(self, osv_dir):
+        database = AdvisoryDatabase.load(osv_dir)
+
+        assert [a.id for a in database.lookup("Requests", "2.31")] == ["PYSEC-2024-2"]
+        assert database.lookup("requests", "2.32.0") == []
+
+    def test_withdrawn_and_other_ecosystems_are_skipped(self, osv_dir):
+        database = AdvisoryDatabase.load(osv_dir)
+
+        assert database.lookup("django", "1.0") == []
+        assert [a.id for a in database.lookup("requests", "2.31.0")] == ["PYSEC-2024-2"]
+
+    def test_compiled_store_is_reused(self, osv_dir, cache_home):
+        AdvisoryDatabase.load(osv_dir)
+        compiled = default_db_path(osv_dir)
+        assert compiled.parent == cache_home / "uv-lock-report"
+        assert compiled.exists()
+        assert not osv_dir.with_name("osv.sqlite").exists()
+
+        database = AdvisoryDatabase.load(compiled)
+
+        assert [a.id for a in database.lookup("django", "5.0.1")] == [
+            "GHSA-aaaa-bbbb-cccc"
+        ]
+
+    def test_manifest_change_recompiles(self, osv_dir):
+        nested = osv_dir / "pypi" / "PYSEC-2024-3.json"
+        nested.parent.mkdir()
+        manifest = osv_dir / "modified_id.csv"
+        manifest.write_text("2024-01-01T00:00:00Z,PYSEC-2024-3\n")
+        record = {
+            "id": "PYSEC-2024-3",
+            "affected": [
+                {
+                    "package": {"ecosystem": "PyPI", "name": "h2"},
+                    "versions": ["4.0.0"],
+                }
+            ],
+        }
+        nested.write_text(json.dumps(record))
+        assert AdvisoryDatabase.load(osv_dir).lookup("h2", "4.1.0") == []
+        directory_mtime = osv_dir.stat().st_mtime_ns
+
+        record["affected"][0]["versions"] = ["4.1.0"]
+        nested.write_text(json.dumps(record))
+        manifest.write_text("2024-02-01T00:00:00Z,PYSEC-2024-3\n")
+        # Same size; only the (possibly coarse) modification time moves.
+        mtime = manifest.stat().st_mtime_ns + 1_000_000_000
+        os.utime(manifest, ns=(mtime, mtime))
+
+        assert osv_dir.stat().st_mtime_ns == directory_mtime
+        assert [a.id for a in AdvisoryDatabase.load(osv_dir).lookup("h2", "4.1.0")] == [
+            "PYSEC-2024-3"
+        ]
+
+    def test_replaced_file_recompiles(self, osv_dir):
+        record = {
+            "id": "PYSEC-2024-3",
+            "affected": [
+                {
+                    "package": {"ecosystem": "PyPI", "name": "h2"},
+                    "versions": ["4.0.0"],
+                }
+            ],
+        }
+        path = osv_dir / "PYSEC-2024-3.json"
+        path.write_text(json.dumps(record))
+        assert AdvisoryDatabase.load(osv_dir).lookup("h2", "4.1.0") == []
+        mtime = osv_dir.stat().st_mtime_ns
+
+        record["affected"][0]["versions"] = ["4.1.0"]
+        replacement = osv_dir.with_name("PYSEC-2024-3.json")
+        replacement.write_text(json.dumps(record))
+        replacement.replace(path)
+        # Replacing a file is a directory change; move the (possibly coarse)
+        # modification time past the one the store was compiled at.
+        os.utime(osv_dir, ns=(mtime + 1_000_000_000, mtime + 1_000_000_000))
+
+        assert [a.id for a in AdvisoryDatabase.load(osv_dir).lookup("h2", "4.1.0")] == [
+            "PYSEC-2024-3"
+        ]
+
+    def test_directory_signature_is_a_single_stat(self, osv_dir, monkeypatch):
+        AdvisoryDatabase.load(osv_dir)
+        monkeypatch.setattr(Path, "rglob", lambda *args: pytest.fail("dump was walked"))
+
+        assert AdvisoryDatabase.load(osv_dir).lookup("django", "5.0.1")
+
+    def test_load_tarball(self, osv_dir, tmp_path):
+        tarball = tmp_path / "osv.tar.gz"
+        with tarfile.open(tarball, "w:gz") as archive:
+            archive.add(osv_dir, arcname="osv")
+
+        database = AdvisoryDatabase.load(tarball, tmp_path / "compiled.sqlite")
+
+        assert [a.id for a in database.lookup("django", "4.1")] == [
+            "GHSA-aaaa-bbbb-cccc"
+        ]
+
+    def test_load_zip(self, tmp_path):
+        archive_path = tmp_path / "all.zip"
+        with zipfile.ZipFile(archive_path, "w") as archive:
+            for record in OSV_RECORDS:
+                archive.writestr(f"{record['id']}.json", json.dumps(record))
+
+        database = AdvisoryDatabase.load(archive_path)
+
+        assert [a.id for a in database.lookup("requests", "2.31.0")] == ["PYSEC-2024-2"]
+
+    def test_find_advisories_for_added_and_upgraded(self, osv_dir):
+        database = AdvisoryDatabase.load(osv_dir)
+        lockfile_changes = LockfileChanges(
+            requires_python=RequiresPythonChanges(old=None, new=None),
+            added=[LockfilePackage(name="requests", version="2.31.0")],
+            updated=[
+                UpdatedPackage(name="django", old_version="3.2.0", new_version="4.2.0"),
+                UpdatedPackage(name="django", old_version="5.0.2", new_version="4.0"),
+            ],
+            output_format=OutputFormat.SIMPLE,
+            show_learn_more_link=False,
+        )
+
+        lockfile_changes.advisories = find_advisories(lockfile_changes, database)
+
+        assert [(a.name, a.version, a.id) for a in lockfile_changes.advisories] == [
+            ("requests", "2.31.0", "PYSEC-2024-2"),
+            ("django", "4.2.0", "GHSA-aaaa-bbbb-cccc"),
+        ]
+        assert (
+            ":rotating_light: \\`django\\`: \\`4.2.0\\` GHSA-aaaa-bbbb-cccc, "
+            "CVE-2024-0001 - SQL injection in QuerySet.filter (fixed in \\`4.2.1\\`)"
+            in lockfile_changes.markdown
+        )
@@ -0,0 +1,158 @@
+import json
+
+import pytest
+
+from uv_lock_report.batch import (
+    BatchJob,
+    group_jobs,
+    load_base_lockfiles,
+    read_manifest,
+    run_batch,
+)
+from uv_lock_report.cli import main
+from uv_lock_report.models import OutputFormat
+from uv_lock_report.report import get_uv_lock_file_at
+
+
+def write_manifest(path, jobs: list[dict]) -> str:
+    path.write_text("\n".join(json.dumps(job) for job in jobs) + "\n")
+    return str(path)
+
+
+class TestBatch:
+    def test_read_manifest(self, tmp_path):
+        manifest = write_manifest(
+            tmp_path / "manifest.jsonl",
+            [
+                {"repo": ".", "base": "a", "head": "b", "output": "1.json"},
+                {
+                    "repo": ".",
+                    "base": "a",
+                    "head": "c",
+                    "output": "2.json",
+                    "format": "simple",
+                },
+            ],
+        )
+
+        jobs = read_manifest(manifest)
+
+        assert [job.output_format for job in jobs] == [
+            OutputFormat.TABLE,
+            OutputFormat.SIMPLE,
+        ]
+
+    def test_group_jobs_by_repo_and_base(self):
+        jobs = [
+            BatchJob(repo="r1", base="a", head="x", output="1.json"),
+            BatchJob(repo="r2", base="a", head="x", output="2.json"),
+            BatchJob(repo="r1", base="a", head="y", output="3.json"),
+        ]
+
+        groups = group_jobs(jobs)
+
+        assert [[index for index, _ in group] for group in groups] == [[0, 2], [1]]
+
+    @pytest.mark.parametrize("max_workers", [1, 2])
+    def test_run_batch(self, git_repo, history, tmp_path, max_workers):
+        base, head_1, head_2 = history
+        repo = str(git_repo.path)
+        jobs = [
+            BatchJob(
+                repo=repo, base=base, head=head_1, output=str(tmp_path / "1.json")
+            ),
+            BatchJob(
+                repo=repo,
+                base=head_1,
+                head=head_2,
+                output=str(tmp_path / "2.json"),
+                format="simple",
+            ),
+            BatchJob(
+                repo=repo, base=base, head=head_2, output=str(tmp_path / "3.json")
+            ),
+        ]
+
+        results = run_batch(jobs, max_workers=max_workers)
+
+        assert [(r.output, r.items, r.error) for r in results] == [
+            (str(tmp_path / "1.json"), 1, None),
+            (str(tmp_path / "2.json"), 1, None),
+            (str(tmp_path / "3.json"), 2, None),
+        ]
+        report = json.loads((tmp_path / "2.json").read_text())
+        assert report["output_format"] == "simple"
+        assert [pkg["name"] for pkg in report["updated"]] == ["httpx"]
+
+    def test_heads_of_one_base_run_in_parallel(self, git_repo, history, tmp_path):
+        base, *heads = history
+        repo = str(git_repo.path)
+        jobs = [
+            BatchJob(
+                repo=repo, base=base, head=head, output=str(tmp_path / f"{n}.json")
+            )
+            for n, head in enumerate(heads * 2)
+        ]
+
+        results = run_batch(jobs, max_workers=2)
+
+        assert [r.items for r in results] == [1, 2, 1, 2]
+
+    def test_base_lockfiles_are_parsed_in_the_parent(self, git_repo, history, tmp_path):
+        base, head_1, _ = history
+        repo = str(git_repo.path)
+        jobs = [
+            BatchJob(repo=repo, base=base, head=head_1, output="1.json"),
+            BatchJob(repo=repo, base=base, head="HEAD", output="2.json"),
+            BatchJob(
+                repo=str(tmp_path / "missing"), base=base, head="HEAD", output="3.json"
+            ),
+        ]
+
+        lockfiles = load_base_lockfiles(jobs)
+
+        assert list(lockfiles) == [(repo, base)]
+        assert lockfiles[(repo, base)] is get_uv_lock_file_at(base, repo)
+
+    def test_failed_jobs_are_reported(self, tmp_path):
+        jobs = [
+            BatchJob(
+                repo=str(tmp_path / "missing"),
+                base="a",
+                head="b",
+                output=str(tmp_path / "1.json"),
+            )
+        ]
+
+        [result] = run_batch(jobs)
+
+        assert result.items is None
+        assert result.error is not None
+
+    def test_lockfiles_are_parsed_once_per_blob(self, git_repo, history):
+        base, _, _ = history
+        repo = str(git_repo.path)
+
+        assert get_uv_lock_file_at(base, repo) is get_uv_lock_file_at(base, repo)
+        # An empty commit keeps the same uv.lock blob.
+        git_repo.git("commit", "--quiet", "--allow-empty", "-m", "empty")
+        assert get_uv_lock_file_at("HEAD", repo) is get_uv_lock_file_at("HEAD~1", repo)
+        assert get_uv_lock_file_at("missing-ref", repo) is None
+
+    def test_batch_cli(self, git_repo, history, tmp_path, capsys):
+        base, head_1, _ = history
+        output = str(tmp_path / "1.json")
+        manifest = write_manifest(
+            tmp_path / "manifest.jsonl",
+            [
+                {
+                    "repo": str(git_repo.path),
+                    "base": base,
+                    "head": head_1,
+                    "output": output,
+                }
+            ],
+        )
+
+        assert main(["batch", manifest, "--jobs", "1"]) == 0
+        assert capsys.readouterr().out == f"Wrote {output} (1 changes)\n"
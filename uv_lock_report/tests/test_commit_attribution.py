@@ -0,0 +1,173 @@
+import json
+
+import pytest
+
+from uv_lock_report.cli import main
+from uv_lock_report.models import OutputFormat, UvLockFile
+from uv_lock_report.report import (
+    ReportOptions,
+    get_package_commits,
+    parsed_lockfiles,
+    report,
+)
+
+from .conftest import lockfile_toml
+
+
+@pytest.fixture
+def pull_request(git_repo):
+    """A base commit followed by lockfile changes spread over several commits."""
+    base = git_repo.commit_lockfile(lockfile_toml(django="4.2.0", h2="4.1.0"))
+    first = git_repo.commit_lockfile(lockfile_toml(django="5.0.0", h2="4.1.0"))
+    (git_repo.path / "README.md").write_text("Unrelated")
+    git_repo.git("add", "README.md")
+    git_repo.git("commit", "--quiet", "-m", "Docs")
+    second = git_repo.commit_lockfile(
+        lockfile_toml(django="5.1.0", h2="4.1.0", rich="13.9.0")
+    )
+    third = git_repo.commit_lockfile(lockfile_toml(django="5.1.0", rich="13.9.0"))
+    return git_repo, base, [first, second, third]
+
+
+@pytest.fixture
+def merge_checkout(git_repo):
+    """
+    A feature branch that merged a topic branch, checked out the way
+    `actions/checkout` does for pull requests: as a merge into the base.
+    """
+    base = git_repo.commit_lockfile(lockfile_toml(django="4.2.0", h2="4.1.0"))
+    git_repo.git("checkout", "--quiet", "-b", "feature")
+    first = git_repo.commit_lockfile(lockfile_toml(django="5.0.0", h2="4.1.0"))
+    git_repo.git("checkout", "--quiet", "-b", "topic", base)
+    topic = git_repo.commit_lockfile(lockfile_toml(django="4.2.0", h2="4.2.0"))
+    git_repo.git("checkout", "--quiet", "feature")
+    git_repo.git("merge", "--quiet", "--no-commit", "topic")
+    merged = git_repo.commit_lockfile(
+        lockfile_toml(django="5.0.0", h2="4.2.0"), "Merge topic"
+    )
+    git_repo.git("checkout", "--quiet", "--detach", base)
+    git_repo.git("merge", "--quiet", "--no-ff", "-m", "Merge feature", "feature")
+    return git_repo, base, [first, topic, merged]
+
+
+class TestPackageCommits:
+    def test_each_package_is_attributed(self, pull_request):
+        git_repo, base, (first, second, third) = pull_request
+
+        assert get_package_commits(base, "HEAD", str(git_repo.path)) == {
+            "django": [first, second],
+            "rich": [second],
+            "h2": [third],
+        }
+
+    def test_each_changed_blob_is_parsed_once(self, pull_request, monkeypatch):
+        git_repo, base, _ = pull_request
+        parsed_lockfiles.clear()
+        parsed = []
+        from_toml_str = UvLockFile.from_toml_str.__func__
+        monkeypatch.setattr(
+            UvLockFile,
+            "from_toml_str",
+            classmethod(
+                lambda cls, text: parsed.append(text) or from_toml_str(cls, text)
+            ),
+        )
+
+        get_package_commits(base, "HEAD", str(git_repo.path))
+
+        # The base and the three commits that changed uv.lock, not the docs one.
+        assert len(parsed) == 4
+
+    def test_merge_checkout(self, merge_checkout):
+        git_repo, base, (first, topic, _) = merge_checkout
+
+        assert get_package_commits(base, "HEAD", str(git_repo.path)) == {
+            "django": [first],
+            "h2": [topic],
+        }
+
+    def test_merge_resolutions_are_attributed(self, git_repo):
+        base = git_repo.commit_lockfile(lockfile_toml(django="4.2.0", h2="4.1.0"))
+        git_repo.git("checkout", "--quiet", "-b", "topic")
+        topic = git_repo.commit_lockfile(lockfile_toml(django="4.2.0", h2="4.2.0"))
+        git_repo.git("checkout", "--quiet", "main")
+        first = git_repo.commit_lockfile(lockfile_toml(django="5.0.0", h2="4.1.0"))
+        git_repo.git("merge", "--quiet", "--no-commit", "-s", "ours", "topic")
+        merged = git_repo.commit_lockfile(
+            lockfile_toml(django="5.0.0", h2="4.3.0"), "Merge topic"
+        )
+
+        assert get_package_commits(base, "HEAD", str(git_repo.path)) == {
+            "django": [first],
+            "h2": [topic, merged],
+        }
+
+    def test_unknown_range(self, pull_request, capsys):
+        git_repo, base, _ = pull_request
+
+        assert get_package_commits(base, "no-such-branch", str(git_repo.path)) == {}
+        assert "Commits between" in capsys.readouterr().out
+
+
+class TestReportWithCommitAttribution:
+    def test_rows_name_their_commits(self, pull_request):
+        git_repo, base, (first, second, third) = pull_request
+
+        changes = report(
+            base_sha=base,
+            base_path=str(git_repo.path),
+            output_format=OutputFormat.SIMPLE,
+            options=ReportOptions(commit_attribution=True),
+        )
+
+        assert changes.package_commits == {
+            "django": [first, second],
+            "rich": [second],
+            "h2": [third],
+        }
+        assert f"\\`rich\\`: \\`13.9.0\\` ({second[:7]})" in changes.markdown_simple
+        assert (
+            f"| django | 4.2.0 | 5.1.0 | {first[:7]}, {second[:7]} |"
+            in changes.markdown_table
+        )
+        assert "| Package | Old Version | New Version | Commits |" in (
+            changes.markdown_table
+        )
+
+    def test_reverted_changes_are_left_out(self, pull_request):
+        git_repo, base, _ = pull_request
+        git_repo.commit_lockfile(
+            lockfile_toml(django="5.1.0", h2="4.1.0", rich="13.9.0")
+        )
+
+        changes = report(
+            base_sha=base,
+            base_path=str(git_repo.path),
+            options=ReportOptions(commit_attribution=True),
+        )
+
+        assert set(changes.package_commits) == {"django", "rich"}
+
+    def test_cli(self, pull_request, tmp_path):
+        git_repo, base, (first, second, _) = pull_request
+        output = tmp_path / "report.json"
+
+        assert (
+            main(
+                [
+                    "--base-sha",
+                    base,
+                    "--base-path",
+                    str(git_repo.path),
+                    "--output-path",
+                    str(output),
+                    "--commit-attribution",
+                    "true",
+                ]
+            )
+            == 0
+        )
+        assert json.loads(output.read_text())["package_commits"]["django"] == [
+            first,
+            second,
+        ]
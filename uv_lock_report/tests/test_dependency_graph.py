@@ -0,0 +1,230 @@
+from uv_lock_report.models import LockFileReporter, OutputFormat, UvLockFile
+
+WORKSPACE_UV_LOCK = """
+version = 1
+revision = 3
+requires-python = ">=3.13"
+
+[[package]]
+name = "app"
+version = "0.1.0"
+source = { editable = "." }
+dependencies = [{ name = "httpx", extra = ["http2"] }]
+
+[package.optional-dependencies]
+cli = [{ name = "rich" }]
+
+[package.dev-dependencies]
+test = [{ name = "pytest" }]
+
+[[package]]
+name = "worker"
+version = "0.1.0"
+source = { editable = "packages/worker" }
+dependencies = [{ name = "httpx" }]
+
+[[package]]
+name = "httpx"
+version = "0.28.1"
+source = { registry = "https://pypi.org/simple" }
+dependencies = [{ name = "anyio" }]
+
+[package.optional-dependencies]
+http2 = [{ name = "h2" }]
+brotli = [{ name = "brotli" }]
+
+[[package]]
+name = "anyio"
+version = "4.6.0"
+source = { registry = "https://pypi.org/simple" }
+
+[[package]]
+name = "h2"
+version = "4.1.0"
+source = { registry = "https://pypi.org/simple" }
+dependencies = [{ name = "hpack" }]
+
+[[package]]
+name = "hpack"
+version = "4.0.0"
+source = { registry = "https://pypi.org/simple" }
+
+[[package]]
+name = "brotli"
+version = "1.1.0"
+source = { registry = "https://pypi.org/simple" }
+
+[[package]]
+name = "rich"
+version = "13.9.0"
+source = { registry = "https://pypi.org/simple" }
+
+[[package]]
+name = "pytest"
+version = "8.3.0"
+source = { registry = "https://pypi.org/simple" }
+
+[[package]]
+name = "orphan"
+version = "1.0.0"
+source = { registry = "https://pypi.org/simple" }
+"""
+
+
+class TestDependencyGraph:
+    """Test reachability and dependency chains over a lockfile's packages."""
+
+    def test_roots_are_workspace_members(self):
+        graph = UvLockFile.from_toml_str(WORKSPACE_UV_LOCK).dependency_graph
+
+        assert graph.roots == ["app", "worker"]
+
+    def test_chain_follows_requested_extras(self):
+        graph = UvLockFile.from_toml_str(WORKSPACE_UV_LOCK).dependency_graph
+
+        assert graph.chain("hpack") == ["app", "httpx", "h2", "hpack"]
+        assert graph.roots_reaching("hpack") == ["app", "worker"]
+
+    def test_unrequested_extras_are_not_followed(self):
+        graph = UvLockFile.from_toml_str(WORKSPACE_UV_LOCK).dependency_graph
+
+        assert graph.chain("brotli") == []
+        assert graph.roots_reaching("brotli") == []
+
+    def test_root_extras_and_groups_are_followed(self):
+        graph = UvLockFile.from_toml_str(WORKSPACE_UV_LOCK).dependency_graph
+
+        assert graph.chain("rich") == ["app", "rich"]
+        assert graph.chain("pytest") == ["app", "pytest"]
+        assert graph.roots_reaching("pytest") == ["app"]
+
+    def test_unknown_and_unreachable_packages(self):
+        graph = UvLockFile.from_toml_str(WORKSPACE_UV_LOCK).dependency_graph
+
+        assert graph.chain("missing") == []
+        assert graph.chain("orphan") == []
+        assert graph.roots_reaching("missing") == []
+
+    def test_roots_fall_back_to_packages_without_dependents(self):
+        lockfile = UvLockFile.model_validate(
+            {
+                "version": 1,
+                "revision": 3,
+                "requires-python": ">=3.13",
+                "package": [
+                    {"name": "a", "version": "1.0", "dependencies": [{"name": "b"}]},
+                    {"name": "b", "version": "1.0"},
+                ],
+            }
+        )
+
+        assert lockfile.dependency_graph.roots == ["a"]
+        assert lockfile.dependency_graph.chain("b") == ["a", "b"]
+
+    def test_added_attribution(self):
+        new_lockfile = UvLockFile.from_toml_str(WORKSPACE_UV_LOCK)
+        old_lockfile = UvLockFile.model_validate(
+            {
+                "version": 1,
+                "revision": 3,
+                "requires-python": ">=3.13",
+                "package": [
+                    {"name": pkg.name, "version": pkg.version, "source": pkg.source}
+                    for pkg in new_lockfile.packages
+                    if pkg.name not in {"h2", "hpack", "worker"}
+                ],
+            }
+        )
+
+        reporter = LockFileReporter(
+            old_lockfile=old_lockfile,
+            new_lockfile=new_lockfile,
+            output_format=OutputFormat.TABLE,
+            show_learn_more_link=False,
+        )
+
+        changes = reporter.get_changes()
+        # The added workspace member is its own root, so it is not attributed.
+        assert [(a.name, a.chain) for a in changes.added_attribution] == [
+            ("h2", ["app", "httpx", "h2"]),
+            ("hpack", ["app", "httpx", "h2", "hpack"]),
+        ]
+        assert changes.added_attribution[0].required_by == ["app", "worker"]
+        assert "| h2 | app, worker | app -> httpx -> h2 |" in changes.markdown
+
+
+# `pytest` of the `test` group also installs `rich` of the `cli` extra.
+GROUPS_UV_LOCK = WORKSPACE_UV_LOCK.replace(
+    'name = "pytest"\nversion = "8.3.0"\nsource = { registry = "https://pypi.org/simple" }\n',
+    'name = "pytest"\nversion = "8.3.0"\nsource = { registry = "https://pypi.org/simple" }\n'
+    'dependencies = [{ name = "iniconfig" }, { name = "rich" }]\n\n'
+    '[[package]]\nname = "iniconfig"\nversion = "2.0.0"\n'
+    'source = { registry = "https://pypi.org/simple" }\n',
+)
+
+
+class TestDependencyGroups:
+    """Test attribution of packages to the project's extras and dependency groups."""
+
+    def test_groups_reaching(self):
+        graph = UvLockFile.from_toml_str(GROUPS_UV_LOCK).dependency_graph
+
+        assert graph.groups_reaching("app") == ["production"]
+        assert graph.groups_reaching("hpack") == ["production"]
+        assert graph.groups_reaching("pytest") == ["group: test"]
+        assert graph.groups_reaching("iniconfig") == ["group: test"]
+        assert graph.groups_reaching("rich") == ["extra: cli", "group: test"]
+        assert graph.groups_reaching("orphan") == []
+        assert graph.groups_reaching("missing") == []
+
+    def test_member_groups_are_not_installed_by_dependents(self):
+        lockfile = UvLockFile.from_toml_str(
+            GROUPS_UV_LOCK.replace(
+                'dependencies = [{ name = "httpx" }]',
+                'dependencies = [{ name = "httpx" }]\n\n'
+                '[package.dev-dependencies]\nlint = [{ name = "orphan" }]',
+            ).replace(
+                '[package.dev-dependencies]\ntest = [{ name = "pytest" }]',
+                '[package.dev-dependencies]\ntest = [{ name = "pytest" }, { name = "worker" }]',
+            )
+        )
+
+        graph = lockfile.dependency_graph
+
+        assert graph.groups_reaching("worker") == ["production", "group: test"]
+        assert graph.groups_reaching("orphan") == ["group: lint"]
+
+    def test_group_sections(self):
+        new_lockfile = UvLockFile.from_toml_str(GROUPS_UV_LOCK)
+        old_lockfile = UvLockFile.from_toml_str(
+            GROUPS_UV_LOCK.replace('version = "8.3.0"', 'version = "8.2.0"')
+            .replace('version = "4.0.0"', 'version = "3.0.0"')
+            .replace('version = "13.9.0"', 'version = "13.8.0"')
+        )
+        reporter = LockFileReporter(
+            old_lockfile=old_lockfile,
+            new_lockfile=new_lockfile,
+            output_format=OutputFormat.SIMPLE,
+            show_learn_more_link=False,
+        )
+        changes = reporter.get_changes()
+
+        changes.package_groups = reporter.get_package_groups(changes)
+
+        assert changes.package_groups == {
+            "hpack": ["production"],
+            "rich": ["extra: cli", "group: test"],
+            "pytest": ["group: test"],
+        }
+        assert changes.markdown.split("\n") == [
+            "## uv Lockfile Report",
+            "### Production",
+            "#### Upgraded",
+            ":collision: \\`hpack\\`: \\`3.0.0\\` -> \\`4.0.0\\`",
+            "### Extra \\`cli\\`, Group \\`test\\`",
+            "#### Upgraded",
+            ":sparkles: \\`rich\\`: \\`13.8.0\\` -> \\`13.9.0\\`",
+            "### Group \\`test\\`",
+            "#### Upgraded",
+            ":sparkles: \\`pytest\\`: \\`8.2.0\\` -> \\`8.3.0\\`",
+        ]
@@ -0,0 +1,168 @@
+import pytest
+
+from uv_lock_report.models import (
+    LockfileChanges,
+    LockfilePackage,
+    LockFileReporter,
+    OutputFormat,
+    SizeChange,
+    format_size,
+)
+from uv_lock_report.wheels import wheel_tag
+
+from .conftest import make_lockfile
+
+FILES = "https://files.pythonhosted.org/packages/ab/cd"
+
+
+def torch_package(version: str, linux_size: int, mac_size: int) -> dict:
+    return {
+        "name": "torch",
+        "version": version,
+        "source": {"registry": "https://pypi.org/simple"},
+        "wheels": [
+            {
+                "url": f"{FILES}/torch-{version}-cp313-cp313-manylinux_2_28_x86_64.whl",
+                "hash": f"sha256:{version}-linux",
+                "size": linux_size,
+            },
+            {
+                "url": f"{FILES}/torch-{version}-cp313-none-macosx_11_0_arm64.whl",
+                "hash": f"sha256:{version}-mac",
+                "size": mac_size,
+            },
+        ],
+    }
+
+
+SIX = {
+    "name": "six",
+    "version": "1.17.0",
+    "source": {"registry": "https://pypi.org/simple"},
+    "sdist": {"url": f"{FILES}/six-1.17.0.tar.gz", "hash": "sha256:a", "size": 34031},
+    "wheels": [
+        {
+            "url": f"{FILES}/six-1.17.0-py2.py3-none-any.whl",
+            "hash": "sha256:b",
+            "size": 11050,
+        }
+    ],
+}
+
+
+class TestArtifactSizes:
+    def test_wheel_tag(self):
+        assert (
+            wheel_tag(f"{FILES}/numpy-2.1.0-cp313-cp313-manylinux_2_17_x86_64.whl")
+            == "cp313-cp313-manylinux_2_17_x86_64"
+        )
+        assert wheel_tag("pkg-1.0-1-py3-none-any.whl") == "py3-none-any"
+
+    def test_sizes_are_read_with_the_package(self):
+        package = LockfilePackage.model_validate(SIX)
+
+        assert package.artifact_sizes == {"sdist": 34031, "py2.py3-none-any": 11050}
+        assert "artifact_sizes" not in package.model_dump()
+
+    def test_download_size(self):
+        torch = LockfilePackage.model_validate(torch_package("2.5.0", 900, 70))
+        six = LockfilePackage.model_validate(SIX)
+
+        assert torch.download_size() == 900
+        assert torch.download_size("macosx_*_arm64") == 70
+        assert torch.download_size("win_amd64") is None
+        assert six.download_size("win_amd64") == 11050
+        assert LockfilePackage(name="project").download_size() is None
+
+    def test_sdist_only(self):
+        package = LockfilePackage.model_validate({**SIX, "wheels": []})
+
+        assert package.download_size("manylinux*") == 34031
+
+
+class TestFormatSize:
+    @pytest.mark.parametrize(
+        "num_bytes,signed,expected",
+        [
+            (0, True, "0 B"),
+            (999, False, "999 B"),
+            (38_000_000, True, "+38.0 MB"),
+            (-1_500, True, "-1.5 kB"),
+            (2_400_000_000, False, "2.4 GB"),
+        ],
+    )
+    def test_format_size(self, num_bytes, signed, expected):
+        assert format_size(num_bytes, signed=signed) == expected
+
+
+class TestSizeChanges:
+    @pytest.fixture
+    def reporter(self):
+        return LockFileReporter(
+            old_lockfile=make_lockfile(
+                torch_package("2.4.0", 800_000_000, 60_000_000), SIX
+            ),
+            new_lockfile=make_lockfile(
+                torch_package("2.5.0", 838_000_000, 61_000_000),
+                {**SIX, "name": "six-fork"},
+            ),
+            output_format=OutputFormat.SIMPLE,
+            show_learn_more_link=False,
+        )
+
+    def test_get_size_changes(self, reporter):
+        assert reporter.get_size_changes() == [
+            SizeChange(name="torch", old_size=800_000_000, new_size=838_000_000),
+            SizeChange(name="six", old_size=11050, new_size=None),
+            SizeChange(name="six-fork", old_size=None, new_size=11050),
+        ]
+
+    def test_platform_tag(self, reporter):
+        assert reporter.get_size_changes("macosx_*")[0] == SizeChange(
+            name="torch", old_size=60_000_000, new_size=61_000_000
+        )
+
+    def test_unchanged_artifacts_are_skipped(self):
+        reporter = LockFileReporter(
+            old_lockfile=make_lockfile(SIX),
+            new_lockfile=make_lockfile(SIX),
+            output_format=OutputFormat.SIMPLE,
+            show_learn_more_link=False,
+        )
+
+        assert reporter.get_size_changes() == []
+
+    def test_markdown(self, reporter):
+        changes = LockfileChanges(
+            requires_python={"old": ">=3.13", "new": ">=3.13"},
+            size_changes=reporter.get_size_changes("manylinux*"),
+            size_platform="manylinux*",
+            output_format=OutputFormat.SIMPLE,
+            show_learn_more_link=False,
+        )
+
+        assert changes.markdown_simple.splitlines()[1:] == [
+            "### Download Size (\\`manylinux*\\`)",
+            "\\`torch\\`: 800.0 MB -> 838.0 MB (+38.0 MB)",
+            "\\`six\\`: 11.1 kB -> none (-11.1 kB)",
+            "\\`six-fork\\`: none -> 11.1 kB (+11.1 kB)",
+            "Total: +38.0 MB, mostly \\`torch\\`",
+        ]
+        assert "| torch | 800.0 MB | 838.0 MB | +38.0 MB |" in changes.markdown_table
+
+    def test_no_dominant_package(self):
+        changes = LockfileChanges(
+            requires_python={"old": None, "new": None},
+            size_changes=[
+                SizeChange(name="a", old_size=0, new_size=40),
+                SizeChange(name="b", old_size=0, new_size=40),
+                SizeChange(name="c", old_size=40, new_size=0),
+            ],
+            output_format=OutputFormat.TABLE,
+            show_learn_more_link=False,
+        )
+
+        assert changes.size_summary == "Total: +40 B, mostly \\`a\\`"
+
+        changes.size_changes.append(SizeChange(name="d", old_size=0, new_size=40))
+        assert changes.size_summary == "Total: +80 B"
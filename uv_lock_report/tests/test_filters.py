@@ -0,0 +1,61 @@
+import pytest
+
+from uv_lock_report.filters import PackageFilter, compile_patterns
+
+
+class TestPackageFilter:
+    def test_no_patterns(self):
+        package_filter = PackageFilter()
+
+        assert not package_filter
+        assert compile_patterns([]) is None
+        assert package_filter.includes("django")
+
+    @pytest.mark.parametrize(
+        "name,included",
+        [
+            ("acme-core", False),
+            ("ACME-Utils", False),
+            ("acme", True),
+            ("internal-build-tools", False),
+            ("django", True),
+        ],
+    )
+    def test_ignore(self, name, included):
+        package_filter = PackageFilter(ignore=["acme-*", "re:internal-.+-tools"])
+
+        assert package_filter
+        assert package_filter.includes(name) is included
+
+    def test_only(self):
+        package_filter = PackageFilter(only=["django*", "re:h[0-9]$"])
+
+        assert package_filter.filter_names(
+            {"django", "django-stubs", "h2", "h2o", "httpx"}
+        ) == {"django", "django-stubs", "h2"}
+
+    def test_ignore_takes_precedence(self):
+        package_filter = PackageFilter(ignore=["*-stubs"], only=["django*"])
+
+        assert package_filter.filter_names({"django", "django-stubs"}) == {"django"}
+
+    @pytest.mark.parametrize("name", ["acme-core", "acme_core", "Acme.Core"])
+    def test_names_and_globs_are_canonicalized(self, name):
+        assert not PackageFilter(ignore=["acme_*"]).includes(name)
+        assert not PackageFilter(ignore=["ACME.core"]).includes(name)
+
+    def test_regexes_are_compiled_separately(self):
+        package_filter = PackageFilter(
+            only=["re:(?P<word>[a-z]+)-(?P=word)$", "re:(?x) py test", "django"]
+        )
+
+        assert package_filter.filter_names(
+            {"foo-foo", "foo-bar", "pytest", "django", "flask"}
+        ) == {"foo-foo", "pytest", "django"}
+        assert len(compile_patterns(["a*", "b*", "re:c", "re:d"])) == 3
+
+    def test_globs_match_whole_name(self):
+        package_filter = PackageFilter(ignore=["acme"])
+
+        assert not package_filter.includes("acme")
+        assert package_filter.includes("acme-core")
@@ -0,0 +1,169 @@
+import pytest
+
+from uv_lock_report.cli import main
+from uv_lock_report.fleet import FleetIndex, discover_repos, list_lockfile_blobs
+from uv_lock_report.report import parsed_lockfiles
+
+from .conftest import GitRepo, lockfile_toml
+
+
+@pytest.fixture
+def fleet(tmp_path):
+    root = tmp_path / "clones"
+    repos = {}
+    for name, versions in [
+        ("api", {"django": "4.2.0", "Requests": "2.31.0"}),
+        ("web", {"django": "5.0.0"}),
+        ("worker", {"requests": "2.28.0"}),
+    ]:
+        (root / name).mkdir(parents=True)
+        repos[name] = GitRepo(root / name)
+        repos[name].commit_lockfile(lockfile_toml(**versions))
+    return root, repos
+
+
+@pytest.fixture
+def fleet_index(tmp_path):
+    fleet_index = FleetIndex(tmp_path / "fleet.sqlite")
+    yield fleet_index
+    fleet_index.close()
+
+
+def locations(entries) -> list[tuple[str, str, str]]:
+    return [
+        (entry.repo.rsplit("/", 1)[-1], entry.path, entry.version) for entry in entries
+    ]
+
+
+class TestFleetIndex:
+    def test_discover_repos(self, fleet):
+        root, _ = fleet
+
+        assert list(discover_repos([root])) == [
+            root / "api",
+            root / "web",
+            root / "worker",
+        ]
+        assert list(discover_repos([root / "web"])) == [root / "web"]
+
+    def test_list_lockfile_blobs(self, fleet):
+        _, repos = fleet
+        api = repos["api"]
+        (api.path / "services" / "uv.lock").parent.mkdir()
+        (api.path / "services" / "uv.lock").write_text(lockfile_toml(httpx="0.28.0"))
+        api.git("add", "services/uv.lock")
+        api.git("commit", "--quiet", "-m", "Add nested lockfile")
+
+        assert sorted(list_lockfile_blobs(api.path)) == ["services/uv.lock", "uv.lock"]
+
+    def test_lookup(self, fleet, fleet_index):
+        root, _ = fleet
+
+        assert fleet_index.index([root]) == 3
+        assert locations(fleet_index.lookup("requests")) == [
+            ("api", "uv.lock", "2.31.0"),
+            ("worker", "uv.lock", "2.28.0"),
+        ]
+        assert locations(fleet_index.lookup("Django", version="5.0.0")) == [
+            ("web", "uv.lock", "5.0.0")
+        ]
+        assert locations(fleet_index.lookup("requests", specifier="<2.31")) == [
+            ("worker", "uv.lock", "2.28.0")
+        ]
+        assert fleet_index.lookup("flask") == []
+
+    def test_incremental_reindex(self, fleet, fleet_index):
+        root, repos = fleet
+        fleet_index.index([root])
+
+        assert fleet_index.index([root]) == 0
+
+        repos["web"].commit_lockfile(lockfile_toml(django="5.0.1"))
+        parsed_lockfiles.clear()
+
+        assert fleet_index.index([root]) == 1
+        assert len(parsed_lockfiles) == 1
+        assert locations(fleet_index.lookup("django")) == [
+            ("api", "uv.lock", "4.2.0"),
+            ("web", "uv.lock", "5.0.1"),
+        ]
+
+    def test_removed_lockfile_is_dropped(self, fleet, fleet_index):
+        root, repos = fleet
+        fleet_index.index([root])
+
+        repos["worker"].git("rm", "--quiet", "uv.lock")
+        repos["worker"].git("commit", "--quiet", "-m", "Drop uv.lock")
+        fleet_index.index([root])
+
+        assert locations(fleet_index.lookup("requests")) == [
+            ("api", "uv.lock", "2.31.0")
+        ]
+
+    def test_unreadable_lockfile_is_skipped(self, fleet, fleet_index):
+        root, repos = fleet
+        api = repos["api"]
+        (api.path / "services").mkdir()
+        (api.path / "services" / "uv.lock").write_text("not = [toml")
+        api.git("add", "services/uv.lock")
+        api.git("commit", "--quiet", "-m", "Add a broken lockfile")
+
+        assert fleet_index.index([root]) == 3
+        assert [failure.split(": ")[0] for failure in fleet_index.failures] == [
+            f"{api.path.resolve()}/services/uv.lock"
+        ]
+        assert locations(fleet_index.lookup("requests")) == [
+            ("api", "uv.lock", "2.31.0"),
+            ("worker", "uv.lock", "2.28.0"),
+        ]
+
+    def test_unreadable_update_keeps_the_indexed_version(self, fleet, fleet_index):
+        root, repos = fleet
+        fleet_index.index([root])
+
+        repos["web"].commit_lockfile("not = [toml")
+        fleet_index.index([root])
+
+        assert len(fleet_index.failures) == 1
+        assert locations(fleet_index.lookup("django", version="5.0.0")) == [
+            ("web", "uv.lock", "5.0.0")
+        ]
+
+    def test_unlistable_repo_keeps_its_entries(self, fleet, fleet_index):
+        root, repos = fleet
+        fleet_index.index([root])
+
+        repos["worker"].git("checkout", "--quiet", "--orphan", "unborn")
+        assert list_lockfile_blobs(repos["worker"].path) is None
+        fleet_index.index([root])
+
+        assert fleet_index.failures == [
+            f"{repos['worker'].path.resolve()}: HEAD tree cannot be listed"
+        ]
+        assert locations(fleet_index.lookup("requests", version="2.28.0")) == [
+            ("worker", "uv.lock", "2.28.0")
+        ]
+
+    def test_fleet_cli(self, fleet, tmp_path, capsys):
+        root, _ = fleet
+        index_db = str(tmp_path / "fleet.sqlite")
+
+        assert main(["fleet", "--index-db", index_db, "index", str(root)]) == 0
+        assert (
+            main(
+                [
+                    "fleet",
+                    "--index-db",
+                    index_db,
+                    "lookup",
+                    "django",
+                    "--version",
+                    "4.2.0",
+                ]
+            )
+            == 0
+        )
+        assert capsys.readouterr().out.splitlines() == [
+            "Indexed 3 changed lockfiles",
+            f"{(root / 'api').resolve()}/uv.lock: 4.2.0",
+        ]
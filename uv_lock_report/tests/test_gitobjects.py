@@ -0,0 +1,167 @@
+import subprocess
+
+import pytest
+
+from uv_lock_report.gitobjects import (
+    GitObjectReader,
+    UnsupportedGitObject,
+    apply_delta,
+    open_reader,
+)
+from uv_lock_report.report import get_uv_lock_file_at, parsed_lockfiles, resolve_commit
+
+from .conftest import lockfile_toml
+
+
+@pytest.fixture
+def history_lockfiles() -> list[str]:
+    # Enough shared content between versions for git to store them as deltas.
+    return [
+        lockfile_toml(**{f"package-{i}": f"1.{i}.{n}" for i in range(40)})
+        for n in range(5)
+    ]
+
+
+@pytest.fixture
+def refs(git_repo, history):
+    git_repo.git("tag", "-a", "v1.0.0", "-m", "Release", history[1])
+    git_repo.git("tag", "light", history[2])
+    git_repo.git("branch", "feature", history[3])
+    return git_repo, history
+
+
+def reader_for(git_repo) -> GitObjectReader:
+    reader = GitObjectReader.open(str(git_repo.path))
+    assert reader is not None
+    return reader
+
+
+class TestGitObjectReader:
+    @pytest.mark.parametrize("packed", [False, True])
+    def test_matches_git(self, refs, packed):
+        git_repo, _ = refs
+        if packed:
+            git_repo.git("gc", "--quiet", "--aggressive")
+            assert not list((git_repo.path / ".git" / "refs" / "heads").iterdir())
+        reader = reader_for(git_repo)
+
+        for rev in ("HEAD", "main", "feature", "v1.0.0", "light", "HEAD~1"):
+            if rev == "HEAD~1":
+                with pytest.raises(UnsupportedGitObject):
+                    reader.blob_id(rev, "uv.lock")
+                continue
+            blob_id = git_repo.git("rev-parse", f"{rev}:uv.lock")
+            assert reader.blob_id(rev, "uv.lock") == blob_id
+            assert (
+                reader.read_blob(blob_id).decode()
+                == git_repo.git("cat-file", "blob", blob_id) + "\n"
+            )
+            assert reader.resolve_commit(rev) == git_repo.git(
+                "rev-parse", f"{rev}^{{commit}}"
+            )
+
+    def test_packs_written_after_open_are_found(self, refs):
+        git_repo, commits = refs
+        reader = reader_for(git_repo)
+        reader.blob_id("HEAD", "uv.lock")
+
+        git_repo.git("gc", "--quiet")
+        commit = git_repo.commit_lockfile(lockfile_toml(django="5.0.0"))
+        git_repo.git("gc", "--quiet")
+
+        assert reader.resolve_commit("main") == commit
+        assert reader.blob_id(commits[0], "uv.lock") == git_repo.git(
+            "rev-parse", f"{commits[0]}:uv.lock"
+        )
+
+    def test_missing_path_and_object(self, refs):
+        git_repo, _ = refs
+        reader = reader_for(git_repo)
+
+        assert reader.blob_id("HEAD", "missing.lock") is None
+        assert reader.blob_id("HEAD", "uv.lock/nested") is None
+        with pytest.raises(UnsupportedGitObject):
+            reader.blob_id("0" * 40, "uv.lock")
+        with pytest.raises(UnsupportedGitObject):
+            reader.blob_id("no-such-branch", "uv.lock")
+
+    def test_nested_path(self, git_repo):
+        (git_repo.path / "app").mkdir()
+        (git_repo.path / "app" / "uv.lock").write_text(lockfile_toml(h2="4.1.0"))
+        git_repo.git("add", "app/uv.lock")
+        git_repo.git("commit", "--quiet", "-m", "Nested")
+
+        assert reader_for(git_repo).blob_id("HEAD", "app/uv.lock") == git_repo.git(
+            "rev-parse", "HEAD:app/uv.lock"
+        )
+
+    def test_linked_worktree(self, refs, tmp_path):
+        git_repo, commits = refs
+        worktree = tmp_path / "worktree"
+        git_repo.git("worktree", "add", "--quiet", str(worktree), "feature")
+
+        reader = GitObjectReader.open(str(worktree))
+
+        assert reader is not None
+        assert reader.resolve_commit("HEAD") == commits[3]
+
+    def test_outside_a_repository(self, tmp_path):
+        assert GitObjectReader.open(str(tmp_path)) is None
+
+    def test_git_dir_environment(self, refs, monkeypatch):
+        git_repo, _ = refs
+        monkeypatch.setenv("GIT_DIR", str(git_repo.path / ".git"))
+
+        assert GitObjectReader.open(str(git_repo.path)) is None
+
+    def test_disabled(self, refs, monkeypatch):
+        git_repo, _ = refs
+        monkeypatch.setenv("UV_LOCK_REPORT_DISABLE_GIT_READER", "1")
+
+        assert GitObjectReader.open(str(git_repo.path)) is None
+
+    def test_apply_delta(self):
+        base = b"0123456789"
+        # Source and target sizes, copy base[2:6], insert "ab", copy base[8:].
+        delta = bytes([10, 8, 0x91, 2, 4, 2]) + b"ab" + bytes([0x91, 8, 2])
+
+        assert apply_delta(base, delta) == b"2345ab89"
+        with pytest.raises(UnsupportedGitObject):
+            apply_delta(b"short", delta)
+
+
+class TestReportWithoutGit:
+    def test_lockfiles_are_read_in_process(self, refs, monkeypatch):
+        git_repo, commits = refs
+        git_repo.git("gc", "--quiet")
+        parsed_lockfiles.clear()
+        open_reader.cache_clear()
+
+        def run(*args, **kwargs):
+            raise AssertionError("git should not be run")
+
+        monkeypatch.setattr(subprocess, "run", run)
+
+        lockfile = get_uv_lock_file_at("v1.0.0", str(git_repo.path))
+
+        assert lockfile is not None
+        assert lockfile.packages_by_name["package-1"].version == "1.1.1"
+        assert resolve_commit("feature", str(git_repo.path)) == commits[3]
+
+    def test_falls_back_to_git(self, refs, monkeypatch):
+        git_repo, _ = refs
+        parsed_lockfiles.clear()
+        open_reader.cache_clear()
+        calls = []
+        run = subprocess.run
+        monkeypatch.setattr(
+            subprocess,
+            "run",
+            lambda *args, **kwargs: calls.append(args[0]) or run(*args, **kwargs),
+        )
+
+        lockfile = get_uv_lock_file_at("HEAD~4", str(git_repo.path))
+
+        assert lockfile is not None
+        assert lockfile.packages_by_name["package-1"].version == "1.1.0"
+        assert calls == [["git", "rev-parse", "--verify", "--quiet", "HEAD~4:uv.lock"]]
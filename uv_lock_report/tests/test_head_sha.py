@@ -0,0 +1,90 @@
+import json
+import subprocess
+
+from uv_lock_report.cli import main
+from uv_lock_report.history import HistoryStore
+from uv_lock_report.report import ReportOptions, report
+
+from .conftest import lockfile_toml
+
+
+class TestHeadSha:
+    def test_bare_clone(self, git_repo, tmp_path):
+        base = git_repo.commit_lockfile(lockfile_toml(django="4.2.0"))
+        git_repo.git("checkout", "--quiet", "-b", "feature")
+        head = git_repo.commit_lockfile(lockfile_toml(django="5.0.0", h2="4.1.0"))
+        bare = tmp_path / "bare.git"
+        subprocess.run(
+            ["git", "clone", "--quiet", "--bare", str(git_repo.path), str(bare)],
+            check=True,
+        )
+
+        changes = report(
+            base_sha=base,
+            base_path=str(bare),
+            options=ReportOptions(head_sha="feature"),
+        )
+
+        assert [pkg.name for pkg in changes.updated] == ["django"]
+        assert [pkg.name for pkg in changes.added] == ["h2"]
+
+        history_db = tmp_path / "history.sqlite"
+        report(
+            base_sha=base,
+            base_path=str(bare),
+            options=ReportOptions(
+                head_sha="feature", history_db=str(history_db), repo_name="app"
+            ),
+        )
+        store = HistoryStore(history_db)
+        assert store.version_at("app", "h2", head) == "4.1.0"
+        store.close()
+
+    def test_working_tree_is_ignored(self, git_repo):
+        base = git_repo.commit_lockfile(lockfile_toml(django="4.2.0"))
+        (git_repo.path / "uv.lock").write_text(lockfile_toml(django="5.0.0"))
+
+        changes = report(
+            base_sha=base,
+            base_path=str(git_repo.path),
+            options=ReportOptions(head_sha="HEAD"),
+        )
+
+        assert changes.items == 0
+
+    def test_missing_head_lockfile(self, git_repo, capsys):
+        base = git_repo.commit_lockfile(lockfile_toml(django="4.2.0"))
+        git_repo.git("rm", "--quiet", "uv.lock")
+        git_repo.git("commit", "--quiet", "-m", "Remove uv.lock")
+
+        changes = report(
+            base_sha=base,
+            base_path=str(git_repo.path),
+            options=ReportOptions(head_sha="HEAD"),
+        )
+
+        assert [pkg.name for pkg in changes.removed] == ["django"]
+        assert "uv.lock not found in HEAD" in capsys.readouterr().out
+
+    def test_cli(self, git_repo, tmp_path):
+        base = git_repo.commit_lockfile(lockfile_toml(django="4.2.0"))
+        head = git_repo.commit_lockfile(lockfile_toml(django="5.0.0"))
+        git_repo.git("checkout", "--quiet", base)
+        output = tmp_path / "report.json"
+
+        assert (
+            main(
+                [
+                    "--base-sha",
+                    base,
+                    "--head-sha",
+                    head,
+                    "--base-path",
+                    str(git_repo.path),
+                    "--output-path",
+                    str(output),
+                ]
+            )
+            == 0
+        )
+        assert json.loads(output.read_text())["updated"][0]["new_version"] == "5.0.0"
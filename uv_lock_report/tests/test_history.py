@@ -0,0 +1,240 @@
+import pytest
+
+from uv_lock_report import history
+from uv_lock_report.cli import main
+from uv_lock_report.history import HistoryStore
+from uv_lock_report.models import (
+    LockfileChanges,
+    LockfilePackage,
+    OutputFormat,
+    RequiresPythonChanges,
+)
+from uv_lock_report.report import ReportOptions, report
+
+from .conftest import lockfile_toml, make_lockfile
+
+COMMITS = [
+    ("a" * 40, make_lockfile(django="4.2.0", httpx="0.27.0", anyio="4.0.0")),
+    ("b" * 40, make_lockfile(django="4.2.0", httpx="0.28.0", anyio="4.0.0")),
+    ("c" * 40, make_lockfile(django="5.0.0", httpx="0.28.0", anyio="4.0.0")),
+    ("d" * 40, make_lockfile(django="5.0.0", httpx="0.28.0")),
+    ("e" * 40, make_lockfile(django="5.0.1", httpx="0.28.0", h2="4.1.0")),
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(tmp_path / "history.sqlite")
+    parent = None
+    for commit, lockfile in COMMITS:
+        store.record_snapshot("app", commit, lockfile, parent)
+        parent = commit
+    yield store
+    store.close()
+
+
+class TestHistoryStore:
+    def test_snapshots_store_deltas(self, store):
+        rows_per_snapshot = store.connection.execute(
+            "SELECT snapshot_id, COUNT(*) FROM snapshot_packages GROUP BY snapshot_id"
+        ).fetchall()
+
+        assert [count for _, count in rows_per_snapshot] == [3, 1, 1, 1, 2]
+
+    @pytest.mark.parametrize(
+        "commit,expected",
+        [
+            ("a" * 40, "4.2.0"),
+            ("b" * 40, "4.2.0"),
+            ("c" * 40, "5.0.0"),
+            ("e" * 40, "5.0.1"),
+        ],
+    )
+    def test_version_at(self, store, commit, expected):
+        assert store.version_at("app", "django", commit) == expected
+
+    def test_version_at_removed_and_unknown_packages(self, store):
+        assert store.version_at("app", "anyio", "c" * 40) == "4.0.0"
+        assert store.version_at("app", "anyio", "d" * 40) is None
+        assert store.version_at("app", "h2", "a" * 40) is None
+
+    def test_abbreviated_and_unknown_commits(self, store):
+        assert store.version_at("app", "httpx", "bbbbbbb") == "0.28.0"
+        with pytest.raises(KeyError):
+            store.version_at("app", "httpx", "f" * 7)
+        with pytest.raises(KeyError):
+            store.version_at("other-repo", "httpx", "b" * 40)
+
+    def test_packages_at(self, store):
+        assert store.packages_at("app", "e" * 40) == {
+            "django": "5.0.1",
+            "httpx": "0.28.0",
+            "h2": "4.1.0",
+        }
+
+    def test_last_bump(self, store):
+        bump = store.last_bump("app", "django")
+
+        assert bump is not None
+        assert bump.commit_sha == "e" * 40
+        assert (bump.old_version, bump.new_version) == ("5.0.0", "5.0.1")
+        assert store.last_bump("app", "missing") is None
+
+    def test_first_snapshot_is_a_baseline(self, store):
+        assert store.last_bump("app", "anyio").commit_sha == "d" * 40
+        assert store.last_bump("app", "django", "b" * 40) is None
+
+    def test_deltas_follow_ancestry(self, store):
+        # A branch off `b` recorded after `e`: compared to `e` it would
+        # downgrade django and drop h2.
+        branch = "f" * 40
+        store.record_snapshot(
+            "app",
+            branch,
+            make_lockfile(django="4.2.0", httpx="0.28.1", anyio="4.0.0"),
+            parent="b" * 40,
+        )
+
+        assert store.last_bump("app", "django", branch) is None
+        assert store.last_bump("app", "h2", branch) is None
+        bump = store.last_bump("app", "httpx", branch)
+        assert (bump.commit_sha, bump.old_version) == (branch, "0.28.0")
+        assert store.last_bump("app", "django", "e" * 40).commit_sha == "e" * 40
+        assert store.packages_at("app", branch)["httpx"] == "0.28.1"
+
+    def test_unrecorded_parent_is_a_baseline(self, store):
+        store.record_snapshot(
+            "app", "0" * 40, make_lockfile(django="6.0.0"), parent="9" * 40
+        )
+
+        assert store.last_bump("app", "django", "0" * 40) is None
+        assert store.version_at("app", "django", "0" * 40) == "6.0.0"
+
+    def test_every_fork_is_recorded(self, store):
+        def forked(old_fork_version: str):
+            return make_lockfile(
+                *(
+                    {
+                        "name": "numpy",
+                        "version": version,
+                        "resolution-markers": [marker],
+                    }
+                    for version, marker in [
+                        (old_fork_version, "python_full_version < '3.11'"),
+                        ("2.1.0", "python_full_version >= '3.11'"),
+                    ]
+                )
+            )
+
+        store.record_snapshot("app", "1" * 40, forked("1.26.3"), parent="e" * 40)
+        store.record_snapshot("app", "2" * 40, forked("1.26.4"), parent="1" * 40)
+
+        assert store.version_at("app", "numpy", "1" * 40) == "1.26.3, 2.1.0"
+        bump = store.last_bump("app", "numpy")
+        assert bump is not None
+        assert (bump.commit_sha, bump.old_version, bump.new_version) == (
+            "2" * 40,
+            "1.26.3, 2.1.0",
+            "1.26.4, 2.1.0",
+        )
+
+    def test_drift(self, store):
+        drift = store.drift("app", "a" * 40, "e" * 40)
+
+        assert [(d.name, d.version_a, d.version_b) for d in drift] == [
+            ("anyio", "4.0.0", None),
+            ("django", "4.2.0", "5.0.1"),
+            ("h2", None, "4.1.0"),
+            ("httpx", "0.27.0", "0.28.0"),
+        ]
+
+    def test_keyframes_bound_the_delta_chain(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(history, "KEYFRAME_INTERVAL", 2)
+        store = HistoryStore(tmp_path / "history.sqlite")
+        parent = None
+        for commit, lockfile in COMMITS:
+            store.record_snapshot("app", commit, lockfile, parent)
+            parent = commit
+
+        depths = [
+            depth
+            for (depth,) in store.connection.execute(
+                "SELECT depth FROM snapshots ORDER BY id"
+            )
+        ]
+        assert depths == [0, 1, 0, 1, 0]
+        assert store.packages_at("app", "d" * 40) == {
+            "django": "5.0.0",
+            "httpx": "0.28.0",
+        }
+        assert store.last_bump("app", "httpx").commit_sha == "b" * 40
+
+    def test_recording_a_commit_twice_is_a_noop(self, store):
+        snapshot_id = store.record_snapshot("app", "e" * 40, make_lockfile())
+
+        assert store.version_at("app", "django", "e" * 40) == "5.0.1"
+        assert snapshot_id == 5
+
+    def test_reports(self, store):
+        changes = LockfileChanges(
+            requires_python=RequiresPythonChanges(old=">=3.13", new=">=3.13"),
+            added=[LockfilePackage(name="h2", version="4.1.0")],
+            output_format=OutputFormat.SIMPLE,
+            show_learn_more_link=False,
+        )
+
+        store.record_report("app", "e" * 40, changes, base_sha="d" * 40)
+
+        assert store.reports("app", "e" * 40) == [changes]
+        assert store.reports("app", "d" * 40) == []
+
+
+class TestHistoryCli:
+    def test_queries(self, store, tmp_path, capsys):
+        db = str(tmp_path / "history.sqlite")
+        args = ["history", "--history-db", db, "--repo-name", "app"]
+
+        assert main([*args, "version-at", "httpx", "aaaaaaa"]) == 0
+        assert main([*args, "last-bump", "django"]) == 0
+        assert main([*args, "last-bump", "django", "--at", "ddddddd"]) == 0
+        assert main([*args, "drift", "ccccccc", "ddddddd"]) == 0
+
+        assert capsys.readouterr().out.splitlines() == [
+            "0.27.0",
+            f"{'e' * 40}: 5.0.0 -> 5.0.1",
+            f"{'c' * 40}: 4.2.0 -> 5.0.0",
+            "anyio: 4.0.0 -> None",
+        ]
+
+    def test_unknown_commit(self, store, tmp_path, capsys):
+        db = str(tmp_path / "history.sqlite")
+
+        exit_code = main(
+            ["history", "--history-db", db, "--repo-name", "app"]
+            + ["version-at", "httpx", "0000000"]
+        )
+
+        assert exit_code == 1
+        assert "No snapshot recorded" in capsys.readouterr().err
+
+
+class TestReportHistory:
+    def test_report_records_snapshots_and_report(self, git_repo, tmp_path):
+        base_sha = git_repo.commit_lockfile(lockfile_toml(django="4.2.0"))
+        head_sha = git_repo.commit_lockfile(lockfile_toml(django="5.0.0"))
+        db = tmp_path / "history.sqlite"
+
+        report(
+            base_sha=base_sha,
+            base_path=str(git_repo.path),
+            output_path=str(tmp_path / "report.json"),
+            options=ReportOptions(history_db=str(db), repo_name="app"),
+        )
+
+        store = HistoryStore(db)
+        assert store.version_at("app", "django", base_sha) == "4.2.0"
+        assert store.version_at("app", "django", head_sha) == "5.0.0"
+        [changes] = store.reports("app", head_sha)
+        assert [pkg.name for pkg in changes.updated] == ["django"]
+        # The base is an ancestor of the head, so the head is a delta against it.
+        assert store.last_bump("app", "django").commit_sha == head_sha
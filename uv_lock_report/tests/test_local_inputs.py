@@ -0,0 +1,115 @@
+import io
+import json
+import subprocess
+
+import pytest
+
+from uv_lock_report.cli import main
+from uv_lock_report.report import ReportOptions, read_uv_lock_bytes, report
+
+from .conftest import lockfile_toml
+
+
+@pytest.fixture
+def no_git(monkeypatch):
+    def run(*args, **kwargs):
+        raise AssertionError("git should not be run")
+
+    monkeypatch.setattr(subprocess, "run", run)
+
+
+@pytest.fixture
+def stdin(monkeypatch):
+    def feed(content: str) -> None:
+        monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(content.encode())))
+
+    return feed
+
+
+class TestReadUvLockBytes:
+    def test_path(self, tmp_path):
+        path = tmp_path / "old.lock"
+        path.write_text(lockfile_toml(django="4.2.0"))
+
+        assert read_uv_lock_bytes(path) == lockfile_toml(django="4.2.0").encode()
+        assert read_uv_lock_bytes(str(path)) == read_uv_lock_bytes(path)
+
+    def test_bytes(self):
+        content = lockfile_toml(httpx="0.27.0").encode()
+
+        assert read_uv_lock_bytes(content) is content
+
+    def test_stdin(self, stdin):
+        stdin(lockfile_toml(h2="4.1.0"))
+
+        assert read_uv_lock_bytes("-") == lockfile_toml(h2="4.1.0").encode()
+
+    def test_missing_path(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            read_uv_lock_bytes(tmp_path / "missing.lock")
+
+
+class TestLocalInputs:
+    def test_report_without_git(self, tmp_path, no_git):
+        old = tmp_path / "old.lock"
+        old.write_text(lockfile_toml(django="4.2.0", httpx="0.27.0"))
+
+        changes = report(
+            output_path=str(tmp_path / "report.json"),
+            options=ReportOptions(
+                old_source=old, new_source=lockfile_toml(django="5.0.0").encode()
+            ),
+        )
+
+        assert [pkg.name for pkg in changes.updated] == ["django"]
+        assert [pkg.name for pkg in changes.removed] == ["httpx"]
+        assert json.loads((tmp_path / "report.json").read_text())["items"] == 2
+
+    def test_report_needs_a_base(self):
+        with pytest.raises(ValueError):
+            report(options=ReportOptions(new_source=b""))
+
+    def test_old_path_with_git_head(self, git_repo, tmp_path):
+        git_repo.commit_lockfile(lockfile_toml(django="4.2.0"))
+        old = tmp_path / "old.lock"
+        old.write_text(lockfile_toml(django="3.2.0"))
+
+        changes = report(
+            base_path=str(git_repo.path),
+            options=ReportOptions(old_source=old, additional_base_shas=["HEAD"]),
+        )
+
+        assert changes.updated[0].old_version == "3.2.0"
+        assert changes.comparisons[0].changes.items == 0
+
+    def test_cli(self, tmp_path, stdin, no_git):
+        old = tmp_path / "old.lock"
+        old.write_text(lockfile_toml(django="4.2.0"))
+        stdin(lockfile_toml(django="5.0.0"))
+        output = tmp_path / "report.json"
+
+        assert (
+            main(
+                [
+                    "--old-path",
+                    str(old),
+                    "--new-path",
+                    "-",
+                    "--output-path",
+                    str(output),
+                ]
+            )
+            == 0
+        )
+        assert json.loads(output.read_text())["updated"][0]["name"] == "django"
+
+    @pytest.mark.parametrize(
+        "argv,error",
+        [
+            (["--new-path", "new.lock"], "One of --base-sha or --old-path"),
+            (["--old-path", "-", "--new-path", "-"], "Only one of"),
+        ],
+    )
+    def test_cli_errors(self, argv, error, tmp_path, capsys):
+        assert main([*argv, "--output-path", str(tmp_path / "report.json")]) == 2
+        assert error in capsys.readouterr().err
@@ -1,5 +1,6 @@
 from typing import Any, cast
 
+from uv_lock_report.filters import PackageFilter
 from uv_lock_report.models import (
     LockfilePackage,
     LockFileReporter,
@@ -594,3 +595,183 @@ class TestLockFileReporter:
 
         actual_order = [pkg.name for pkg in sorted_packages]
         assert actual_order == expected_order
+
+    def test_artifact_changed_packages(self):
+        """Test that re-locked artifacts at an unchanged version are reported."""
+        old_lockfile = UvLockFile.from_toml_str(
+            """
+version = 1
+revision = 3
+requires-python = ">=3.13"
+
+[[package]]
+name = "relocked"
+version = "1.0.0"
+source = { registry = "https://pypi.org/simple" }
+sdist = { url = "https://example.com/relocked-1.0.0.tar.gz", hash = "sha256:aaa" }
+
+[[package]]
+name = "stable"
+version = "1.0.0"
+source = { registry = "https://pypi.org/simple" }
+wheels = [{ url = "https://example.com/stable-1.0.0-py3-none-any.whl", hash = "sha256:ccc" }]
+
+[[package]]
+name = "upgraded"
+version = "1.0.0"
+source = { registry = "https://pypi.org/simple" }
+sdist = { url = "https://example.com/upgraded-1.0.0.tar.gz", hash = "sha256:ddd" }
+"""
+        )
+        new_lockfile = UvLockFile.from_toml_str(
+            """
+version = 1
+revision = 3
+requires-python = ">=3.13"
+
+[[package]]
+name = "relocked"
+version = "1.0.0"
+source = { registry = "https://pypi.org/simple" }
+sdist = { url = "https://example.com/relocked-1.0.0.tar.gz", hash = "sha256:bbb" }
+
+[[package]]
+name = "stable"
+version = "1.0.0"
+source = { registry = "https://pypi.org/simple" }
+wheels = [{ url = "https://example.com/stable-1.0.0-py3-none-any.whl", hash = "sha256:ccc" }]
+
+[[package]]
+name = "upgraded"
+version = "2.0.0"
+source = { registry = "https://pypi.org/simple" }
+sdist = { url = "https://example.com/upgraded-2.0.0.tar.gz", hash = "sha256:eee" }
+"""
+        )
+
+        reporter = LockFileReporter(
+            old_lockfile=old_lockfile,
+            new_lockfile=new_lockfile,
+            output_format=OutputFormat.TABLE,
+            show_learn_more_link=False,
+        )
+
+        changes = reporter.get_changes()
+        assert [pkg.name for pkg in changes.artifacts_changed] == ["relocked"]
+        assert [pkg.name for pkg in changes.updated] == ["upgraded"]
+        assert changes.items == 2
+        assert "### Artifacts Changed\n| Package | Version |" in changes.markdown
+
+    def test_dependency_changes(self):
+        """Test that dependency edges added or removed per package are reported."""
+        old_lockfile = UvLockFile.model_validate(
+            {
+                "version": 1,
+                "revision": 3,
+                "requires-python": ">=3.13",
+                "package": [
+                    {
+                        "name": "httpx",
+                        "version": "0.27.0",
+                        "dependencies": [{"name": "anyio"}, {"name": "sniffio"}],
+                    },
+                    {"name": "anyio", "version": "4.0.0"},
+                    {"name": "sniffio", "version": "1.3.0"},
+                ],
+            }
+        )
+        new_lockfile = UvLockFile.model_validate(
+            {
+                "version": 1,
+                "revision": 3,
+                "requires-python": ">=3.13",
+                "package": [
+                    {
+                        "name": "httpx",
+                        "version": "0.28.0",
+                        "dependencies": [{"name": "anyio"}, {"name": "h2"}],
+                    },
+                    {"name": "anyio", "version": "4.0.0"},
+                    {"name": "h2", "version": "4.1.0"},
+                    {"name": "sniffio", "version": "1.3.0"},
+                ],
+            }
+        )
+
+        reporter = LockFileReporter(
+            old_lockfile=old_lockfile,
+            new_lockfile=new_lockfile,
+            output_format=OutputFormat.SIMPLE,
+            show_learn_more_link=False,
+        )
+
+        changes = reporter.get_changes()
+        assert len(changes.dependencies_changed) == 1
+        assert changes.dependencies_changed[0].name == "httpx"
+        assert changes.dependencies_changed[0].added == ["h2"]
+        assert changes.dependencies_changed[0].removed == ["sniffio"]
+        assert (
+            "\\`httpx\\` now depends on \\`h2\\`, no longer depends on \\`sniffio\\`"
+            in changes.markdown
+        )
+
+    def test_package_filter(self):
+        """Filtered packages are dropped before any version is compared or parsed."""
+        old_lockfile = UvLockFile(
+            version=1,
+            revision=3,
+            **cast(
+                Any,
+                {
+                    "requires-python": ">=3.13",
+                    "package": [
+                        LockfilePackage(name="acme-core", version="build.1"),
+                        LockfilePackage(name="acme-utils", version="1.0.0"),
+                        LockfilePackage(name="django", version="4.2.0"),
+                        LockfilePackage(name="httpx", version="0.27.0"),
+                    ],
+                },
+            ),
+        )
+        new_lockfile = UvLockFile(
+            version=1,
+            revision=3,
+            **cast(
+                Any,
+                {
+                    "requires-python": ">=3.13",
+                    "package": [
+                        LockfilePackage(name="acme-core", version="build.2"),
+                        LockfilePackage(name="acme-api", version="1.0.0"),
+                        LockfilePackage(name="django", version="5.0.0"),
+                        LockfilePackage(name="h2", version="4.1.0"),
+                    ],
+                },
+            ),
+        )
+
+        reporter = LockFileReporter(
+            old_lockfile=old_lockfile,
+            new_lockfile=new_lockfile,
+            output_format=OutputFormat.TABLE,
+            show_learn_more_link=True,
+            package_filter=PackageFilter(ignore=["acme-*"]),
+        )
+
+        changes = reporter.get_changes()
+        assert [pkg.name for pkg in changes.added] == ["h2"]
+        assert [pkg.name for pkg in changes.removed] == ["httpx"]
+        assert [pkg.name for pkg in changes.updated] == ["django"]
+
+        reporter = LockFileReporter(
+            old_lockfile=old_lockfile,
+            new_lockfile=new_lockfile,
+            output_format=OutputFormat.TABLE,
+            show_learn_more_link=True,
+            package_filter=PackageFilter(only=["re:^(django|h.*)$"]),
+        )
+
+        changes = reporter.get_changes()
+        assert [pkg.name for pkg in changes.added] == ["h2"]
+        assert [pkg.name for pkg in changes.removed] == ["httpx"]
+        assert [pkg.name for pkg in changes.updated] == ["django"]
@@ -45,3 +45,61 @@ class TestLockfilePackage:
 
         assert lfp.name == d["name"]
         assert lfp.version == expected_version
+
+    def test_artifact_fingerprint_ignores_wheel_order(self):
+        wheels = [
+            {"url": "a.whl", "hash": "sha256:aaa", "size": 1},
+            {"url": "b.whl", "hash": "sha256:bbb", "size": 2},
+        ]
+        d = {"name": "pkg_name", "version": "1.0.0", "wheels": wheels}
+
+        lfp = LockfilePackage.model_validate(d)
+        reordered = LockfilePackage.model_validate(
+            {**d, "wheels": list(reversed(wheels))}
+        )
+
+        assert lfp.artifact_fingerprint is not None
+        assert lfp.artifact_fingerprint == reordered.artifact_fingerprint
+        assert not lfp.artifacts_differ(reordered)
+
+    def test_artifact_fingerprint_changes_with_hash(self):
+        d = {
+            "name": "pkg_name",
+            "version": "1.0.0",
+            "sdist": {"url": "pkg.tar.gz", "hash": "sha256:aaa"},
+        }
+        relocked = {**d, "sdist": {"url": "pkg.tar.gz", "hash": "sha256:bbb"}}
+
+        lfp = LockfilePackage.model_validate(d)
+
+        assert lfp.artifacts_differ(LockfilePackage.model_validate(relocked))
+        assert lfp == LockfilePackage.model_validate(relocked)
+
+    def test_artifact_fingerprint_not_dumped(self):
+        d = {"name": "pkg_name", "version": "1.0.0", "source": {"editable": "."}}
+
+        lfp = LockfilePackage.model_validate(d)
+
+        assert lfp.artifact_fingerprint is not None
+        assert lfp.model_dump() == {"name": "pkg_name", "version": "1.0.0"}
+
+    def test_dependency_edges_from_package_table(self):
+        d = {
+            "name": "httpx",
+            "version": "0.28.1",
+            "dependencies": [
+                {"name": "anyio"},
+                {"name": "h2", "marker": "python_full_version >= '3.13'"},
+            ],
+            "optional-dependencies": {"socks": [{"name": "socksio"}]},
+            "dev-dependencies": {"test": [{"name": "pytest", "extra": ["cov"]}]},
+        }
+
+        lfp = LockfilePackage.model_validate(d)
+
+        assert lfp.dependency_edges == {
+            "anyio",
+            "h2; python_full_version >= '3.13'",
+            "socksio (extra: socks)",
+            "pytest[cov] (group: test)",
+        }
@@ -0,0 +1,90 @@
+import json
+import threading
+
+from uv_lock_report.cli import main
+from uv_lock_report.models import UvLockFile
+from uv_lock_report.report import (
+    get_uv_lock_blob_ids,
+    load_uv_lock_blobs,
+    parsed_lockfiles,
+)
+
+from .conftest import lockfile_toml
+
+
+class TestMultipleBases:
+    def test_bases_sharing_a_blob_are_parsed_once(self, git_repo, monkeypatch):
+        release = git_repo.commit_lockfile(lockfile_toml(django="4.2.0"))
+        git_repo.git("tag", "v1.0.0")
+        git_repo.git("commit", "--quiet", "--allow-empty", "-m", "Unrelated")
+        main_sha = git_repo.commit_lockfile(lockfile_toml(django="5.0.0"))
+        parsed_lockfiles.clear()
+        parsing_threads = []
+        from_toml_str = UvLockFile.from_toml_str.__func__
+        monkeypatch.setattr(
+            UvLockFile,
+            "from_toml_str",
+            classmethod(
+                lambda cls, text: (
+                    parsing_threads.append(threading.current_thread())
+                    or from_toml_str(cls, text)
+                )
+            ),
+        )
+
+        base_path = str(git_repo.path)
+        lockfiles = load_uv_lock_blobs(
+            get_uv_lock_blob_ids(
+                [main_sha, "v1.0.0", release, "HEAD~1", "missing"], base_path
+            ),
+            base_path,
+        )
+
+        # Only the reads are concurrent; the shared cache is filled serially.
+        assert parsing_threads == [threading.current_thread()] * 2
+        assert lockfiles["v1.0.0"] is lockfiles[release] is lockfiles["HEAD~1"]
+        assert lockfiles[main_sha].packages_by_name["django"].version == "5.0.0"
+        assert lockfiles["missing"] is None
+
+    def test_cli(self, git_repo, tmp_path):
+        git_repo.commit_lockfile(lockfile_toml(django="4.2.0", httpx="0.27.0"))
+        git_repo.git("tag", "v1.0.0")
+        git_repo.commit_lockfile(lockfile_toml(django="5.0.0", httpx="0.27.0"))
+        (git_repo.path / "uv.lock").write_text(
+            lockfile_toml(django="5.0.0", httpx="0.28.0")
+        )
+        output = tmp_path / "report.json"
+
+        assert (
+            main(
+                [
+                    "--base-sha",
+                    "HEAD",
+                    "v1.0.0",
+                    "--base-sha",
+                    "HEAD",
+                    "--base-path",
+                    str(git_repo.path),
+                    "--output-path",
+                    str(output),
+                    "--output-format",
+                    "simple",
+                    "--show-learn-more-link",
+                    "false",
+                ]
+            )
+            == 0
+        )
+
+        report = json.loads(output.read_text())
+        assert [c["base"] for c in report["comparisons"]] == ["v1.0.0"]
+        assert report["items"] == 3
+        assert report["markdown"] == (
+            "## uv Lockfile Report\n"
+            "### Upgraded\n"
+            ":sparkles: \\`httpx\\`: \\`0.27.0\\` -> \\`0.28.0\\`\n"
+            "## Compared to \\`v1.0.0\\`\n"
+            "### Upgraded\n"
+            ":collision: \\`django\\`: \\`4.2.0\\` -> \\`5.0.0\\`\n"
+            ":sparkles: \\`httpx\\`: \\`0.27.0\\` -> \\`0.28.0\\`"
+        )
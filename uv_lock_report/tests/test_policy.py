@@ -0,0 +1,179 @@
+import pytest
+from pydantic import ValidationError
+
+from uv_lock_report.cli import POLICY_VIOLATION_EXIT_CODE, main
+from uv_lock_report.models import LockFileReporter, OutputFormat
+from uv_lock_report.policy import (
+    Policy,
+    PolicyFile,
+    RuleIndex,
+    requires_python_narrowed,
+)
+
+from .conftest import lockfile_toml, make_lockfile
+
+POLICY = """
+[[rules]]
+id = "django-major"
+packages = ["django"]
+deny = ["major"]
+message = "Major Django upgrades need a migration plan."
+
+[[rules]]
+id = "no-downgrades"
+deny = ["downgrade"]
+
+[[rules]]
+id = "trusted-sources"
+deny = ["non-default-source"]
+
+[[rules]]
+id = "python-widen-only"
+deny = ["requires-python-narrowed"]
+
+[[rules]]
+id = "no-acme-removals"
+packages = ["acme-*", "re:^legacy"]
+deny = ["removed"]
+"""
+
+
+def registry(name: str, version: str, index: str = "https://pypi.org/simple"):
+    return {"name": name, "version": version, "source": {"registry": index}}
+
+
+@pytest.fixture
+def policy(tmp_path):
+    path = tmp_path / "policy.toml"
+    path.write_text(POLICY)
+    return Policy.load(path)
+
+
+class TestRuleIndex:
+    def test_match(self):
+        index = RuleIndex()
+        index.add("django", 0)
+        index.add("Django_Stubs", 1)
+        index.add("django*", 2)
+        index.add("*", 3)
+        index.add("acme-?ore", 4)
+        index.add("re:.*-plugin$", 5)
+
+        assert index.match("django") == {0, 2, 3}
+        assert index.match("django-stubs") == {1, 2, 3}
+        assert index.match("acme-core") == {3, 4}
+        assert index.match("acme-cores") == {3}
+        assert index.match("pytest-plugin") == {3, 5}
+
+    def test_patterns_are_canonicalized(self):
+        index = RuleIndex()
+        index.add("foo_bar*", 0)
+        index.add("Foo.Bar", 1)
+        index.add("Zope.?nterface*", 2)
+
+        assert index.match("foo-bar") == {0, 1}
+        assert index.match("Foo_Bar_Extras") == {0}
+        assert index.match("zope.interface") == {2}
+
+    def test_many_rules(self):
+        index = RuleIndex()
+        for i in range(5000):
+            index.add(f"pkg-{i}", i)
+            index.add(f"team-{i}-*", 5000 + i)
+
+        assert index.match("pkg-42") == {42}
+        assert index.match("team-42-api") == {5042}
+        assert index.match("other") == set()
+
+
+class TestRequiresPython:
+    @pytest.mark.parametrize(
+        "old,new,narrowed",
+        [
+            (">=3.12", ">=3.11", False),
+            (">=3.11", ">=3.12", True),
+            (">=3.11", ">=3.11,<4", False),
+            (">=3.9", ">=3.9.2", True),
+            (">=3.11,<3.13", ">=3.11", False),
+            (">=3.11", ">=3.11,<3.14", True),
+            (None, ">=3.13", False),
+        ],
+    )
+    def test_requires_python_narrowed(self, old, new, narrowed):
+        assert requires_python_narrowed(old, new) is narrowed
+
+
+class TestPolicy:
+    def test_unknown_kind(self):
+        with pytest.raises(ValidationError, match="unknown change kinds"):
+            PolicyFile.model_validate({"rules": [{"id": "typo", "deny": ["majr"]}]})
+
+    def test_evaluate(self, policy):
+        old_lockfile = make_lockfile(
+            {"name": "app", "version": "0.1.0", "source": {"editable": "."}},
+            registry("django", "4.2.0"),
+            registry("httpx", "0.28.0"),
+            registry("acme-core", "1.0.0"),
+            registry("requests", "2.31.0"),
+            requires_python=">=3.11",
+        )
+        new_lockfile = make_lockfile(
+            {"name": "app", "version": "0.1.0", "source": {"editable": "."}},
+            registry("django", "5.0.0"),
+            registry("httpx", "0.27.0"),
+            registry("private", "1.0.0", index="https://pypi.acme.dev/simple"),
+            {
+                "name": "forked",
+                "version": "1.0.0",
+                "source": {"git": "https://github.com/acme/forked"},
+            },
+            registry("requests", "2.32.0"),
+            requires_python=">=3.12",
+        )
+        changes = LockFileReporter(
+            old_lockfile=old_lockfile,
+            new_lockfile=new_lockfile,
+            output_format=OutputFormat.TABLE,
+            show_learn_more_link=False,
+        ).get_changes()
+
+        violations = policy.evaluate(changes)
+
+        assert sorted((v.rule, v.name) for v in violations) == [
+            ("django-major", "django"),
+            ("no-acme-removals", "acme-core"),
+            ("no-downgrades", "httpx"),
+            ("python-widen-only", None),
+            ("trusted-sources", "forked"),
+            ("trusted-sources", "private"),
+        ]
+        django = next(v for v in violations if v.rule == "django-major")
+        assert django.message == (
+            "django 4.2.0 -> 5.0.0 (major): "
+            "Major Django upgrades need a migration plan."
+        )
+
+        changes.violations = violations
+        assert "### Policy Violations" in changes.markdown_table
+        assert ":no_entry: \\`no-downgrades\\`: httpx 0.28.0 -> 0.27.0" in (
+            changes.markdown_simple
+        )
+
+    def test_cli_exit_code(self, git_repo, tmp_path):
+        git_repo.commit_lockfile(lockfile_toml(django="4.2.0"))
+        (git_repo.path / "uv.lock").write_text(lockfile_toml(django="5.0.0"))
+        policy_path = tmp_path / "policy.toml"
+        policy_path.write_text(POLICY)
+        args = [
+            "--base-sha",
+            "HEAD",
+            "--base-path",
+            str(git_repo.path),
+            "--output-path",
+            str(tmp_path / "report.json"),
+        ]
+
+        assert main(args) == 0
+        assert main([*args, "--policy", str(policy_path)]) == (
+            POLICY_VIOLATION_EXIT_CODE
+        )
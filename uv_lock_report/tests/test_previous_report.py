@@ -0,0 +1,166 @@
+import json
+
+import pytest
+
+from uv_lock_report.cli import main
+from uv_lock_report.models import (
+    LockfileChanges,
+    LockFileReporter,
+    OutputFormat,
+    PackageDelta,
+    UvLockFile,
+)
+
+from .conftest import lockfile_toml
+
+
+def get_changes(old: str, new: str) -> LockfileChanges:
+    return LockFileReporter(
+        old_lockfile=UvLockFile.from_toml_str(old),
+        new_lockfile=UvLockFile.from_toml_str(new),
+        output_format=OutputFormat.SIMPLE,
+        show_learn_more_link=False,
+    ).get_changes()
+
+
+BASE = lockfile_toml(django="4.2.0", httpx="0.27.0", anyio="4.0.0")
+
+
+class TestChangesSince:
+    def test_changes_since(self):
+        previous = get_changes(
+            BASE, lockfile_toml(django="5.0.0", httpx="0.27.0", h2="4.1.0")
+        )
+        current = get_changes(
+            BASE, lockfile_toml(django="5.0.1", httpx="0.28.0", anyio="4.0.0")
+        )
+
+        assert current.changes_since(previous) == [
+            # Removed in the previous push, back at its base version now.
+            PackageDelta(name="anyio", previous_version=None, current_version="4.0.0"),
+            PackageDelta(
+                name="django", previous_version="5.0.0", current_version="5.0.1"
+            ),
+            PackageDelta(name="h2", previous_version="4.1.0", current_version=None),
+            PackageDelta(
+                name="httpx", previous_version="0.27.0", current_version="0.28.0"
+            ),
+        ]
+
+    def test_base_moved(self):
+        previous = get_changes(BASE, lockfile_toml(django="5.0.0", httpx="0.27.0"))
+        # The same upgrade landed on the base branch and the PR was rebased.
+        moved_base = lockfile_toml(django="5.0.0", httpx="0.27.0", anyio="4.0.0")
+        current = get_changes(
+            moved_base, lockfile_toml(django="5.0.0", httpx="0.28.0", anyio="4.0.0")
+        )
+
+        assert current.changes_since(previous) == [
+            PackageDelta(name="anyio", previous_version=None, current_version="4.0.0"),
+            PackageDelta(
+                name="httpx", previous_version="0.27.0", current_version="0.28.0"
+            ),
+        ]
+
+    def test_base_moved_through_payload(self):
+        previous = get_changes(BASE, lockfile_toml(django="5.0.0", httpx="0.27.0"))
+        previous.embed_payload = True
+        moved_base = lockfile_toml(django="5.0.0", httpx="0.27.0")
+        current = get_changes(moved_base, lockfile_toml(django="5.0.0", httpx="0.27.0"))
+
+        restored = LockfileChanges.from_previous_report(previous.markdown)
+
+        assert restored is not None
+        assert current.changes_since(restored) == []
+
+    def test_no_changes_since(self):
+        changes = get_changes(BASE, lockfile_toml(django="5.0.0"))
+
+        assert changes.changes_since(changes) == []
+
+    def test_payload_round_trip(self):
+        changes = get_changes(BASE, lockfile_toml(django="5.0.0"))
+        changes.embed_payload = True
+
+        comment = f"Some comment\n{changes.markdown}\n"
+        previous = LockfileChanges.from_previous_report(comment)
+
+        assert previous is not None
+        assert previous.updated == changes.updated
+        assert previous.removed == changes.removed
+        assert changes.payload_comment() in changes.markdown
+        assert "`" not in changes.payload_comment()
+
+    def test_from_report_json(self):
+        changes = get_changes(BASE, lockfile_toml(django="5.0.0"))
+
+        previous = LockfileChanges.from_previous_report(changes.model_dump_json())
+
+        assert previous is not None
+        assert previous.updated == changes.updated
+
+    def test_without_payload(self):
+        assert LockfileChanges.from_previous_report("## uv Lockfile Report") is None
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "<!-- uv-lock-report-payload:AAAA -->",
+            "<!-- uv-lock-report-payload:A -->",
+            '{"items": "many"}',
+        ],
+    )
+    def test_unreadable(self, text):
+        assert LockfileChanges.from_previous_report(text) is None
+
+    def test_markdown(self):
+        changes = get_changes(BASE, lockfile_toml(django="5.0.0"))
+        changes.since_last_update = [
+            PackageDelta(
+                name="django", previous_version="4.2.0", current_version="5.0.0"
+            ),
+            PackageDelta(name="h2", previous_version=None, current_version="4.1.0"),
+        ]
+
+        assert changes.markdown_simple.endswith(
+            "### Changed Since Last Update\n"
+            "\\`django\\`: \\`4.2.0\\` -> \\`5.0.0\\`\n"
+            "\\`h2\\`: now \\`4.1.0\\`"
+        )
+        assert "| h2 | not locked | 4.1.0 |" in changes.markdown_table
+
+
+class TestPreviousReportCli:
+    def test_since_last_update(self, git_repo, tmp_path):
+        git_repo.commit_lockfile(BASE)
+        output = tmp_path / "report.json"
+        previous = tmp_path / "previous-report.md"
+        args = [
+            "--base-sha",
+            "HEAD",
+            "--base-path",
+            str(git_repo.path),
+            "--output-path",
+            str(output),
+            "--previous-report",
+            str(previous),
+            "--embed-payload",
+            "true",
+        ]
+
+        (git_repo.path / "uv.lock").write_text(
+            lockfile_toml(django="5.0.0", httpx="0.27.0", anyio="4.0.0")
+        )
+        assert main(args) == 0
+        first = json.loads(output.read_text())
+        assert first["since_last_update"] == []
+
+        previous.write_text(first["markdown"])
+        (git_repo.path / "uv.lock").write_text(
+            lockfile_toml(django="5.0.1", httpx="0.27.0", anyio="4.0.0")
+        )
+        assert main(args) == 0
+        second = json.loads(output.read_text())
+        assert second["since_last_update"] == [
+            {"name": "django", "previous_version": "5.0.0", "current_version": "5.0.1"}
+        ]
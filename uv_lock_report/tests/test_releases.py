@@ -0,0 +1,202 @@
+import json
+import threading
+import time
+from datetime import UTC, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from uv_lock_report.models import UpdatedPackage
+from uv_lock_report.releases import (
+    ReleaseCache,
+    ReleaseMetadataFetcher,
+    build_release_metadata,
+    summarize_release,
+)
+
+HTTPX_RELEASE = {
+    "info": {
+        "project_urls": {
+            "Changelog": "https://github.com/encode/httpx/blob/master/CHANGELOG.md",
+            "Source": "https://github.com/encode/httpx",
+        }
+    },
+    "urls": [
+        {"upload_time_iso_8601": "2024-12-06T15:37:23.000000Z"},
+        {"upload_time_iso_8601": "2024-12-06T15:37:21.000000Z"},
+    ],
+}
+ANYIO_RELEASE = {
+    "info": {"project_urls": {"Source code": "https://github.com/agronholm/anyio"}},
+    "urls": [{"upload_time_iso_8601": "2024-10-13T22:18:02.000000Z"}],
+}
+
+
+class FakeIndex(ThreadingHTTPServer):
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), FakeIndexHandler)
+        self.releases = {
+            "/pypi/httpx/0.28.1/json": HTTPX_RELEASE,
+            "/pypi/anyio/4.7.0/json": ANYIO_RELEASE,
+        }
+        self.delays: dict[str, float] = {}
+        # Seconds between the bytes of a body sent one at a time.
+        self.trickle: dict[str, float] = {}
+        self.requests: list[str] = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class FakeIndexHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: FakeIndex
+
+    def do_GET(self) -> None:
+        self.server.requests.append(self.path)
+        time.sleep(self.server.delays.get(self.path, 0))
+        release = self.server.releases.get(self.path)
+        body = json.dumps(release).encode() if release else b"{}"
+        self.send_response(200 if release else 404)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.path not in self.server.trickle:
+            self.wfile.write(body)
+            return
+        for byte in body:
+            self.wfile.write(bytes([byte]))
+            self.wfile.flush()
+            time.sleep(self.server.trickle[self.path])
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def fake_index():
+    server = FakeIndex()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+UPGRADED = [
+    UpdatedPackage(name="httpx", old_version="0.27.2", new_version="0.28.1"),
+    UpdatedPackage(name="anyio", old_version="4.6.0", new_version="4.7.0"),
+]
+
+
+class TestReleaseMetadata:
+    def test_summarize_release_uses_earliest_upload(self):
+        summary = summarize_release(HTTPX_RELEASE)
+
+        assert summary["released_at"] == "2024-12-06T15:37:21.000000Z"
+        assert summary["project_urls"] == HTTPX_RELEASE["info"]["project_urls"]
+
+    def test_build_release_metadata(self):
+        now = datetime(2024, 12, 16, tzinfo=UTC)
+
+        release = build_release_metadata(
+            UPGRADED[0], summarize_release(HTTPX_RELEASE), now
+        )
+
+        assert release.released_date == "2024-12-06"
+        assert release.age_days == 9
+        assert release.changelog_url == (
+            "https://github.com/encode/httpx/blob/master/CHANGELOG.md"
+        )
+        # Repositories tag releases as `1.2.0`, `v1.2.0` or otherwise, so no
+        # compare link is guessed from the versions.
+        assert release.links == (
+            "[changelog](https://github.com/encode/httpx/blob/master/CHANGELOG.md)"
+        )
+
+
+class TestReleaseMetadataFetcher:
+    def test_fetch_from_index(self, fake_index, tmp_path):
+        fetcher = ReleaseMetadataFetcher(
+            index_url=fake_index.url, cache=ReleaseCache(tmp_path / "cache.sqlite")
+        )
+
+        releases = fetcher.fetch(UPGRADED)
+
+        assert [(r.name, r.version, r.released_date) for r in releases] == [
+            ("httpx", "0.28.1", "2024-12-06"),
+            ("anyio", "4.7.0", "2024-10-13"),
+        ]
+        assert releases[1].changelog_url is None
+        assert releases[1].links == ""
+
+    def test_repeat_runs_hit_the_cache(self, fake_index, tmp_path):
+        cache_path = tmp_path / "cache.sqlite"
+        ReleaseMetadataFetcher(
+            index_url=fake_index.url, cache=ReleaseCache(cache_path)
+        ).fetch(UPGRADED)
+        assert len(fake_index.requests) == 2
+
+        releases = ReleaseMetadataFetcher(
+            index_url=fake_index.url, cache=ReleaseCache(cache_path)
+        ).fetch(UPGRADED)
+
+        assert len(releases) == 2
+        assert len(fake_index.requests) == 2
+
+    def test_expired_cache_entries_are_refetched(self, fake_index, tmp_path):
+        cache_path = tmp_path / "cache.sqlite"
+        ReleaseMetadataFetcher(
+            index_url=fake_index.url, cache=ReleaseCache(cache_path)
+        ).fetch(UPGRADED)
+
+        ReleaseMetadataFetcher(
+            index_url=fake_index.url, cache=ReleaseCache(cache_path, ttl=-1)
+        ).fetch(UPGRADED)
+
+        assert len(fake_index.requests) == 4
+
+    def test_unknown_releases_are_skipped(self, fake_index):
+        fetcher = ReleaseMetadataFetcher(index_url=fake_index.url)
+
+        releases = fetcher.fetch(
+            [UpdatedPackage(name="missing", old_version="1.0", new_version="2.0")]
+        )
+
+        assert releases == []
+
+    def test_time_budget_drops_slow_lookups(self, fake_index):
+        fake_index.delays["/pypi/anyio/4.7.0/json"] = 1.0
+        fetcher = ReleaseMetadataFetcher(index_url=fake_index.url, time_budget=0.2)
+
+        started = time.monotonic()
+        releases = fetcher.fetch(UPGRADED)
+
+        assert time.monotonic() - started < 0.8
+        assert [r.name for r in releases] == ["httpx"]
+
+    def test_slow_lookups_do_not_outlive_the_budget(self, fake_index):
+        # Each byte arrives well within the socket timeout, the body does not.
+        fake_index.trickle["/pypi/anyio/4.7.0/json"] = 0.05
+        fetcher = ReleaseMetadataFetcher(index_url=fake_index.url, time_budget=0.3)
+
+        running = set(threading.enumerate())
+        started = time.monotonic()
+        fetcher.fetch(UPGRADED)
+        workers = [
+            thread
+            for thread in threading.enumerate()
+            if thread not in running and not thread.daemon
+        ]
+        for worker in workers:
+            worker.join(timeout=3.0)
+
+        # Threads left running would be joined at interpreter exit.
+        assert not any(worker.is_alive() for worker in workers)
+        assert time.monotonic() - started < 1.0
+
+    def test_unreachable_index(self):
+        fetcher = ReleaseMetadataFetcher(index_url="http://127.0.0.1:9", time_budget=1)
+
+        assert fetcher.fetch(UPGRADED) == []
@@ -0,0 +1,146 @@
+import os
+
+import pytest
+
+from uv_lock_report.cache import CachedReport, ReportCache, report_cache_key
+from uv_lock_report.models import OutputFormat, UvLockFile
+from uv_lock_report.report import ReportOptions, parsed_lockfiles, report
+
+from .conftest import lockfile_toml
+
+
+def entry(size: int) -> CachedReport:
+    return CachedReport(changes="{}", markdown="x" * size)
+
+
+class TestReportCache:
+    def test_round_trip(self, tmp_path):
+        cache = ReportCache(tmp_path / "cache")
+        key = report_cache_key({"old": "a", "new": "b"})
+
+        assert cache.get(key) is None
+        cache.put(key, entry(10))
+
+        assert cache.get(key) == entry(10)
+        assert [path.suffix for path in (tmp_path / "cache").iterdir()] == [".json"]
+
+    def test_key_ignores_order(self):
+        assert report_cache_key({"a": 1, "b": [2]}) == report_cache_key(
+            {"b": [2], "a": 1}
+        )
+        assert report_cache_key({"a": 1}) != report_cache_key({"a": 2})
+
+    def test_least_recently_used_are_evicted(self, tmp_path):
+        cache = ReportCache(tmp_path, max_bytes=300)
+        for index, key in enumerate(["a", "b"]):
+            cache.put(key, entry(100))
+            os.utime(tmp_path / f"{key}.json", (index, index))
+        # Reading "a" makes "b" the least recently used.
+        assert cache.get("a") is not None
+
+        cache.put("c", entry(100))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        (tmp_path / "key.json").write_text("{not json")
+
+        assert ReportCache(tmp_path).get("key") is None
+
+
+class TestReportWithCache:
+    @pytest.fixture
+    def repo(self, git_repo):
+        git_repo.commit_lockfile(lockfile_toml(django="4.2.0"))
+        (git_repo.path / "uv.lock").write_text(lockfile_toml(django="5.0.0"))
+        return git_repo
+
+    def run(self, repo, tmp_path, output_format=OutputFormat.TABLE, **options):
+        return report(
+            base_sha="HEAD",
+            base_path=str(repo.path),
+            output_path=str(tmp_path / "report.json"),
+            output_format=output_format,
+            options=ReportOptions(
+                step_summary=str(tmp_path / "summary.md"),
+                report_cache=str(tmp_path / "cache"),
+                **options,
+            ),
+        )
+
+    def test_hit_skips_parsing(self, repo, tmp_path, monkeypatch):
+        first = self.run(repo, tmp_path)
+        output = (tmp_path / "report.json").read_text()
+        summary = (tmp_path / "summary.md").read_text()
+        parsed_lockfiles.clear()
+
+        def from_toml_str(cls, toml_str):
+            raise AssertionError("lockfile should not be parsed")
+
+        monkeypatch.setattr(UvLockFile, "from_toml_str", classmethod(from_toml_str))
+        (tmp_path / "summary.md").unlink()
+
+        second = self.run(repo, tmp_path)
+
+        assert second.updated == first.updated
+        assert (tmp_path / "report.json").read_text() == output
+        assert (tmp_path / "summary.md").read_text() == summary
+
+    @pytest.mark.parametrize(
+        "options,lockfile",
+        [
+            ({"output_format": OutputFormat.SIMPLE}, None),
+            ({"ignore_packages": ["django"]}, None),
+            ({}, lockfile_toml(django="5.1.0")),
+        ],
+    )
+    def test_changed_inputs_miss(self, repo, tmp_path, options, lockfile):
+        self.run(repo, tmp_path)
+        if lockfile is not None:
+            (repo.path / "uv.lock").write_text(lockfile)
+
+        self.run(repo, tmp_path, **options)
+
+        assert len(list((tmp_path / "cache").iterdir())) == 2
+
+    def test_release_metadata_is_not_cached(self, repo, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            "uv_lock_report.report.ReleaseMetadataFetcher.fetch",
+            lambda self, packages: [],
+        )
+
+        self.run(
+            repo,
+            tmp_path,
+            release_metadata=True,
+            release_cache=str(tmp_path / "releases.sqlite"),
+        )
+
+        assert not (tmp_path / "cache").exists()
+
+    def test_release_cache_is_closed(self, repo, tmp_path, monkeypatch):
+        closed = []
+
+        def close(cache):
+            cache.connection.close()
+            closed.append(cache)
+
+        monkeypatch.setattr(
+            "uv_lock_report.report.ReleaseMetadataFetcher.fetch",
+            lambda self, packages: [],
+        )
+        monkeypatch.setattr(
+            "uv_lock_report.report.ReleaseCache.close",
+            close,
+        )
+
+        self.run(
+            repo,
+            tmp_path,
+            release_metadata=True,
+            release_cache=str(tmp_path / "releases.sqlite"),
+        )
+
+        assert len(closed) == 1
@@ -0,0 +1,138 @@
+from uv_lock_report.models import (
+    LockfilePackage,
+    LockFileReporter,
+    OutputFormat,
+    UvLockFile,
+    match_forks,
+)
+
+OLD_FORK = "python_full_version < '3.11'"
+NEW_FORK = "python_full_version >= '3.11'"
+
+
+def forked_lockfile(*entries: tuple[str, str, str | None]) -> str:
+    """uv.lock content with `(name, version, resolution marker)` entries."""
+    lines = ["version = 1", "revision = 3", 'requires-python = ">=3.10"', ""]
+    for name, version, marker in entries:
+        lines.extend(
+            [
+                "[[package]]",
+                f'name = "{name}"',
+                f'version = "{version}"',
+                'source = { registry = "https://pypi.org/simple" }',
+            ]
+        )
+        if marker is not None:
+            lines.append(f'resolution-markers = ["{marker}"]')
+        lines.append("")
+    return "\n".join(lines)
+
+
+def reporter_for(old: str, new: str) -> LockFileReporter:
+    return LockFileReporter(
+        old_lockfile=UvLockFile.from_toml_str(old),
+        new_lockfile=UvLockFile.from_toml_str(new),
+        output_format=OutputFormat.TABLE,
+        show_learn_more_link=False,
+    )
+
+
+class TestPackageIndex:
+    def test_every_fork_is_kept(self):
+        lockfile = UvLockFile.from_toml_str(
+            forked_lockfile(
+                ("numpy", "1.26.4", OLD_FORK),
+                ("numpy", "2.1.0", NEW_FORK),
+                ("h2", "4.1.0", None),
+            )
+        )
+
+        assert [pkg.version for pkg in lockfile.package_index["numpy"]] == [
+            "1.26.4",
+            "2.1.0",
+        ]
+        assert lockfile.package_names == {"numpy", "h2"}
+        assert lockfile.packages_by_name["numpy"].version == "2.1.0"
+        assert lockfile.package_index["numpy"][0].key.markers == (OLD_FORK,)
+        assert lockfile.package_index["numpy"][0].fork == OLD_FORK
+        assert lockfile.package_index["h2"][0].fork is None
+
+
+class TestMatchForks:
+    def package(self, version: str, marker: str | None = None) -> LockfilePackage:
+        return LockfilePackage(
+            name="numpy",
+            version=version,
+            resolution_markers=[marker] if marker else [],
+        )
+
+    def test_pairs_by_markers_then_version(self):
+        old = [self.package("1.26.4", OLD_FORK), self.package("2.0.0", NEW_FORK)]
+        new = [self.package("2.0.0"), self.package("1.26.4", OLD_FORK)]
+
+        pairs, removed, added = match_forks(old, new)
+
+        assert [(o.version, n.version) for o, n in pairs] == [
+            ("2.0.0", "2.0.0"),
+            ("1.26.4", "1.26.4"),
+        ]
+        assert removed == added == []
+
+    def test_unpaired_forks(self):
+        old = [self.package("1.26.4")]
+        new = [self.package("1.26.4", OLD_FORK), self.package("2.1.0", NEW_FORK)]
+
+        pairs, removed, added = match_forks(old, new)
+
+        assert [(o.version, n.version) for o, n in pairs] == [("1.26.4", "1.26.4")]
+        assert removed == []
+        assert [pkg.version for pkg in added] == ["2.1.0"]
+
+
+class TestForkAwareDiff:
+    def test_each_fork_is_diffed(self):
+        reporter = reporter_for(
+            forked_lockfile(
+                ("numpy", "1.26.4", OLD_FORK), ("numpy", "2.0.0", NEW_FORK)
+            ),
+            forked_lockfile(
+                ("numpy", "1.26.4", OLD_FORK), ("numpy", "2.1.0", NEW_FORK)
+            ),
+        )
+
+        changes = reporter.get_changes()
+
+        assert [(u.old_version, u.new_version, u.fork) for u in changes.updated] == [
+            ("2.0.0", "2.1.0", NEW_FORK)
+        ]
+        assert f"| numpy (\\`{NEW_FORK}\\`) | 2.0.0 | 2.1.0 |" in changes.markdown_table
+        assert (
+            f":sparkles: \\`numpy\\` (\\`{NEW_FORK}\\`): \\`2.0.0\\` -> \\`2.1.0\\`"
+            in changes.markdown_simple
+        )
+
+    def test_split_and_merged_forks(self):
+        single = forked_lockfile(("numpy", "1.26.4", None))
+        split = forked_lockfile(
+            ("numpy", "1.26.4", OLD_FORK), ("numpy", "2.1.0", NEW_FORK)
+        )
+
+        split_changes = reporter_for(single, split).get_changes()
+        merged_changes = reporter_for(split, single).get_changes()
+
+        assert split_changes.updated == []
+        assert [str(pkg) for pkg in split_changes.added] == [
+            f"numpy ({NEW_FORK}): 2.1.0"
+        ]
+        assert [str(pkg) for pkg in merged_changes.removed] == [
+            f"numpy ({NEW_FORK}): 2.1.0"
+        ]
+
+    def test_single_entries_are_paired_across_versions(self):
+        changes = reporter_for(
+            forked_lockfile(("numpy", "1.26.4", None)),
+            forked_lockfile(("numpy", "2.1.0", None)),
+        ).get_changes()
+
+        assert [(u.name, u.fork) for u in changes.updated] == [("numpy", None)]
+        assert changes.added == changes.removed == []
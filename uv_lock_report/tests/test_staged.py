@@ -0,0 +1,153 @@
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import uv_lock_report
+from uv_lock_report.cli import main
+from uv_lock_report.staged import read_blobs, staged_report
+
+from .conftest import lockfile_toml
+
+
+def stage_lockfile(git_repo, content: str) -> None:
+    (git_repo.path / "uv.lock").write_text(content)
+    git_repo.git("add", "uv.lock")
+
+
+class TestStaged:
+    def test_read_blobs(self, git_repo):
+        git_repo.commit_lockfile(lockfile_toml(django="4.2.0"))
+        stage_lockfile(git_repo, lockfile_toml(django="5.0.0"))
+
+        head, staged, missing = read_blobs(
+            ["HEAD:uv.lock", ":uv.lock", "HEAD:missing.lock"], str(git_repo.path)
+        )
+
+        assert head is not None and staged is not None
+        assert head[1].decode() == lockfile_toml(django="4.2.0")
+        assert staged[1].decode() == lockfile_toml(django="5.0.0")
+        assert head[0] != staged[0]
+        assert missing is None
+
+    def test_unchanged(self, git_repo):
+        git_repo.commit_lockfile(lockfile_toml(django="4.2.0"))
+        # Unstaged edits are not part of the commit being made.
+        (git_repo.path / "uv.lock").write_text(lockfile_toml(django="5.0.0"))
+
+        assert staged_report(str(git_repo.path)) == ""
+
+    def test_reformatted_without_package_changes(self, git_repo):
+        git_repo.commit_lockfile(lockfile_toml(django="4.2.0"))
+        stage_lockfile(git_repo, lockfile_toml(django="4.2.0") + "\n\n")
+
+        assert staged_report(str(git_repo.path)) == ""
+
+    def test_changed(self, git_repo):
+        git_repo.commit_lockfile(lockfile_toml(django="4.2.0", httpx="0.27.0"))
+        stage_lockfile(git_repo, lockfile_toml(django="5.0.0", h2="4.1.0"))
+
+        assert staged_report(str(git_repo.path)) == (
+            "## uv Lockfile Report\n"
+            "### Added\n"
+            "`h2`: `4.1.0`\n"
+            "### Upgraded\n"
+            ":collision: `django`: `4.2.0` -> `5.0.0`\n"
+            "### Removed\n"
+            "`httpx`: `0.27.0`"
+        )
+
+    def test_changed_in_one_fork(self, git_repo):
+        def forked(old_fork_version: str) -> str:
+            return "\n".join(
+                [
+                    lockfile_toml(),
+                    *(
+                        "\n".join(
+                            [
+                                "[[package]]",
+                                'name = "numpy"',
+                                f'version = "{version}"',
+                                'source = { registry = "https://pypi.org/simple" }',
+                                f'resolution-markers = ["{marker}"]',
+                                "",
+                            ]
+                        )
+                        for version, marker in [
+                            (old_fork_version, "python_full_version < '3.11'"),
+                            ("2.1.0", "python_full_version >= '3.11'"),
+                        ]
+                    ),
+                ]
+            )
+
+        git_repo.commit_lockfile(forked("1.26.3"))
+        stage_lockfile(git_repo, forked("1.26.4"))
+
+        assert "`1.26.3` -> `1.26.4`" in staged_report(str(git_repo.path))
+
+    def test_first_lockfile(self, git_repo):
+        git_repo.commit_lockfile("")
+        git_repo.git("rm", "--quiet", "--cached", "uv.lock")
+        git_repo.git("commit", "--quiet", "-m", "Untrack uv.lock")
+        stage_lockfile(git_repo, lockfile_toml(django="4.2.0"))
+
+        assert "`django`: `4.2.0`" in staged_report(str(git_repo.path))
+
+    def test_deleted(self, git_repo):
+        git_repo.commit_lockfile(lockfile_toml(django="4.2.0", httpx="0.27.0"))
+        git_repo.git("rm", "--quiet", "uv.lock")
+
+        report = staged_report(str(git_repo.path))
+
+        assert "### Removed\n`django`: `4.2.0`\n`httpx`: `0.27.0`" in report
+
+    def test_nested_lockfiles_are_not_read(self, git_repo):
+        git_repo.commit_lockfile(lockfile_toml(django="4.2.0"))
+        (git_repo.path / "sub").mkdir()
+        (git_repo.path / "sub" / "uv.lock").write_text(lockfile_toml(h2="4.1.0"))
+        git_repo.git("add", "sub/uv.lock")
+
+        assert staged_report(str(git_repo.path)) == ""
+
+    def test_hook_only_matches_the_root_lockfile(self):
+        hooks = Path(uv_lock_report.__file__).parents[1] / ".pre-commit-hooks.yaml"
+        pattern = re.search(r"files: (.+)", hooks.read_text()).group(1)
+
+        assert re.search(pattern, "uv.lock")
+        assert not re.search(pattern, "packages/app/uv.lock")
+
+    def test_staged_cli(self, git_repo, capsys):
+        git_repo.commit_lockfile(lockfile_toml(django="4.2.0"))
+        stage_lockfile(git_repo, lockfile_toml(django="4.2.1"))
+
+        assert main(["staged", "--base-path", str(git_repo.path)]) == 0
+        assert "`django`: `4.2.0` -> `4.2.1`" in capsys.readouterr().out
+
+    def test_unchanged_does_not_import_models(self, git_repo):
+        git_repo.commit_lockfile(lockfile_toml(django="4.2.0"))
+
+        run = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                (
+                    "import sys\n"
+                    "from uv_lock_report.cli import main\n"
+                    "assert main(['staged']) == 0\n"
+                    "assert 'pydantic' not in sys.modules, 'pydantic was imported'\n"
+                ),
+            ],
+            cwd=git_repo.path,
+            env={
+                **os.environ,
+                "PYTHONPATH": str(Path(uv_lock_report.__file__).parents[1]),
+            },
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        assert run.returncode == 0, run.stderr
+        assert run.stdout == ""
@@ -0,0 +1,66 @@
+import pytest
+
+from uv_lock_report.cli import main
+from uv_lock_report.models import LockfileChanges, OutputFormat
+from uv_lock_report.report import write_step_summary
+
+from .conftest import ADDED_PACKAGES, UPDATED_PACKAGES, lockfile_toml
+
+
+@pytest.fixture
+def lockfile_changes():
+    return LockfileChanges(
+        requires_python={"old": ">=3.12", "new": ">=3.13"},
+        added=ADDED_PACKAGES,
+        updated=UPDATED_PACKAGES,
+        output_format=OutputFormat.SIMPLE,
+        show_learn_more_link=True,
+    )
+
+
+class TestStepSummary:
+    @pytest.mark.parametrize("output_format", list(OutputFormat))
+    def test_iter_markdown_matches_markdown(self, lockfile_changes, output_format):
+        lockfile_changes.output_format = output_format
+
+        assert "\n".join(lockfile_changes.iter_markdown()) == lockfile_changes.markdown
+
+    def test_write_step_summary(self, lockfile_changes, tmp_path):
+        summary = tmp_path / "summary.md"
+        summary.write_text("# Earlier step\n")
+
+        write_step_summary(lockfile_changes, str(summary))
+
+        expected = lockfile_changes.markdown.replace("\\`", "`")
+        assert summary.read_text() == f"# Earlier step\n{expected}\n"
+        assert "`>=3.12` -> `>=3.13`" in summary.read_text()
+
+    def test_cli_uses_github_step_summary(self, git_repo, tmp_path, monkeypatch):
+        git_repo.commit_lockfile(lockfile_toml(django="4.2.0"))
+        (git_repo.path / "uv.lock").write_text(lockfile_toml(django="5.0.0"))
+        summary = tmp_path / "summary.md"
+        monkeypatch.setenv("GITHUB_STEP_SUMMARY", str(summary))
+
+        assert (
+            main(
+                [
+                    "--base-sha",
+                    "HEAD",
+                    "--base-path",
+                    str(git_repo.path),
+                    "--step-summary",
+                    "--output-format",
+                    "simple",
+                ]
+            )
+            == 0
+        )
+        assert ":collision: `django`: `4.2.0` -> `5.0.0`" in summary.read_text()
+
+    def test_cli_needs_an_output(self, git_repo, monkeypatch, capsys):
+        monkeypatch.delenv("GITHUB_STEP_SUMMARY", raising=False)
+        args = ["--base-sha", "HEAD", "--base-path", str(git_repo.path)]
+
+        assert main(args) == 2
+        assert main([*args, "--step-summary"]) == 2
+        assert "--step-summary needs a PATH" in capsys.readouterr().err
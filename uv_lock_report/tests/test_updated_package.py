@@ -8,4 +8,5 @@ class TestUpdatedPackage:
             "name": "steve",
             "new_version": "2.0.0",
             "old_version": "1.0.0",
+            "fork": None,
         }
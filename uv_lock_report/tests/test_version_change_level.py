@@ -1,6 +1,10 @@
 import pytest
 
-from uv_lock_report.models import VersionChangeLevel
+from uv_lock_report.models import (
+    UpdatedPackage,
+    VersionChangeLevel,
+    classify_version_change,
+)
 
 
 class TestVersionChangeLevel:
@@ -50,3 +54,74 @@ class TestVersionChangeLevel:
     def test_gitmoji_mapping(self, level, expected_emoji):
         """Parametrized test for all VersionChangeLevel to gitmoji mappings."""
         assert level.gitmoji == expected_emoji
+
+    def test_pep440_level_values(self):
+        """Test that the finer PEP 440 levels sort between PATCH and UNKNOWN, and EPOCH first."""
+        assert VersionChangeLevel.EPOCH == -1
+        assert (
+            VersionChangeLevel.PATCH
+            < VersionChangeLevel.CALVER
+            < VersionChangeLevel.PRERELEASE
+            < VersionChangeLevel.POST
+            < VersionChangeLevel.DEV
+            < VersionChangeLevel.LOCAL
+            < VersionChangeLevel.UNKNOWN
+        )
+
+
+class TestClassifyVersionChange:
+    """Test classify_version_change across PEP 440 version components."""
+
+    @pytest.mark.parametrize(
+        "old,new,expected",
+        [
+            ("1.0.0", "2.0.0", VersionChangeLevel.MAJOR),
+            ("1.0.0", "1.1.0", VersionChangeLevel.MINOR),
+            ("1.0.0", "1.0.1", VersionChangeLevel.PATCH),
+            ("1.0.0.1", "1.0.0.2", VersionChangeLevel.PATCH),
+            ("1.0.0", "2.0.0rc1", VersionChangeLevel.MAJOR),
+            ("1.0", "1!1.0", VersionChangeLevel.EPOCH),
+            ("1.0.0rc1", "1.0.0", VersionChangeLevel.PRERELEASE),
+            ("1.0.0a1", "1.0.0b1", VersionChangeLevel.PRERELEASE),
+            ("2.1.post1", "2.1.post2", VersionChangeLevel.POST),
+            ("2.1", "2.1.post1", VersionChangeLevel.POST),
+            ("3.0.dev1", "3.0.dev2", VersionChangeLevel.DEV),
+            ("2.1.0+cu118", "2.1.0+cu121", VersionChangeLevel.LOCAL),
+            ("2023.3", "2024.1", VersionChangeLevel.CALVER),
+            ("2024.8.30", "2024.12.14", VersionChangeLevel.CALVER),
+            ("23.12.1", "24.1.0", VersionChangeLevel.MAJOR),
+            ("24.0", "25.0", VersionChangeLevel.MAJOR),
+            ("25.2.0", "26.1.0", VersionChangeLevel.MAJOR),
+            ("17.1.0", "18.2.0", VersionChangeLevel.MAJOR),
+            ("20.1.0", "21.3.0", VersionChangeLevel.MAJOR),
+            ("69.5.1", "70.0.0", VersionChangeLevel.MAJOR),
+            ("1.0", "1.0.0", VersionChangeLevel.UNKNOWN),
+        ],
+    )
+    def test_classify(self, old, new, expected):
+        assert classify_version_change(old, new) == expected
+
+    def test_calendar_versioned_packages(self):
+        assert (
+            classify_version_change("24.10.0", "25.1.0", calendar_versioned=True)
+            == VersionChangeLevel.CALVER
+        )
+        assert (
+            UpdatedPackage(
+                name="black", old_version="24.10.0", new_version="25.1.0"
+            ).change_level()
+            == VersionChangeLevel.CALVER
+        )
+        assert (
+            UpdatedPackage(
+                name="virtualenv", old_version="20.1.0", new_version="21.3.0"
+            ).change_level()
+            == VersionChangeLevel.MAJOR
+        )
+
+    def test_memoized(self):
+        classify_version_change.cache_clear()
+        classify_version_change("1.0.0", "1.1.0")
+        classify_version_change("1.0.0", "1.1.0")
+
+        assert classify_version_change.cache_info().hits == 1
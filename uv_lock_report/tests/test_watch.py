@@ -0,0 +1,146 @@
+import threading
+import time
+
+import pytest
+
+from uv_lock_report.models import OutputFormat, UvLockFile
+from uv_lock_report.watch import (
+    IncrementalLockfileParser,
+    InotifyWatcher,
+    LockfileWatch,
+    PollingWatcher,
+    iter_lockfile_texts,
+    split_package_blocks,
+)
+
+from .conftest import lockfile_toml
+
+LOCKFILE_WITH_SUBTABLES = """version = 1
+revision = 3
+requires-python = ">=3.13"
+
+[[package]]
+name = "app"
+version = "0.1.0"
+source = { editable = "." }
+dependencies = [
+    { name = "httpx" },
+]
+
+[package.optional-dependencies]
+http2 = [
+    { name = "h2" },
+]
+
+[package.metadata]
+requires-dist = [{ name = "httpx" }]
+
+[[package]]
+name = "httpx"
+version = "0.28.0"
+source = { registry = "https://pypi.org/simple" }
+"""
+
+
+class TestSplitPackageBlocks:
+    def test_subtables_stay_with_their_package(self):
+        header, blocks = split_package_blocks(LOCKFILE_WITH_SUBTABLES)
+
+        assert header == 'version = 1\nrevision = 3\nrequires-python = ">=3.13"\n\n'
+        assert len(blocks) == 2
+        assert "[package.optional-dependencies]" in blocks[0]
+        assert "[package.metadata]" in blocks[0]
+        assert blocks[1].startswith('[[package]]\nname = "httpx"')
+
+
+class TestIncrementalLockfileParser:
+    def test_only_changed_blocks_are_reparsed(self):
+        parser = IncrementalLockfileParser()
+
+        first = parser.parse(lockfile_toml(django="4.2.0", httpx="0.27.0"))
+        second = parser.parse(lockfile_toml(django="4.2.0", httpx="0.28.0"))
+
+        assert parser.reparsed == 3
+        assert second.packages_by_name["django"] is first.packages_by_name["django"]
+        assert second.packages_by_name["httpx"].version == "0.28.0"
+
+    def test_matches_full_parse(self):
+        parser = IncrementalLockfileParser()
+        parsed = parser.parse(LOCKFILE_WITH_SUBTABLES)
+        expected = UvLockFile.from_toml_str(LOCKFILE_WITH_SUBTABLES)
+        assert parsed.packages == expected.packages
+        assert (
+            parsed.packages_by_name["app"].optional_dependencies
+            == expected.packages_by_name["app"].optional_dependencies
+        )
+        assert parsed.requires_python == expected.requires_python
+
+
+class TestWatchers:
+    @pytest.mark.parametrize(
+        "make_watcher",
+        [
+            pytest.param(InotifyWatcher, id="inotify"),
+            pytest.param(lambda path: PollingWatcher(path, interval=0.01), id="poll"),
+        ],
+    )
+    def test_detects_replaced_file(self, tmp_path, make_watcher):
+        path = tmp_path / "uv.lock"
+        path.write_text("one")
+        try:
+            watcher = make_watcher(path)
+        except OSError:
+            pytest.skip("inotify is not available")
+
+        assert watcher.wait(timeout=0.05) is False
+        (tmp_path / "uv.lock.tmp").write_text("two!")
+        (tmp_path / "uv.lock.tmp").replace(path)
+        assert watcher.wait(timeout=2) is True
+        watcher.close()
+
+    def test_iter_lockfile_texts_skips_identical_rewrites(self, tmp_path):
+        path = tmp_path / "uv.lock"
+        path.write_text("one")
+        watcher = PollingWatcher(path, interval=0.01)
+
+        def writer():
+            for text in ["one", "two"]:
+                time.sleep(0.1)
+                path.write_text(text)
+
+        threading.Thread(target=writer).start()
+        texts = iter_lockfile_texts(watcher, path)
+
+        assert next(texts) == "one"
+        assert next(texts) == "two"
+
+
+class TestLockfileWatch:
+    def test_render(self, git_repo):
+        git_repo.commit_lockfile(lockfile_toml(django="4.2.0", httpx="0.27.0"))
+        watch = LockfileWatch(base_sha="HEAD", base_path=str(git_repo.path))
+
+        assert watch.render(lockfile_toml(django="4.2.0", httpx="0.27.0")) == (
+            "No changes"
+        )
+        assert watch.render(lockfile_toml(django="4.2.0", httpx="0.28.0")) == (
+            "## uv Lockfile Report\n"
+            "### Upgraded\n"
+            "| Package | Old Version | New Version |\n"
+            "|--|--|--|\n"
+            "| httpx | 0.27.0 | 0.28.0 |"
+        )
+        assert watch.render("[[package]]\nname = ").startswith("Could not parse")
+        assert watch.parser.reparsed == 3
+
+    def test_render_simple(self, git_repo):
+        git_repo.commit_lockfile(lockfile_toml(httpx="0.27.0"))
+        watch = LockfileWatch(
+            base_sha="HEAD",
+            base_path=str(git_repo.path),
+            output_format=OutputFormat.SIMPLE,
+        )
+
+        assert watch.render(lockfile_toml(httpx="0.28.0")).endswith(
+            "### Upgraded\n:sparkles: `httpx`: `0.27.0` -> `0.28.0`"
+        )
@@ -0,0 +1,171 @@
+import pytest
+
+from uv_lock_report.models import (
+    LockfilePackage,
+    LockFileReporter,
+    OutputFormat,
+    WheelCoverageChange,
+)
+from uv_lock_report.wheels import (
+    describe_pairs,
+    installs_on,
+    parse_wheel_tag,
+    platform_family,
+    uncovered,
+    wheel_triples,
+)
+
+from .conftest import make_lockfile
+
+LINUX = "manylinux_2_17_x86_64.manylinux2014_x86_64"
+MUSL_ARM = "musllinux_1_2_aarch64"
+MAC = "macosx_11_0_arm64"
+
+
+def package(version: str, *tags: str) -> dict:
+    return {
+        "name": "numpy",
+        "version": version,
+        "source": {"registry": "https://pypi.org/simple"},
+        "wheels": [
+            {
+                "url": f"https://files.example/numpy-{version}-{tag}.whl",
+                "hash": f"sha256:{version}-{tag}",
+            }
+            for tag in tags
+        ],
+    }
+
+
+def coverage_changes(old: dict, new: dict) -> list[WheelCoverageChange]:
+    return LockFileReporter(
+        old_lockfile=make_lockfile(old),
+        new_lockfile=make_lockfile(new),
+        output_format=OutputFormat.TABLE,
+        show_learn_more_link=False,
+    ).get_wheel_coverage_changes()
+
+
+class TestWheelTags:
+    @pytest.mark.parametrize(
+        "platform,family",
+        [
+            ("manylinux_2_28_x86_64", "manylinux_x86_64"),
+            ("manylinux2014_aarch64", "manylinux_aarch64"),
+            ("manylinux1_i686", "manylinux_i686"),
+            ("musllinux_1_1_aarch64", "musllinux_aarch64"),
+            ("macosx_10_9_universal2", "macosx_universal2"),
+            ("win_amd64", "win_amd64"),
+            ("any", "any"),
+        ],
+    )
+    def test_platform_family(self, platform, family):
+        assert platform_family(platform) == family
+
+    def test_compressed_tags_share_a_family(self):
+        assert parse_wheel_tag(f"cp313-cp313-{LINUX}") == {
+            ("cp313", "cp313", "manylinux_x86_64")
+        }
+
+    def test_tags_are_parsed_once(self):
+        assert parse_wheel_tag("py3-none-any") is parse_wheel_tag("py3-none-any")
+
+    def test_package_wheel_triples(self):
+        pkg = LockfilePackage.model_validate(
+            package("2.1.0", f"cp313-cp313-{LINUX}", "py2.py3-none-any")
+        )
+
+        assert pkg.wheel_triples == {
+            ("cp313", "cp313", "manylinux_x86_64"),
+            ("py2", "none", "any"),
+            ("py3", "none", "any"),
+        }
+        assert "wheel_tags" not in pkg.model_dump()
+
+    @pytest.mark.parametrize(
+        "wheel,target,expected",
+        [
+            (("cp313", "cp313", "win_amd64"), ("cp313", "win_amd64"), True),
+            (("cp313", "cp313", "win_amd64"), ("cp312", "win_amd64"), False),
+            (("cp39", "abi3", "win_amd64"), ("cp313", "win_amd64"), True),
+            (("cp314", "abi3", "win_amd64"), ("cp313", "win_amd64"), False),
+            (("py3", "none", "any"), ("cp313", "win_amd64"), True),
+            (("py3", "none", "win_amd64"), ("cp313", "macosx_arm64"), False),
+        ],
+    )
+    def test_installs_on(self, wheel, target, expected):
+        assert installs_on(wheel, *target) is expected
+
+
+class TestCoverageDiff:
+    def test_dropped_platform_and_interpreter(self):
+        old = wheel_triples(
+            [
+                f"cp312-cp312-{LINUX}",
+                f"cp313-cp313-{LINUX}",
+                f"cp312-cp312-{MUSL_ARM}",
+                f"cp313-cp313-{MUSL_ARM}",
+                f"cp312-cp312-{MAC}",
+                f"cp313-cp313-{MAC}",
+            ]
+        )
+        new = wheel_triples([f"cp312-cp312-{LINUX}", f"cp312-cp312-{MAC}"])
+
+        dropped = uncovered(old, new)
+
+        assert describe_pairs(dropped, old) == ["musllinux_aarch64", "cp313"]
+        assert uncovered(new, old) == set()
+
+    def test_single_pair(self):
+        old = wheel_triples([f"cp312-cp312-{LINUX}", f"cp313-cp313-{LINUX}"])
+        old |= wheel_triples([f"cp312-cp312-{MAC}", f"cp313-cp313-{MAC}"])
+        new = old - {("cp313", "cp313", "macosx_arm64")}
+
+        assert describe_pairs(uncovered(old, new), old) == ["cp313-macosx_arm64"]
+
+    def test_abi3_and_pure_wheels_still_cover(self):
+        old = wheel_triples([f"cp313-cp313-{LINUX}", "py3-none-any"])
+
+        assert (
+            uncovered(old, wheel_triples([f"cp39-abi3-{LINUX}", "py3-none-any"]))
+            == set()
+        )
+        assert uncovered(old, wheel_triples([f"cp313-cp313-{LINUX}"])) == {
+            ("py3", "any")
+        }
+
+    def test_reporter(self):
+        old = package("2.0.0", f"cp312-cp312-{LINUX}", f"cp312-cp312-{MUSL_ARM}")
+        new = package("2.1.0", f"cp312-cp312-{LINUX}", f"cp313-cp313-{LINUX}")
+
+        assert coverage_changes(old, new) == [
+            WheelCoverageChange(
+                name="numpy",
+                old_version="2.0.0",
+                new_version="2.1.0",
+                dropped=["musllinux_aarch64"],
+                added=["cp313"],
+            )
+        ]
+
+    def test_same_tags_are_skipped(self):
+        old = package("2.0.0", f"cp312-cp312-{LINUX}")
+        new = package("2.1.0", f"cp312-cp312-{LINUX}")
+
+        assert coverage_changes(old, new) == []
+
+    def test_markdown(self):
+        change = WheelCoverageChange(
+            name="numpy",
+            old_version="2.0.0",
+            new_version="2.1.0",
+            dropped=["musllinux_aarch64", "cp313"],
+        )
+
+        assert change.markdown_row() == (
+            "| numpy | 2.0.0 -> 2.1.0 | musllinux_aarch64, cp313 |  |"
+        )
+        assert change.markdown_simple() == (
+            "\\`numpy\\` 2.0.0 -> 2.1.0: "
+            "no more \\`musllinux_aarch64\\`, \\`cp313\\` wheels"
+        )
@@ -0,0 +1,218 @@
+"""
+Watch the working-tree uv.lock and re-report against a fixed base.
+
+The base lockfile is parsed once. Each time `uv.lock` changes, only the
+`[[package]]` blocks whose text differs from the previous parse are validated
+again; unchanged blocks reuse the `LockfilePackage` parsed last time.
+Changes are detected with inotify where available, and by polling otherwise.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+import tomllib
+from collections.abc import Iterator
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from uv_lock_report.models import (
+    LockfilePackage,
+    LockFileReporter,
+    OutputFormat,
+    UvLockFile,
+)
+from uv_lock_report.report import CURRENT_UV_LOCK, get_uv_lock_file_at
+
+DEFAULT_POLL_INTERVAL = 0.5
+# Editors and `uv lock` may write in several steps; wait for them to settle.
+SETTLE_DELAY = 0.05
+
+PACKAGE_HEADER = "[[package]]"
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_CLOEXEC = os.O_CLOEXEC
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+def split_package_blocks(toml_str: str) -> tuple[str, list[str]]:
+    """Split uv.lock text into its top-level tables and one text per package."""
+    header: list[str] = []
+    blocks: list[list[str]] = []
+    current = header
+    for line in toml_str.splitlines(keepends=True):
+        if line.startswith("["):
+            if line.rstrip() == PACKAGE_HEADER:
+                blocks.append([])
+                current = blocks[-1]
+            elif not line.startswith(("[package.", "[[package.")):
+                current = header
+        current.append(line)
+    return "".join(header), ["".join(block) for block in blocks]
+
+
+class IncrementalLockfileParser:
+    """Parse successive versions of one lockfile, reusing unchanged packages."""
+
+    def __init__(self) -> None:
+        self.packages: dict[str, LockfilePackage] = {}
+        self.reparsed = 0
+
+    def parse(self, toml_str: str) -> UvLockFile:
+        header, blocks = split_package_blocks(toml_str)
+        packages: dict[str, LockfilePackage] = {}
+        for block in blocks:
+            package = self.packages.get(block) or packages.get(block)
+            if package is None:
+                package = LockfilePackage.model_validate(
+                    tomllib.loads(block)["package"][0]
+                )
+                self.reparsed += 1
+            packages[block] = package
+        self.packages = packages
+
+        data = tomllib.loads(header)
+        data["package"] = [packages[block] for block in blocks]
+        return UvLockFile.model_validate(data)
+
+
+class InotifyWatcher:
+    """Directory watch through the Linux inotify API, via libc."""
+
+    def __init__(self, path: Path) -> None:
+        libc_name = ctypes.util.find_library("c")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self.name = path.name
+        self.fd = libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        # Watch the directory: `uv lock` replaces the file rather than writing it.
+        if libc.inotify_add_watch(self.fd, os.fsencode(path.parent), mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until the watched file changes; `False` on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                return False
+            buffer = os.read(self.fd, 64 * 1024)
+            offset = 0
+            changed = False
+            while offset < len(buffer):
+                _, _, _, length = INOTIFY_EVENT.unpack_from(buffer, offset)
+                offset += INOTIFY_EVENT.size
+                name = buffer[offset : offset + length].rstrip(b"\0")
+                offset += length
+                changed = changed or os.fsdecode(name) == self.name
+            if changed:
+                return True
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    def __init__(self, path: Path, interval: float = DEFAULT_POLL_INTERVAL) -> None:
+        self.path = path
+        self.interval = interval
+        self.signature = self._signature()
+
+    def _signature(self) -> tuple[int, int, int] | None:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def wait(self, timeout: float | None = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while deadline is None or time.monotonic() < deadline:
+            time.sleep(self.interval)
+            signature = self._signature()
+            if signature != self.signature:
+                self.signature = signature
+                return True
+        return False
+
+    def close(self) -> None:
+        pass
+
+
+def make_watcher(
+    path: Path, poll_interval: float = DEFAULT_POLL_INTERVAL
+) -> InotifyWatcher | PollingWatcher:
+    try:
+        return InotifyWatcher(path)
+    except (OSError, AttributeError):
+        return PollingWatcher(path, interval=poll_interval)
+
+
+def iter_lockfile_texts(
+    watcher: InotifyWatcher | PollingWatcher, path: Path
+) -> Iterator[str]:
+    """The current text of `path`, then its new text after every change."""
+    last = None
+    while True:
+        try:
+            text = path.read_text()
+        except FileNotFoundError:
+            text = None
+        if text is not None and text != last:
+            last = text
+            yield text
+        watcher.wait()
+        time.sleep(SETTLE_DELAY)
+
+
+class LockfileWatch:
+    def __init__(
+        self,
+        base_sha: str,
+        base_path: str,
+        output_format: OutputFormat = OutputFormat.TABLE,
+    ) -> None:
+        self.old_lockfile = get_uv_lock_file_at(base_sha, base_path)
+        self.path = Path(base_path) / CURRENT_UV_LOCK
+        self.output_format = output_format
+        self.parser = IncrementalLockfileParser()
+
+    def render(self, toml_str: str) -> str:
+        try:
+            new_lockfile = self.parser.parse(toml_str)
+        except (tomllib.TOMLDecodeError, ValidationError, KeyError) as e:
+            return f"Could not parse {self.path}: {e}"
+        reporter = LockFileReporter(
+            old_lockfile=self.old_lockfile,
+            new_lockfile=new_lockfile,
+            output_format=self.output_format,
+            show_learn_more_link=False,
+        )
+        lockfile_changes = reporter.get_changes()
+        if not str(lockfile_changes):
+            return "No changes"
+        # The markdown escapes backticks for embedding in a script; undo that here.
+        return "\n".join(
+            line.replace("\\`", "`") for line in lockfile_changes.iter_markdown()
+        )
+
+    def run(self, poll_interval: float = DEFAULT_POLL_INTERVAL) -> None:
+        watcher = make_watcher(self.path, poll_interval=poll_interval)
+        try:
+            for toml_str in iter_lockfile_texts(watcher, self.path):
+                print(f"--- {self.path} ({time.strftime('%H:%M:%S')})")
+                print(self.render(toml_str), flush=True)
+        finally:
+            watcher.close()
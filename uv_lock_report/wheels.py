@@ -0,0 +1,115 @@
+"""
+Wheel platform coverage of locked packages.
+
+Each distinct wheel tag is parsed once into interned `(interpreter, abi,
+platform family)` triples, where the family drops the glibc, musl or macOS
+version (`manylinux_2_17_x86_64` -> `manylinux_x86_64`). Comparing two
+versions of a package is then a set difference, and only the few leftover
+triples are checked for abi3 or pure-Python wheels that still cover them.
+"""
+
+import re
+import sys
+from collections.abc import Iterable
+from functools import cache, lru_cache
+
+from packaging.tags import parse_tag
+
+PURE_PLATFORM = "any"
+PLATFORM_VERSION = re.compile(r"^(manylinux|musllinux|macosx)\d*(?:_\d+)*_(.+)$")
+
+WheelTriple = tuple[str, str, str]
+
+
+def wheel_tag(filename: str) -> str:
+    """The `python-abi-platform` tag of a wheel file name or URL."""
+    filename = filename.rsplit("/", 1)[-1].split("#", 1)[0]
+    return sys.intern("-".join(filename.removesuffix(".whl").split("-")[-3:]))
+
+
+@cache
+def platform_family(platform: str) -> str:
+    return sys.intern(PLATFORM_VERSION.sub(r"\1_\2", platform))
+
+
+@lru_cache(maxsize=4096)
+def parse_wheel_tag(tag: str) -> frozenset[WheelTriple]:
+    """The triples of a wheel's (possibly compressed) tag set."""
+    return frozenset(
+        (sys.intern(t.interpreter), sys.intern(t.abi), platform_family(t.platform))
+        for t in parse_tag(tag)
+    )
+
+
+def wheel_triples(tags: Iterable[str]) -> frozenset[WheelTriple]:
+    return frozenset().union(*map(parse_wheel_tag, tags))
+
+
+def python_version(interpreter: str) -> tuple[int, ...] | None:
+    """`(3, 13)` for `cp313`, `(3,)` for `py3`, `None` for anything else."""
+    digits = interpreter[2:]
+    if not interpreter.startswith(("cp", "py")) or not digits.isdigit():
+        return None
+    return (int(digits[0]), int(digits[1:])) if len(digits) > 1 else (int(digits),)
+
+
+def installs_on(wheel: WheelTriple, interpreter: str, platform: str) -> bool:
+    """Whether a wheel with the `wheel` triple installs for a target pair."""
+    wheel_interpreter, abi, wheel_platform = wheel
+    if wheel_platform not in (platform, PURE_PLATFORM):
+        return False
+    if wheel_interpreter == interpreter:
+        return True
+    wheel_version = python_version(wheel_interpreter)
+    target_version = python_version(interpreter)
+    if wheel_version is None or target_version is None:
+        return False
+    if abi == "abi3":
+        return (
+            wheel_interpreter.startswith("cp")
+            and interpreter.startswith("cp")
+            and wheel_version[0] == target_version[0]
+            and wheel_version <= target_version
+        )
+    # `py3` wheels install on every Python 3 interpreter.
+    return (
+        abi == "none"
+        and wheel_interpreter.startswith("py")
+        and len(wheel_version) == 1
+        and wheel_version[0] == target_version[0]
+    )
+
+
+def uncovered(
+    old: frozenset[WheelTriple], new: frozenset[WheelTriple]
+) -> set[tuple[str, str]]:
+    """`(interpreter, platform)` pairs with a wheel in `old` but none in `new`."""
+    candidates = {(i, p) for i, _, p in old} - {(i, p) for i, _, p in new}
+    return {
+        (interpreter, platform)
+        for interpreter, platform in candidates
+        if not any(installs_on(wheel, interpreter, platform) for wheel in new)
+    }
+
+
+def describe_pairs(
+    pairs: set[tuple[str, str]], among: frozenset[WheelTriple]
+) -> list[str]:
+    """
+    Short labels for `pairs`: a platform or interpreter when every wheel of it
+    in `among` is included, otherwise `interpreter-platform`.
+    """
+    all_pairs = {(i, p) for i, _, p in among}
+    platforms = sorted(
+        {p for _, p in pairs} - {p for i, p in all_pairs if (i, p) not in pairs}
+    )
+    remaining = {(i, p) for i, p in pairs if p not in platforms}
+    interpreters = sorted(
+        {i for i, _ in remaining} - {i for i, p in all_pairs if (i, p) not in pairs}
+    )
+    remaining = {(i, p) for i, p in remaining if i not in interpreters}
+    return [
+        *platforms,
+        *interpreters,
+        *(f"{i}-{p}" for i, p in sorted(remaining)),
+    ]